@@ -8,9 +8,10 @@ import argparse
 import logging
 import os
 
-import coloredlogs
+# Modules of commands are imported by the commands themselves: start-up
+# of the CLI must not pay for Flask, Markdown, bs4 & Jinja if they are not used.
 
-from bloget import builder
+# pylint: disable=import-outside-toplevel
 
 
 def main() -> None:
@@ -20,26 +21,106 @@ def main() -> None:
 
     arguments = _get_arguments()
 
+    if arguments.command == "client":
+        from bloget import client
+
+        client.send_request(arguments)
+        return
+
     _setup_logging(arguments)
 
     if arguments.command == "build":
+        _build(arguments)
 
-        builder.build_blog(arguments)
+    elif arguments.command == "check":
+        from bloget import checker
+
+        checker.check_blog(arguments)
+
+    elif arguments.command == "benchmark-markdown":
+        from bloget import markdown_benchmark
+
+        markdown_benchmark.run_benchmark(arguments)
+
+    elif arguments.command == "rollback":
+        from bloget import staging
+
+        staging.rollback(arguments)
+
+    elif arguments.command == "tags":
+        from bloget import tags
+
+        tags.show_tags_list(arguments)
+
+    elif arguments.command == "stats":
+        from bloget import stats
+
+        stats.show_stats(arguments)
+
+    elif arguments.command == "migrate-front-matter":
+        from bloget import migrator
+
+        migrator.migrate_pages(arguments)
+
+    elif arguments.command == "serve-daemon":
+        from bloget import daemon
+
+        daemon.start(arguments)
 
     else:
         logging.info("Nothing to do!")
 
 
+def _build(arguments: argparse.Namespace) -> None:
+    """
+    Runs the BUILD command: plans a build, builds a blog or several ones.
+    """
+
+    if arguments.plan:
+        from bloget import planner
+
+        planner.print_plan(arguments)
+        return
+
+    from bloget import builder
+
+    if arguments.sites:
+        builder.build_blogs(arguments)
+    else:
+        builder.build_blog(arguments)
+
+
+def _get_default_cache_path() -> str:
+    """
+    Returns a folder for caches in the user cache directory (so caches
+    never end up in a blog's folders, which git & sync tools watch).
+    """
+
+    if os.name == "nt":
+        base_path = os.environ.get("LOCALAPPDATA") or os.path.expanduser(
+            os.path.join("~", "AppData", "Local")
+        )
+    else:
+        base_path = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(
+            os.path.join("~", ".cache")
+        )
+
+    return os.path.join(base_path, "bloget")
+
+
 def _setup_logging(arguments: argparse.Namespace) -> None:
     """
     Sets up logging feature.
     """
 
-    format_string = "%(asctime)s [%(levelname)s] %(message)s"
+    import coloredlogs
+
+    from bloget import constants
+
     logging_level = logging.DEBUG if arguments.debug else logging.INFO
 
-    logging.basicConfig(level=logging_level, format=format_string)
-    coloredlogs.install(level=logging_level, fmt=format_string)
+    logging.basicConfig(level=logging_level, format=constants.LOGGING_FORMAT)
+    coloredlogs.install(level=logging_level, fmt=constants.LOGGING_FORMAT)
 
 
 def _get_arguments() -> argparse.Namespace:
@@ -64,7 +145,311 @@ def _get_arguments() -> argparse.Namespace:
         parents=[base_parser, build_command_subparser],
     )
 
-    return parser.parse_args()
+    # check
+
+    subparsers.add_parser(
+        "check",
+        help="Check internal links & images of a built blog",
+        parents=[base_parser, build_command_subparser],
+    )
+
+    # benchmark-markdown
+
+    benchmark_command_subparser = _get_subparser_for_benchmark_command()
+
+    subparsers.add_parser(
+        "benchmark-markdown",
+        help="Compare speed & output of Markdown engines on blog's pages",
+        parents=[base_parser, benchmark_command_subparser],
+    )
+
+    # rollback
+
+    rollback_command_subparser = _get_subparser_for_rollback_command()
+
+    subparsers.add_parser(
+        "rollback",
+        help="Swap the output directory with the previous atomic build",
+        parents=[base_parser, rollback_command_subparser],
+    )
+
+    # tags
+
+    summaries_command_subparser = _get_subparser_for_summaries_commands()
+
+    subparsers.add_parser(
+        "tags",
+        help="List tags of notes",
+        parents=[base_parser, summaries_command_subparser],
+    )
+
+    # stats
+
+    stats_command_subparser = _get_subparser_for_stats_command()
+
+    subparsers.add_parser(
+        "stats",
+        help="Show counts of pages by types, tags, stacks & years, and the largest pages",
+        parents=[base_parser, summaries_command_subparser, stats_command_subparser],
+    )
+
+    # migrate-front-matter
+
+    migrate_command_subparser = _get_subparser_for_migrate_command()
+
+    subparsers.add_parser(
+        "migrate-front-matter",
+        help="Move index.yaml files of pages into front matter of index.md files",
+        parents=[base_parser, migrate_command_subparser],
+    )
+
+    # serve-daemon
+
+    daemon_command_subparser = _get_subparser_for_daemon_socket()
+
+    subparsers.add_parser(
+        "serve-daemon",
+        help="Build blog, then keep rebuilding it on requests sent to a socket",
+        parents=[base_parser, build_command_subparser, daemon_command_subparser],
+    )
+
+    # client
+
+    client_command_subparser = _get_subparser_for_client_command()
+
+    subparsers.add_parser(
+        "client",
+        help="Send a request to the build daemon",
+        parents=[base_parser, client_command_subparser, daemon_command_subparser],
+    )
+
+    arguments = parser.parse_args()
+
+    if arguments.command in ("build", "b", "check", "serve-daemon"):
+        _check_build_arguments(parser, arguments)
+
+    return arguments
+
+
+def _check_build_arguments(
+    parser: argparse.ArgumentParser, arguments: argparse.Namespace
+) -> None:
+    """
+    Checks combinations of build arguments which argparse is unable to check.
+    """
+
+    # The output directory is only optional for the BUILD command,
+    # since sites from the --sites file have output directories of their own.
+
+    if not arguments.output and (
+        arguments.command in ("check", "serve-daemon") or not arguments.sites
+    ):
+        parser.error("the following arguments are required: --output")
+
+    if arguments.command == "serve-daemon" and arguments.sites:
+        parser.error("argument --sites: not supported by the build daemon")
+
+    if arguments.plan and arguments.sites:
+        parser.error("argument --plan: not supported along with --sites")
+
+    if arguments.output_backend != "filesystem" and arguments.publish:
+        parser.error("argument --publish: requires the filesystem output backend")
+
+    if arguments.output_backend != "filesystem" and arguments.atomic:
+        parser.error("argument --atomic: requires the filesystem output backend")
+
+    if arguments.atomic and arguments.publish:
+        parser.error("argument --atomic: not supported along with --publish")
+
+    if arguments.output_backend == "archive":
+        from bloget import output
+
+        if output.get_archive_format(arguments.output or "") is None:
+            parser.error(
+                "argument --output: an archive must be a .zip, .tar, .tar.gz "
+                "or .tar.xz file"
+            )
+
+
+def _get_subparser_for_benchmark_command() -> argparse.ArgumentParser:
+    """
+    Returns an arguments subparser for the BENCHMARK-MARKDOWN command.
+    """
+
+    from bloget import constants
+
+    subparser = argparse.ArgumentParser(add_help=False)
+
+    subparser.add_argument(
+        "--pages",
+        type=str,
+        help="input directory with pages (markdown files)",
+        default=os.getcwd(),
+    )
+
+    subparser.add_argument(
+        "--metadata",
+        type=str,
+        help="input directory with metadata (language and settings)",
+        default=".metadata",
+    )
+
+    subparser.add_argument(
+        "--engines",
+        nargs="+",
+        choices=constants.MARKDOWN_ENGINES,
+        help="engines to compare, the first one is the reference; "
+        "default is all installed engines",
+    )
+
+    subparser.add_argument(
+        "--repeat",
+        type=int,
+        help="number of runs to take the best rendering time of",
+        default=5,
+    )
+
+    return subparser
+
+
+def _get_subparser_for_rollback_command() -> argparse.ArgumentParser:
+    """
+    Returns an arguments subparser for the ROLLBACK command.
+    """
+
+    subparser = argparse.ArgumentParser(add_help=False)
+
+    subparser.add_argument(
+        "--output",
+        type=str,
+        help="output directory which was built with --atomic",
+        required=True,
+    )
+
+    return subparser
+
+
+def _get_subparser_for_summaries_commands() -> argparse.ArgumentParser:
+    """
+    Returns an arguments subparser for commands which read information
+    of pages only (TAGS & STATS).
+    """
+
+    subparser = argparse.ArgumentParser(add_help=False)
+
+    subparser.add_argument(
+        "--pages",
+        type=str,
+        help="input directory with pages (markdown files)",
+        default=os.getcwd(),
+    )
+
+    subparser.add_argument(
+        "--cache",
+        type=str,
+        help="directory to keep build caches in; default is the user cache directory",
+        default=_get_default_cache_path(),
+    )
+
+    subparser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="reads information of all pages without the cache (and doesn't update it)",
+    )
+
+    subparser.add_argument(
+        "--include-drafts",
+        action="store_true",
+        help="include pages with the 'draft' option",
+    )
+
+    return subparser
+
+
+def _get_subparser_for_stats_command() -> argparse.ArgumentParser:
+    """
+    Returns an arguments subparser for the STATS command.
+    """
+
+    subparser = argparse.ArgumentParser(add_help=False)
+
+    subparser.add_argument(
+        "--top",
+        type=int,
+        help="number of the largest pages to show",
+        default=10,
+    )
+
+    return subparser
+
+
+def _get_subparser_for_migrate_command() -> argparse.ArgumentParser:
+    """
+    Returns an arguments subparser for the MIGRATE-FRONT-MATTER command.
+    """
+
+    subparser = argparse.ArgumentParser(add_help=False)
+
+    subparser.add_argument(
+        "--pages",
+        type=str,
+        help="input directory with pages (markdown files)",
+        default=os.getcwd(),
+    )
+
+    subparser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="lists pages to migrate without changing them",
+    )
+
+    return subparser
+
+
+def _get_subparser_for_daemon_socket() -> argparse.ArgumentParser:
+    """
+    Returns an arguments subparser for the daemon socket (SERVE-DAEMON & CLIENT).
+    """
+
+    subparser = argparse.ArgumentParser(add_help=False)
+
+    subparser.add_argument(
+        "--socket",
+        type=str,
+        help="unix socket of the build daemon; default is daemon-<key of the working "
+        "directory>.sock in the cache",
+    )
+
+    return subparser
+
+
+def _get_subparser_for_client_command() -> argparse.ArgumentParser:
+    """
+    Returns an arguments subparser for the CLIENT command.
+    """
+
+    subparser = argparse.ArgumentParser(add_help=False)
+
+    subparser.add_argument(
+        "action",
+        choices=["rebuild", "partial-rebuild", "status", "stop"],
+        help="request to send",
+    )
+
+    subparser.add_argument(
+        "paths",
+        nargs="*",
+        help="changed page folders or files (for partial-rebuild)",
+    )
+
+    subparser.add_argument(
+        "--cache",
+        type=str,
+        help="directory to keep build caches in; default is the user cache directory",
+        default=_get_default_cache_path(),
+    )
+
+    return subparser
 
 
 def _get_subparser_for_build_command() -> argparse.ArgumentParser:
@@ -72,6 +457,8 @@ def _get_subparser_for_build_command() -> argparse.ArgumentParser:
     Returns an arguments subparser for the BUILD command.
     """
 
+    from bloget import constants, output
+
     subparser = argparse.ArgumentParser(add_help=False)
 
     subparser.add_argument(
@@ -104,7 +491,21 @@ def _get_subparser_for_build_command() -> argparse.ArgumentParser:
         "--output",
         type=str,
         help="output directory to write generated files in",
-        required=True,
+    )
+
+    subparser.add_argument(
+        "--output-backend",
+        choices=output.OUTPUT_BACKENDS,
+        help="where to write generated files: the output directory (default), "
+        "memory (for the --webserver) or an archive (--output is a .zip or .tar file)",
+        default="filesystem",
+    )
+
+    subparser.add_argument(
+        "--cache",
+        type=str,
+        help="directory to keep build caches in; default is the user cache directory",
+        default=_get_default_cache_path(),
     )
 
     subparser.add_argument(
@@ -113,17 +514,113 @@ def _get_subparser_for_build_command() -> argparse.ArgumentParser:
         help="external url of the blog; overrides the 'url' metadata setting",
     )
 
+    subparser.add_argument(
+        "--markdown-engine",
+        choices=constants.MARKDOWN_ENGINES,
+        help="engine to render Markdown with; "
+        "overrides the 'markdown_engine' metadata setting",
+    )
+
     subparser.add_argument(
         "--webserver",
         action="store_true",
         help="starts a web server for a blog built",
     )
 
+    subparser.add_argument(
+        "--minify",
+        action="store_true",
+        help="minifies HTML, CSS & JS files built",
+    )
+
+    subparser.add_argument(
+        "--critical-css",
+        action="store_true",
+        help="prunes unused rules of site.css, inlines critical ones into pages "
+        "& loads the rest asynchronously",
+    )
+
+    subparser.add_argument(
+        "--fingerprint-assets",
+        action="store_true",
+        help="copies CSS & JS files under names with their content hashes",
+    )
+
+    subparser.add_argument(
+        "--responsive-images",
+        action="store_true",
+        help="makes resized variants of image attachments; "
+        "overrides the 'responsive_images' metadata setting",
+    )
+
+    subparser.add_argument(
+        "--deduplicate-attachments",
+        action="store_true",
+        help="copies page attachments once, under their content hashes, to assets; "
+        "overrides the 'deduplicate_attachments' metadata setting",
+    )
+
+    subparser.add_argument(
+        "--cache-headers",
+        action="store_true",
+        help="writes a _headers file with Cache-Control policies & ETags "
+        "of built files (for Netlify-style hosting)",
+    )
+
+    subparser.add_argument(
+        "--nginx-config",
+        type=str,
+        metavar="FILE",
+        help="writes an nginx snippet with Cache-Control policies of built files",
+    )
+
+    subparser.add_argument(
+        "--atomic",
+        action="store_true",
+        help="builds in a sibling staging directory, then swaps it into place "
+        "(the previous build is kept in <output>.previous)",
+    )
+
+    subparser.add_argument(
+        "--publish",
+        action="store_true",
+        help="builds in a staging folder, then applies only changes to the output "
+        "directory & stages them in git",
+    )
+
+    subparser.add_argument(
+        "--sites",
+        type=str,
+        help="YAML file with a list of sites (pages, metadata, url & output of each) "
+        "to build at once; other arguments are shared by all sites",
+    )
+
+    subparser.add_argument(
+        "--metrics",
+        type=str,
+        help="writes build statistics to an OpenMetrics (Prometheus) textfile",
+    )
+
+    subparser.add_argument(
+        "--check",
+        action="store_true",
+        help="checks that internal links & images of pages point at files built",
+    )
+
+    subparser.add_argument(
+        "--plan",
+        nargs="?",
+        const="text",
+        choices=["text", "json"],
+        help="prints pages & files which a build would change (as text or JSON), "
+        "without building anything",
+    )
+
     subparser.add_argument(
         "--include-drafts",
         action="store_true",
         help="include pages with the 'draft' option",
-    )    
+    )
 
     return subparser
 
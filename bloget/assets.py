@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+"""
+Implementation of content-hash fingerprinting of public assets.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+
+from bloget import constants, minifier, utils
+from bloget.readers import metadata_reader
+
+
+def get_manifest(
+    metadata: metadata_reader.BlogMetadata, minify: bool = False
+) -> dict[str, str]:
+    """
+    Returns an asset manifest: fingerprinted paths of public files by their paths.
+
+    For instance: {"assets/css/site.css": "assets/css/site.0123456789.css"}
+
+    If files are minified, hashes are of their minified content.
+    """
+
+    public_path = metadata.paths.get("public")
+    assert isinstance(public_path, str)
+
+    result = {}
+
+    for directory, _, files in os.walk(public_path):
+        for file_name in files:
+            stem, extension = os.path.splitext(file_name)
+
+            if extension not in constants.FINGERPRINTED_FILE_EXTENSIONS:
+                continue
+
+            file_path = os.path.join(directory, file_name)
+
+            if minify:
+                data = _get_minified_file_data(metadata, file_path)
+                file_hash = hashlib.sha256(data).hexdigest()
+            else:
+                file_hash = utils.get_file_hash(file_path)
+
+            file_hash = file_hash[: constants.FINGERPRINT_LENGTH]
+
+            folder = os.path.relpath(directory, public_path).replace(os.sep, "/")
+            folder = "" if folder == "." else f"{folder}/"
+
+            result[f"{folder}{file_name}"] = f"{folder}{stem}.{file_hash}{extension}"
+
+    return result
+
+
+def set_asset_path_function(
+    metadata: metadata_reader.BlogMetadata, manifest: dict[str, str]
+) -> None:
+    """
+    Makes the asset_path() function available in templates.
+
+    The function resolves a path of a public file to its fingerprinted path
+    (or returns it as is, if there is no such file in the manifest).
+    """
+
+    metadata.templates.globals["asset_path"] = functools.partial(
+        _get_asset_path, manifest
+    )
+
+
+def write_fingerprinted_assets(
+    metadata: metadata_reader.BlogMetadata,
+    manifest: dict[str, str],
+    minify: bool = False,
+) -> None:
+    """
+    Copies (minified, if needed) public files under their fingerprinted names
+    & writes the manifest.
+    """
+
+    logging.info("Copying fingerprinted public files to the output folder")
+
+    public_path = metadata.paths["public"]
+    output_path = metadata.paths["output"]
+
+    for path, fingerprinted_path in manifest.items():
+        source_path = os.path.join(public_path, *path.split("/"))
+        target_path = os.path.join(output_path, *fingerprinted_path.split("/"))
+
+        utils.make_folder(os.path.dirname(target_path))
+
+        if minify:
+            utils.replace_file(
+                target_path, _get_minified_file_data(metadata, source_path)
+            )
+        else:
+            utils.copy_file(source_path, target_path)
+
+    write_manifest(metadata, manifest)
+
+
+def write_manifest(
+    metadata: metadata_reader.BlogMetadata, manifest: dict[str, str]
+) -> None:
+    """
+    Writes the asset manifest to the output folder.
+    """
+
+    output_path = metadata.paths["output"]
+
+    file_path = os.path.join(output_path, constants.ASSET_MANIFEST_FILE_NAME)
+    file_text = json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True)
+
+    utils.make_file(file_path, file_text)
+
+
+def _get_minified_file_data(
+    metadata: metadata_reader.BlogMetadata, file_path: str
+) -> bytes:
+    """
+    Returns minified content of a public file (from the cache of the minifier,
+    except for the first build with the file).
+    """
+
+    with open(file_path, "rb") as file:
+        data = file.read()
+
+    file_type = minifier.MINIFIED_FILE_TYPES[os.path.splitext(file_path)[1]]
+    result = minifier.minify_data(data, file_type, minifier.get_cache_path(metadata))
+
+    return data if result is None else result[0]
+
+
+def _get_asset_path(manifest: dict[str, str], path: str) -> str:
+    """
+    Returns a fingerprinted path of a public file.
+    """
+
+    path = path.lstrip("/")
+
+    return manifest.get(path, path)
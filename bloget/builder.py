@@ -9,10 +9,27 @@ import argparse
 import logging
 import os
 import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-from bloget import utils, webserver
+from bloget import (
+    assets,
+    checker,
+    constants,
+    critical_css,
+    fragments,
+    metrics,
+    minifier,
+    output,
+    planner,
+    publisher,
+    related_notes,
+    staging,
+    utils,
+)
 from bloget.readers import metadata_reader, pages_reader
 from bloget.writers import (
+    headers_writer,
+    image_derivatives_writer,
     note_writer,
     notes_list_writer,
     notes_search_index_writer,
@@ -33,31 +50,198 @@ def build_blog(arguments: argparse.Namespace) -> None:
 
     logging.info("Blog building")
 
-    metadata = metadata_reader.get_metadata(arguments)
+    metrics.start()
+
+    with metrics.stage("metadata"):
+        metadata = metadata_reader.get_metadata(arguments)
 
-    pages = pages_reader.get_pages(metadata, arguments.include_drafts)
+    with metrics.stage("pages"):
+        pages = pages_reader.get_pages(metadata, arguments.include_drafts)
 
-    _clear_output(metadata)
+    write_blog(arguments, metadata, pages)
+
+    if arguments.webserver:
+        # Flask is only imported when a web server is requested.
+        # pylint: disable-next=import-outside-toplevel
+        from bloget import webserver
 
-    text_writer.write_texts(pages, metadata)
+        logging.info("Starting a web server")
+        webserver.start(metadata)
 
-    project_writer.write_projects(pages, metadata)
-    projects_list_writer.write_projects_list(pages, metadata)
 
-    note_writer.write_notes(pages, metadata)
-    notes_list_writer.write_note_lists(pages, metadata)
-    notes_search_index_writer.write_notes_search_index(pages, metadata)
+def build_blogs(arguments: argparse.Namespace) -> None:
+    """
+    Builds several blogs (sites) from the --sites file in parallel worker processes.
 
-    sitemap_writer.write_sitemap(pages, metadata)
-    rss_feed_writer.write_rss_feed(pages, metadata)
-    page_404_writer.write_page_404(metadata)
-    robots_writer.write_robots(metadata)
+    Sites share the cache folder (compiled templates, minified files & image
+    derivatives), and public files are hard-linked into output folders
+    instead of being copied, where the file system allows it.
+    """
 
-    _copy_public(metadata)
+    logging.info("Blogs building")
+
+    sites = [_get_site_arguments(arguments, site) for site in _get_sites(arguments)]
 
     if arguments.webserver:
-        logging.info("Starting a web server")
-        webserver.start(metadata)
+        logging.warning("A web server is not started when several sites are built")
+
+    max_workers = min(len(sites), os.cpu_count() or 1)
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_setup_worker_logging,
+        initargs=(logging.getLogger().getEffectiveLevel(),),
+    ) as executor:
+        futures = {executor.submit(build_blog, site): site.output for site in sites}
+
+        for future in as_completed(futures):
+            future.result()
+
+            logging.info("Site is built: %s", futures[future])
+
+
+def write_blog(
+    arguments: argparse.Namespace,
+    metadata: metadata_reader.BlogMetadata,
+    pages: pages_reader.BlogPages,
+    changed: set[str] | None = None,
+) -> None:
+    """
+    Writes blog's files to the output directory.
+
+    If folder paths of changed pages are given, the output directory is not
+    cleared: only pages from the set (and pages which link to them) are written
+    again, along with lists, feeds & other files made of all pages.
+
+    For an atomic build, files are written to a staging folder, which then
+    takes place of the output directory.
+    """
+
+    output_path = _open_output(arguments, metadata, changed)
+
+    with metrics.stage("manifest"):
+        manifest = (
+            assets.get_manifest(metadata, arguments.minify)
+            if arguments.fingerprint_assets
+            else {}
+        )
+        assets.set_asset_path_function(metadata, manifest)
+
+    if changed is None:
+        with metrics.stage("clear"):
+            _clear_output(metadata)
+
+    if metadata.settings.get("related_notes"):
+        with metrics.stage("related_notes"):
+            pages.related, updated = related_notes.get_related_notes(pages, metadata)
+
+        if changed is not None:
+            changed = changed | updated
+
+    for page_type, page_list in (
+        ("text", pages.texts),
+        ("note", pages.notes),
+        ("project", pages.projects),
+    ):
+        metrics.add_pages(page_type, len(page_list))
+
+    with metrics.stage("texts"):
+        text_writer.write_texts(pages, metadata, changed)
+
+    with metrics.stage("projects"):
+        project_writer.write_projects(pages, metadata, changed)
+        projects_list_writer.write_projects_list(pages, metadata, changed)
+
+    _write_notes(pages, metadata, changed)
+
+    with metrics.stage("feeds"):
+        sitemap_writer.write_sitemap(pages, metadata)
+        rss_feed_writer.write_rss_feed(pages, metadata)
+        page_404_writer.write_page_404(metadata)
+        robots_writer.write_robots(metadata)
+
+    if metadata.settings.get("responsive_images"):
+        with metrics.stage("image_derivatives"):
+            image_derivatives_writer.write_image_derivatives(pages, metadata, changed)
+
+    if changed is None:
+        with metrics.stage("public"):
+            _copy_public(
+                metadata,
+                manifest,
+                getattr(arguments, "link_public", False),
+                arguments.minify,
+            )
+
+    _process_output(arguments, metadata, pages, manifest)
+
+    with metrics.stage("output"):
+        _close_output(arguments, metadata, output_path)
+
+    if arguments.publish:
+        with metrics.stage("publish"):
+            publisher.publish(metadata)
+
+        # Only a published folder changes by parts, so only its state is planned from.
+
+        planner.write_state(arguments, metadata, changed)
+
+    if arguments.metrics:
+        _write_metrics(arguments.metrics)
+
+
+def _process_output(
+    arguments: argparse.Namespace,
+    metadata: metadata_reader.BlogMetadata,
+    pages: pages_reader.BlogPages,
+    manifest: dict[str, str],
+) -> None:
+    """
+    Runs stages which work with written files: link checking, critical CSS,
+    minification & cache headers.
+    """
+
+    if arguments.check:
+        with metrics.stage("check"):
+            checker.check_links(pages, metadata)
+
+    if arguments.critical_css:
+        with metrics.stage("critical_css"):
+            critical_css.inline_critical_css(pages, metadata, manifest)
+
+    if arguments.minify:
+        with metrics.stage("minify"):
+            minifier.minify_output(metadata, manifest)
+
+    if arguments.cache_headers or arguments.nginx_config:
+        with metrics.stage("headers"):
+            headers_writer.write_headers(
+                metadata, manifest, arguments.cache_headers, arguments.nginx_config
+            )
+
+
+def _write_notes(
+    pages: pages_reader.BlogPages,
+    metadata: metadata_reader.BlogMetadata,
+    changed: set[str] | None,
+) -> None:
+    """
+    Writes note pages, note lists & the search index, which share
+    rendered note fragments.
+    """
+
+    fragments.start(metadata)
+
+    with metrics.stage("notes"):
+        note_writer.write_notes(pages, metadata, changed)
+
+    with metrics.stage("note_lists"):
+        notes_list_writer.write_note_lists(pages, metadata)
+
+    with metrics.stage("search_index"):
+        notes_search_index_writer.write_notes_search_index(pages, metadata)
+
+    fragments.finish(pages, metadata)
 
 
 def _clear_output(metadata: metadata_reader.BlogMetadata) -> None:
@@ -70,11 +254,17 @@ def _clear_output(metadata: metadata_reader.BlogMetadata) -> None:
     output_path = metadata.paths.get("output")
     assert isinstance(output_path, str)
 
+    backend = output.get_backend(output_path)
+
+    if backend is not None:
+        backend[0].clear()
+        return
+
+    utils.make_folder(output_path)
+
     try:
         for item in os.listdir(output_path):
-            protected_files = [".git", "CNAME"]
-
-            if item not in protected_files:
+            if item not in constants.PROTECTED_FILES:
                 project_file_path = os.path.join(output_path, item)
 
                 if os.path.isfile(project_file_path):
@@ -86,9 +276,77 @@ def _clear_output(metadata: metadata_reader.BlogMetadata) -> None:
         utils.raise_error(f"Unable to clear output directory: {output_path}")
 
 
-def _copy_public(metadata: metadata_reader.BlogMetadata) -> None:
+def _open_output(
+    arguments: argparse.Namespace,
+    metadata: metadata_reader.BlogMetadata,
+    changed: set[str] | None,
+) -> str:
     """
-    Copies files from the public directory to the building output directory.
+    Opens the output backend; for an atomic build, redirects the output
+    to a staging folder. Returns the path of the output directory.
+    """
+
+    output_path = metadata.paths["output"]
+
+    if getattr(arguments, "atomic", False):
+        metadata.paths["output"] = staging.prepare_staging(
+            output_path, changed is not None
+        )
+
+    output.open_backend(arguments.output_backend, metadata.paths["output"])
+
+    return output_path
+
+
+def _close_output(
+    arguments: argparse.Namespace,
+    metadata: metadata_reader.BlogMetadata,
+    output_path: str,
+) -> None:
+    """
+    Finishes writing to the output backend (an archive is written at this point);
+    for an atomic build, swaps the staging folder into place.
+    """
+
+    try:
+        output.close_backend(metadata.paths["output"])
+    except (IOError, ValueError) as error:
+        utils.raise_error(f"Unable to write the output to {output_path}: {error}")
+
+    if getattr(arguments, "atomic", False):
+        try:
+            staging.swap_staging(output_path)
+        except OSError as error:
+            utils.raise_error(f"Unable to swap the output {output_path}: {error}")
+
+        metadata.paths["output"] = output_path
+
+
+def _write_metrics(file_path: str) -> None:
+    """
+    Writes build statistics as an OpenMetrics textfile.
+    """
+
+    logging.info("Writing build metrics to %s", file_path)
+
+    try:
+        metrics.write_metrics(file_path)
+    except IOError:
+        utils.raise_error(f"Unable to write build metrics to: {file_path}")
+
+
+def _copy_public(
+    metadata: metadata_reader.BlogMetadata,
+    manifest: dict[str, str],
+    link: bool = False,
+    minify: bool = False,
+) -> None:
+    """
+    Copies (or hard-links) files from the public directory
+    to the building output directory.
+
+    Files from the asset manifest are also copied (minified, if needed)
+    under their fingerprinted names.
     """
 
     logging.info("Copying public folder content to the output folder")
@@ -103,4 +361,82 @@ def _copy_public(metadata: metadata_reader.BlogMetadata) -> None:
         source_path = os.path.join(public_path, item)
         target_path = os.path.join(output_path, item)
 
-        utils.copy_file(source_path, target_path)
+        utils.copy_file(source_path, target_path, link)
+
+    if manifest:
+        assets.write_fingerprinted_assets(metadata, manifest, minify)
+
+
+def _get_sites(arguments: argparse.Namespace) -> list[dict[str, str]]:
+    """
+    Returns a list of sites from the --sites file.
+    """
+
+    sites = utils.read_yaml_file(arguments.sites)
+
+    if not isinstance(sites, list) or not sites:
+        utils.raise_error(f"Unable to find a list of sites in: {arguments.sites}")
+
+    for index, site in enumerate(sites, start=1):
+        if not isinstance(site, dict) or not site.get("output"):
+            utils.raise_error(
+                f"Site #{index} has no output directory: {arguments.sites}"
+            )
+
+        unknown_keys = set(site) - set(constants.SITE_ARGUMENTS)
+
+        if unknown_keys:
+            utils.raise_error(
+                f"Site #{index} has unknown keys ({', '.join(sorted(unknown_keys))}): "
+                f"{arguments.sites}"
+            )
+
+    return sites
+
+
+def _get_site_arguments(
+    arguments: argparse.Namespace, site: dict[str, str]
+) -> argparse.Namespace:
+    """
+    Returns build arguments of a site: shared arguments, overridden by the site's ones.
+
+    Relative paths of a site are relative to the folder of the --sites file;
+    its metadata directory is ".metadata" in the pages directory by default.
+    """
+
+    sites_folder_path = os.path.dirname(os.path.abspath(arguments.sites))
+
+    result = argparse.Namespace(**vars(arguments))
+    result.sites = None
+    result.webserver = False
+    result.link_public = True
+
+    for key, value in site.items():
+        value = str(value)
+
+        if key != "url":
+            value = os.path.join(sites_folder_path, os.path.expanduser(value))
+
+        setattr(result, key, value)
+
+    if "metadata" not in site:
+        result.metadata = os.path.join(result.pages, ".metadata")
+
+    # Each site writes metrics of its own, next to others (a textfile collector
+    # reads all files of a folder).
+
+    if arguments.metrics:
+        metrics_path, extension = os.path.splitext(arguments.metrics)
+        metrics_key = utils.get_path_key(result.output)
+
+        result.metrics = f"{metrics_path}-{metrics_key}{extension}"
+
+    return result
+
+
+def _setup_worker_logging(level: int) -> None:
+    """
+    Sets up logging in a worker process (if it is not inherited from the parent one).
+    """
+
+    logging.basicConfig(level=level, format=constants.LOGGING_FORMAT)
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+
+"""
+Implementation of a checker of internal links & images against the output folder.
+"""
+
+import argparse
+import html
+import logging
+import posixpath
+import re
+from urllib.parse import unquote, urlsplit
+
+from bloget import utils
+from bloget.readers import metadata_reader, pages_reader
+
+_LINK_PATTERN = re.compile(r"""\b(href|src|srcset)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+
+
+def check_blog(arguments: argparse.Namespace) -> None:
+    """
+    Reads blog's pages, then checks their links against the output folder.
+    """
+
+    logging.info("Blog checking")
+
+    metadata = metadata_reader.get_metadata(arguments)
+    pages = pages_reader.get_pages(metadata, arguments.include_drafts)
+
+    check_links(pages, metadata)
+
+
+def check_links(
+    pages: pages_reader.BlogPages, metadata: metadata_reader.BlogMetadata
+) -> None:
+    """
+    Checks that internal links & images of pages point at files in the output folder.
+
+    Links to pages are looked up in the index of pages; paths of output files
+    are indexed once, so any other link is checked by a single lookup too.
+    Broken links are reported by pages; links which lead outside the output
+    folder are reported as warnings.
+    """
+
+    logging.info("LINKS CHECKING...")
+
+    output_paths = get_output_paths(metadata.paths["output"])
+
+    broken_count = 0
+    link_count = 0
+
+    for page in pages.texts + pages.notes + pages.projects:
+        broken = []
+
+        for attribute, link in get_links(page.text):
+            path = _get_output_path(link, metadata.settings["url"], page.path)
+
+            if path is None:
+                continue
+
+            link_count += 1
+
+            if path == ".." or path.startswith("../"):
+                logging.warning(
+                    'Link leads outside the output folder in "%s": %s',
+                    page.path or "/",
+                    link,
+                )
+
+            elif pages.index.get_page(path) is None and not _is_output_path(
+                path, output_paths
+            ):
+                broken.append((attribute, link))
+
+        if broken:
+            logging.error('Broken links in "%s":', page.path or "/")
+
+            for attribute, link in broken:
+                logging.error("  %s: %s", attribute, link)
+
+            broken_count += len(broken)
+
+    logging.info(
+        "%d internal links checked against %d output files",
+        link_count,
+        len(output_paths),
+    )
+
+    if broken_count:
+        utils.raise_error(f"{broken_count} broken internal links are found")
+
+    logging.info("LINKS CHECKING DONE")
+
+
+def get_output_paths(output_path: str) -> set[str]:
+    """
+    Returns relative paths (with slashes) of all files in the output folder.
+    """
+
+    return set(utils.get_files(output_path))
+
+
+def get_links(content: str) -> list[tuple[str, str]]:
+    """
+    Returns attribute names & values of links in an HTML content
+    (each URL of a srcset is a separate link).
+    """
+
+    result = []
+
+    for match in _LINK_PATTERN.finditer(content):
+        attribute = match.group(1)
+        value = html.unescape(match.group(2) or match.group(3) or "")
+
+        if attribute == "srcset":
+            for candidate in value.split(","):
+                if candidate.strip():
+                    result.append((attribute, candidate.split()[0]))
+        else:
+            result.append((attribute, value))
+
+    return result
+
+
+def _get_output_path(link: str, url: str, page_path: str) -> str | None:
+    """
+    Returns a normalized path of a file a link points at, relative to the output
+    folder (or None if the link is external or points at the page itself).
+
+    Relative links are resolved against the page folder; a path which leads
+    outside the output folder starts with "..".
+    """
+
+    url = url.rstrip("/")
+
+    if link.startswith(f"{url}/") or link == url:
+        link = link[len(url) :] or "/"
+
+    parts = urlsplit(link)
+
+    if parts.scheme or parts.netloc or not parts.path:
+        return None
+
+    path = unquote(parts.path)
+
+    if not path.startswith("/"):
+        path = posixpath.join("/", page_path, path)
+
+    path = posixpath.normpath(path.lstrip("/") or ".")
+
+    return "" if path == "." else path
+
+
+def _is_output_path(path: str, output_paths: set[str]) -> bool:
+    """
+    Checks that a path is an output file or a folder with an index file.
+    """
+
+    if path in output_paths:
+        return True
+
+    index_path = f"{path}/index.html" if path else "index.html"
+
+    return index_path in output_paths
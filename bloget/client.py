@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+"""
+Implementation of a thin client of the build daemon.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import socket
+import sys
+
+DAEMON_SOCKET_FILE_NAME = "daemon-{0}.sock"
+
+
+def send_request(arguments: argparse.Namespace) -> None:
+    """
+    Sends a request to the build daemon, then prints its response.
+    """
+
+    request: dict[str, object] = {"command": arguments.action}
+
+    if arguments.action == "partial-rebuild":
+        request["pages"] = [os.path.abspath(path) for path in arguments.paths]
+
+    response = _get_response(get_socket_path(arguments), request)
+
+    print(json.dumps(response, ensure_ascii=False, indent=2))
+
+    if not response.get("ok"):
+        sys.exit(1)
+
+
+def get_socket_path(arguments: argparse.Namespace) -> str:
+    """
+    Returns a path to the Unix socket of the build daemon.
+
+    The cache folder is shared by all blogs, so the default socket is named
+    by the working directory (a daemon & its clients are run in the blog's folder).
+    """
+
+    if arguments.socket:
+        return arguments.socket
+
+    # The same key as utils.get_path_key() gives (utils is too heavy for the client).
+
+    key = hashlib.sha256(os.path.abspath(os.getcwd()).encode()).hexdigest()[:10]
+
+    return os.path.join(arguments.cache, DAEMON_SOCKET_FILE_NAME.format(key))
+
+
+def _get_response(socket_path: str, request: dict[str, object]) -> dict:
+    """
+    Sends a request as a JSON line, then reads a JSON line back.
+    """
+
+    if not hasattr(socket, "AF_UNIX"):
+        sys.exit("Unix sockets are not supported on this platform.")
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(socket_path)
+            connection.sendall(json.dumps(request).encode("utf-8") + b"\n")
+
+            with connection.makefile("rb") as stream:
+                line = stream.readline()
+
+    except OSError as error:
+        sys.exit(f"Unable to connect to the build daemon at {socket_path}: {error}")
+
+    return json.loads(line or b"{}")
@@ -7,5 +7,21 @@ VERSION = "0.1.0"
 ENCODING = "utf-8-sig"
 NOTES_FOLDER_NAME = "notes"
 PROJECTS_FOLDER_NAME = "projects"
+NOTES_LIST_SIZE = 20
 PAGE_TEXT_FILE_NAME = "index.md"
 PAGE_INFO_FILE_NAME = "index.yaml"
+FILE_BUFFER_SIZE = 1024 * 1024
+TEMPLATE_STREAM_BUFFER_SIZE = 256
+IMAGE_FILE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+IMAGE_DERIVATIVE_WIDTHS = (480, 960, 1440)
+IMAGE_DERIVATIVE_FORMATS = ("avif", "webp")
+IMAGE_DERIVATIVE_SIZES = "(max-width: 1008px) 100vw, 1008px"
+FINGERPRINTED_FILE_EXTENSIONS = (".css", ".js")
+FINGERPRINT_LENGTH = 10
+ASSET_MANIFEST_FILE_NAME = "asset-manifest.json"
+DEDUPLICATED_ATTACHMENTS_FOLDER_NAME = "assets/attachments"
+DEDUPLICATED_ATTACHMENT_HASH_LENGTH = 16
+PROTECTED_FILES = (".git", "CNAME")
+MARKDOWN_ENGINES = ("python-markdown", "markdown-it", "mistune", "cmark")
+LOGGING_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+SITE_ARGUMENTS = ("pages", "metadata", "public", "templates", "output", "url")
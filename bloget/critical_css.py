@@ -0,0 +1,620 @@
+#!/usr/bin/env python3
+
+"""
+Implementation of an optional critical CSS stage: rules of the site stylesheet
+which built pages don't use are pruned, and rules which the top of pages uses
+are inlined (per template family), while the rest is loaded asynchronously.
+"""
+
+import hashlib
+import html.parser
+import logging
+import os
+import posixpath
+import re
+from dataclasses import dataclass, field
+
+from bloget import assets, constants, minifier, utils
+from bloget.readers import metadata_reader, pages_reader
+
+STYLESHEET_PATH = "assets/css/site.css"
+
+TEMPLATE_FAMILIES = ("note", "list", "project", "text")
+
+# Elements of a page body which are taken as "above the fold": the header
+# & the beginning of the content.
+
+CRITICAL_ELEMENT_COUNT = 100
+
+# At-rules which contain style rules (so they are pruned as well);
+# other at-rules (@font-face, @keyframes & so on) are kept as they are.
+
+_GROUPING_AT_RULES = ("media", "supports", "layer", "container", "document")
+
+_INLINED_BLOCK_PATTERN = re.compile(
+    r"<style data-critical-css[^>]*>.*?</style>"
+    r'<link rel="preload" as="style" href="([^"]*)"[^>]*>'
+    r"<noscript>.*?</noscript>",
+    flags=re.DOTALL,
+)
+_STYLESHEET_REL_PATTERN = re.compile(r"\brel=[\"']?stylesheet\b", re.IGNORECASE)
+
+# A path of the stylesheet (which may have been fingerprinted) & a link to it.
+
+_STYLESHEET_PATH_PATTERN = (
+    rf"{re.escape(os.path.splitext(STYLESHEET_PATH)[0])}"
+    rf"(?:\.[0-9a-f]{{{constants.FINGERPRINT_LENGTH}}})?"
+    rf"{re.escape(os.path.splitext(STYLESHEET_PATH)[1])}"
+)
+_LINK_PATTERN = re.compile(
+    rf'<link\b[^>]*?\bhref="(?P<prefix>[^"]*?){_STYLESHEET_PATH_PATTERN}"[^>]*>'
+)
+
+# Scripts can build markup, so every word of a script is taken as a tag name,
+# a class or an id which may be used.
+
+_SCRIPT_WORD_SEPARATOR_PATTERN = re.compile(r"[\s\"'`<>=${}();,+]+")
+
+
+@dataclass
+class SelectorNames:
+    """
+    Container for tag names, classes & ids which elements of pages have.
+    """
+
+    tags: set[str] = field(default_factory=set)
+    classes: set[str] = field(default_factory=set)
+    ids: set[str] = field(default_factory=set)
+
+    def add_element(self, tag: str, attributes: list[tuple[str, str | None]]) -> None:
+        """
+        Adds names of an element.
+        """
+
+        self.tags.add(tag.lower())
+
+        for name, value in attributes:
+            if name == "class" and value:
+                self.classes.update(value.split())
+            elif name == "id" and value:
+                self.ids.add(value)
+
+    def add_words(self, words: list[str]) -> None:
+        """
+        Adds words which may be tag names, classes or ids.
+        """
+
+        self.tags.update(word.lower() for word in words)
+        self.classes.update(words)
+        self.ids.update(words)
+
+    def update(self, other: "SelectorNames") -> None:
+        """
+        Adds names of other elements.
+        """
+
+        self.tags.update(other.tags)
+        self.classes.update(other.classes)
+        self.ids.update(other.ids)
+
+    def can_match(self, selector: str) -> bool:
+        """
+        Returns whether a selector can match the elements.
+
+        Structure of a selector (combinators, pseudo-classes & attributes)
+        is not checked, so some unused selectors are kept, but no used one is lost.
+        """
+
+        tags, classes, ids = _get_selector_names(selector)
+
+        return tags <= self.tags and classes <= self.classes and ids <= self.ids
+
+
+class _ElementCollector(html.parser.HTMLParser):
+    """
+    Collects names of all elements of a page & of elements above the fold.
+
+    Words of inline scripts count for both, since scripts may build markup
+    (cards of the projects list, for instance) anywhere on a page.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+
+        self.names = SelectorNames()
+        self.critical_names = SelectorNames()
+
+        self._body_element_count: int | None = None
+        self._in_script = False
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self.names.add_element(tag, attrs)
+
+        if self._body_element_count is not None:
+            self._body_element_count += 1
+
+        if (
+            self._body_element_count is None
+            or self._body_element_count <= CRITICAL_ELEMENT_COUNT
+        ):
+            self.critical_names.add_element(tag, attrs)
+
+        if tag == "body":
+            self._body_element_count = 0
+
+        self._in_script = tag == "script"
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "script":
+            self._in_script = False
+
+    def handle_data(self, data: str) -> None:
+        if self._in_script:
+            words = [
+                word for word in _SCRIPT_WORD_SEPARATOR_PATTERN.split(data) if word
+            ]
+
+            self.names.add_words(words)
+            self.critical_names.add_words(words)
+
+
+def inline_critical_css(
+    pages: pages_reader.BlogPages,
+    metadata: metadata_reader.BlogMetadata,
+    manifest: dict[str, str],
+) -> None:
+    """
+    Prunes rules of the site stylesheet which HTML files of the output folder
+    don't use, then inlines critical rules into the files & makes them load
+    the pruned stylesheet asynchronously.
+
+    The stylesheet is read from the public folder, so an incremental build
+    prunes the complete one again. With fingerprinted assets, the pruned stylesheet
+    gets a name of its own (& the manifest is updated).
+
+    Classes of the critical_css_safelist setting are always kept (for markup
+    which scripts of asset files build, for instance).
+    """
+
+    logging.info("Inlining critical CSS")
+
+    source_path = os.path.join(metadata.paths["public"], *STYLESHEET_PATH.split("/"))
+
+    if not os.path.isfile(source_path):
+        logging.warning("Critical CSS is skipped: there is no %s", source_path)
+        return
+
+    stylesheet = minifier.minify_css(_decode(utils.read_file(source_path)))
+
+    output_path = metadata.paths["output"]
+    families = _get_html_files(pages, output_path)
+
+    names, critical_names = _get_names(
+        output_path, families, metadata.settings.get("critical_css_safelist") or []
+    )
+
+    pruned_stylesheet = prune_css(stylesheet, names)
+    stylesheet_path = _write_stylesheet(metadata, manifest, pruned_stylesheet)
+
+    critical_stylesheets = {
+        family: prune_css(pruned_stylesheet, family_names)
+        for family, family_names in critical_names.items()
+    }
+
+    for path, family in families.items():
+        _inline_stylesheet(
+            output_path, path, family, stylesheet_path, critical_stylesheets[family]
+        )
+
+    logging.info(
+        "Pruned %s: %d bytes -> %d bytes; critical CSS: %s",
+        STYLESHEET_PATH,
+        len(stylesheet.encode()),
+        len(pruned_stylesheet.encode()),
+        ", ".join(
+            f"{family} {len(critical_stylesheets[family].encode())} bytes"
+            for family in TEMPLATE_FAMILIES
+        ),
+    )
+
+
+def prune_css(stylesheet: str, names: SelectorNames) -> str:
+    """
+    Returns rules of a (minified) stylesheet whose selectors can match elements
+    with names given; selectors which cannot are dropped from selector lists.
+    """
+
+    result = []
+
+    for prelude, block in _get_css_blocks(stylesheet):
+        if block is None:
+            result.append(f"{prelude};")
+
+        elif prelude.startswith("@"):
+            at_rule = re.split(r"[\s({]", prelude[1:], maxsplit=1)[0].lower()
+
+            if at_rule in _GROUPING_AT_RULES:
+                block = prune_css(block, names)
+
+                if block:
+                    result.append(f"{prelude}{{{block}}}")
+            else:
+                result.append(f"{prelude}{{{block}}}")
+
+        else:
+            selectors = [
+                selector
+                for selector in _split_selectors(prelude)
+                if names.can_match(selector)
+            ]
+
+            if selectors:
+                result.append(f"{','.join(selectors)}{{{block}}}")
+
+    return "\n".join(result)
+
+
+def _get_html_files(pages: pages_reader.BlogPages, output_path: str) -> dict[str, str]:
+    """
+    Returns template families of HTML files of the output folder by their paths.
+
+    Files of pages are found by page paths; other files in the notes
+    & projects folders are lists, and the rest (404.html, for instance) are texts.
+    """
+
+    page_families = {}
+
+    for family, page_list in (
+        ("note", pages.notes),
+        ("project", pages.projects),
+        ("text", pages.texts),
+    ):
+        for page in page_list:
+            page_families[posixpath.join(page.path, "index.html")] = family
+
+    result = {}
+
+    for path in utils.get_files(output_path):
+        folder_name = path.split("/", 1)[0]
+
+        if not path.endswith(".html") or folder_name in constants.PROTECTED_FILES:
+            continue
+
+        if path in page_families:
+            result[path] = page_families[path]
+        elif folder_name in (
+            constants.NOTES_FOLDER_NAME,
+            constants.PROJECTS_FOLDER_NAME,
+        ):
+            result[path] = "list"
+        else:
+            result[path] = "text"
+
+    return result
+
+
+def _get_names(
+    output_path: str, families: dict[str, str], safelist: list[str]
+) -> tuple[SelectorNames, dict[str, SelectorNames]]:
+    """
+    Returns names of elements of all HTML files & names of elements above
+    the fold by template families (both include classes of the safelist).
+    """
+
+    names = SelectorNames(classes=set(safelist))
+    critical_names = {
+        family: SelectorNames(classes=set(safelist)) for family in TEMPLATE_FAMILIES
+    }
+
+    for path, family in families.items():
+        collector = _ElementCollector()
+        collector.feed(_read_html_file(output_path, path)[1])
+        collector.close()
+
+        names.update(collector.names)
+        critical_names[family].update(collector.critical_names)
+
+    return names, critical_names
+
+
+def _read_html_file(output_path: str, path: str) -> tuple[bytes, str]:
+    """
+    Returns content of an HTML file & its text with critical CSS
+    of a previous build taken out (the stylesheet link is restored).
+    """
+
+    data = utils.read_file(os.path.join(output_path, *path.split("/")))
+    text = _INLINED_BLOCK_PATTERN.sub(
+        r'<link rel="stylesheet" href="\1">', _decode(data)
+    )
+
+    return data, text
+
+
+def _write_stylesheet(
+    metadata: metadata_reader.BlogMetadata,
+    manifest: dict[str, str],
+    stylesheet: str,
+) -> str:
+    """
+    Writes the pruned stylesheet; returns its path in the output folder.
+    """
+
+    path = STYLESHEET_PATH
+
+    if path in manifest:
+        stem, extension = os.path.splitext(path)
+        file_hash = hashlib.sha256(stylesheet.encode()).hexdigest()
+
+        path = f"{stem}.{file_hash[: constants.FINGERPRINT_LENGTH]}{extension}"
+
+    file_path = os.path.join(metadata.paths["output"], *path.split("/"))
+
+    utils.make_folder(os.path.dirname(file_path))
+    utils.replace_file(file_path, stylesheet.encode("utf-8"))
+
+    if path != STYLESHEET_PATH:
+        _remove_superseded_stylesheets(metadata.paths["output"], path)
+
+    if path != manifest.get(STYLESHEET_PATH, path):
+        manifest[STYLESHEET_PATH] = path
+        assets.write_manifest(metadata, manifest)
+
+    return path
+
+
+def _remove_superseded_stylesheets(output_path: str, path: str) -> None:
+    """
+    Removes fingerprinted copies of the stylesheet except the pruned one:
+    the complete stylesheet & pruned ones of previous builds.
+    """
+
+    folder = posixpath.dirname(STYLESHEET_PATH)
+    folder_path = os.path.join(output_path, *folder.split("/"))
+
+    for file_name in utils.get_files(folder_path):
+        file_path = posixpath.join(folder, file_name)
+
+        if file_path not in (path, STYLESHEET_PATH) and re.fullmatch(
+            _STYLESHEET_PATH_PATTERN, file_path
+        ):
+            utils.remove_file(os.path.join(folder_path, *file_name.split("/")))
+
+
+def _inline_stylesheet(
+    output_path: str,
+    path: str,
+    family: str,
+    stylesheet_path: str,
+    critical_stylesheet: str,
+) -> None:
+    """
+    Replaces a link to the stylesheet in an HTML file with critical CSS
+    & an asynchronous link (a usual one is left for browsers without JS).
+    """
+
+    data, text = _read_html_file(output_path, path)
+
+    text = _LINK_PATTERN.sub(
+        lambda link: _get_inlined_block(
+            link, family, stylesheet_path, critical_stylesheet
+        ),
+        text,
+    )
+
+    new_data = text.encode(constants.ENCODING)
+
+    if new_data != data:
+        utils.replace_file(os.path.join(output_path, *path.split("/")), new_data)
+
+
+def _get_inlined_block(
+    link: re.Match, family: str, stylesheet_path: str, critical_stylesheet: str
+) -> str:
+    """
+    Returns critical CSS & links to the stylesheet which replace a link.
+    """
+
+    if not _STYLESHEET_REL_PATTERN.search(link.group(0)):
+        return link.group(0)
+
+    href = f"{link.group('prefix')}{stylesheet_path}"
+
+    # A closing tag in a CSS string would close the style tag.
+
+    critical_stylesheet = critical_stylesheet.replace("</", "<\\/")
+
+    return (
+        f'<style data-critical-css="{family}">{critical_stylesheet}</style>'
+        f'<link rel="preload" as="style" href="{href}" '
+        "onload=\"this.onload=null;this.rel='stylesheet'\">"
+        f'<noscript><link rel="stylesheet" href="{href}"></noscript>'
+    )
+
+
+def _get_css_blocks(stylesheet: str) -> list[tuple[str, str | None]]:
+    """
+    Returns top-level rules of a stylesheet: preludes (selectors or at-rules)
+    & contents of their blocks (None for statements like @import).
+    """
+
+    result: list[tuple[str, str | None]] = []
+
+    depth = 0
+    start = 0
+    block_start = 0
+    index = 0
+
+    while index < len(stylesheet):
+        char = stylesheet[index]
+
+        if char in "\"'":
+            index = _get_string_end(stylesheet, index)
+            continue
+
+        if char == "{":
+            if depth == 0:
+                block_start = index + 1
+            depth += 1
+
+        elif char == "}" and depth:
+            depth -= 1
+
+            if depth == 0:
+                prelude = stylesheet[start : block_start - 1].strip()
+                result.append((prelude, stylesheet[block_start:index].strip()))
+                start = index + 1
+
+        elif char == ";" and depth == 0:
+            result.append((stylesheet[start:index].strip(), None))
+            start = index + 1
+
+        index += 1
+
+    return [(prelude, block) for prelude, block in result if prelude]
+
+
+def _split_selectors(prelude: str) -> list[str]:
+    """
+    Splits a selector list by commas (which are not in parentheses,
+    brackets or strings).
+    """
+
+    result = []
+
+    depth = 0
+    start = 0
+    index = 0
+
+    while index < len(prelude):
+        char = prelude[index]
+
+        if char in "\"'":
+            index = _get_string_end(prelude, index)
+            continue
+
+        if char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            result.append(prelude[start:index].strip())
+            start = index + 1
+
+        index += 1
+
+    result.append(prelude[start:].strip())
+
+    return [selector for selector in result if selector]
+
+
+def _get_selector_names(selector: str) -> tuple[set[str], set[str], set[str]]:
+    """
+    Returns tag names, classes & ids which a selector requires.
+
+    Arguments of pseudo-classes (like :not(pre)) & attribute selectors are skipped.
+    """
+
+    tags: set[str] = set()
+    classes: set[str] = set()
+    ids: set[str] = set()
+
+    index = 0
+
+    while index < len(selector):
+        char = selector[index]
+
+        if char in "([":
+            index = _get_group_end(selector, index)
+
+        elif char == ":":
+            index = _get_identifier_end(
+                selector, index + 1 + selector.startswith("::", index)
+            )
+
+        elif char in ".#":
+            end = _get_identifier_end(selector, index + 1)
+            name = re.sub(r"\\(.)", r"\1", selector[index + 1 : end])
+
+            (classes if char == "." else ids).add(name)
+            index = end
+
+        elif char.isalpha():
+            end = _get_identifier_end(selector, index)
+            tags.add(selector[index:end].lower())
+            index = end
+
+        else:
+            index += 1
+
+    return tags, classes, ids
+
+
+def _get_identifier_end(text: str, start: int) -> int:
+    """
+    Returns the index after a CSS identifier (which may have escaped characters).
+    """
+
+    index = start
+
+    while index < len(text):
+        if text[index] == "\\":
+            index += 2
+        elif text[index].isalnum() or text[index] in "-_" or ord(text[index]) > 127:
+            index += 1
+        else:
+            break
+
+    return min(index, len(text))
+
+
+def _get_group_end(text: str, start: int) -> int:
+    """
+    Returns the index after parentheses or brackets which begin at start.
+    """
+
+    closing = {"(": ")", "[": "]"}
+
+    stack = [closing[text[start]]]
+    index = start + 1
+
+    while index < len(text) and stack:
+        char = text[index]
+
+        if char in "\"'":
+            index = _get_string_end(text, index)
+            continue
+
+        if char == "\\":
+            index += 1
+        elif char in closing:
+            stack.append(closing[char])
+        elif char == stack[-1]:
+            stack.pop()
+
+        index += 1
+
+    return min(index, len(text))
+
+
+def _get_string_end(text: str, start: int) -> int:
+    """
+    Returns the index after a CSS string which begins at start.
+    """
+
+    quote = text[start]
+    index = start + 1
+
+    while index < len(text):
+        if text[index] == "\\":
+            index += 2
+        elif text[index] == quote:
+            return index + 1
+        else:
+            index += 1
+
+    return len(text)
+
+
+def _decode(data: bytes) -> str:
+    return data.decode("utf-8-sig", errors="replace")
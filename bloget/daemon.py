@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+
+"""
+Implementation of a long-running build daemon which keeps blog's data warm.
+"""
+
+import argparse
+import json
+import logging
+import os
+import posixpath
+import socket
+import socketserver
+import time
+import typing
+from dataclasses import dataclass, field
+
+import jinja2
+
+from bloget import builder, client, metrics, utils
+from bloget.readers import metadata_reader, pages_reader
+
+
+@dataclass
+class DaemonState:  # pylint: disable=too-many-instance-attributes
+    """
+    A container with data which the daemon keeps between builds.
+    """
+
+    arguments: argparse.Namespace
+    templates: jinja2.Environment | None = None
+    settings: dict[str, str] = field(default_factory=dict)
+    page_cache: pages_reader.PageCache = field(default_factory=dict)
+    pages: pages_reader.BlogPages | None = None
+    started: float = field(default_factory=time.time)
+    last_build: dict[str, typing.Any] = field(default_factory=dict)
+    running: bool = True
+
+
+def start(arguments: argparse.Namespace) -> None:
+    """
+    Builds a blog, then serves build requests over a Unix socket.
+
+    Compiled templates & parsed pages are kept in memory, so a rebuild only reads
+    pages which have changed since the previous one.
+    """
+
+    if not hasattr(socket, "AF_UNIX"):
+        utils.raise_error("Unix sockets are not supported on this platform")
+
+    state = DaemonState(arguments)
+
+    _build(state)
+
+    socket_path = client.get_socket_path(arguments)
+    utils.make_folder(os.path.dirname(os.path.abspath(socket_path)))
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    handler = _get_request_handler(state)
+
+    with socketserver.UnixStreamServer(socket_path, handler) as server:
+        logging.info("Build daemon is listening on %s", socket_path)
+
+        try:
+            while state.running:
+                server.handle_request()
+
+        except KeyboardInterrupt:
+            pass
+
+        finally:
+            os.unlink(socket_path)
+
+    logging.info("Build daemon has stopped")
+
+
+def _get_request_handler(
+    state: DaemonState,
+) -> type[socketserver.StreamRequestHandler]:
+    """
+    Returns a handler of requests which are sent as JSON lines.
+    """
+
+    class RequestHandler(socketserver.StreamRequestHandler):
+        """
+        Reads a request, then writes a response back.
+        """
+
+        def handle(self) -> None:
+            try:
+                request = json.loads(self.rfile.readline())
+            except ValueError:
+                request = {}
+
+            response = _handle_request(state, request)
+
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8"))
+            self.wfile.write(b"\n")
+
+    return RequestHandler
+
+
+def _handle_request(state: DaemonState, request: dict) -> dict[str, typing.Any]:
+    """
+    Executes a request.
+    """
+
+    command = request.get("command")
+
+    logging.info("Build daemon request: %s", command)
+
+    if command == "status":
+        result = _get_status(state)
+    elif command == "rebuild":
+        result = _build(state)
+    elif command == "partial-rebuild":
+        result = _build(state, request.get("pages") or [])
+    elif command == "stop":
+        state.running = False
+        result = {"ok": True}
+    else:
+        result = {"ok": False, "error": f"Unknown command: {command}"}
+
+    return result
+
+
+def _build(state: DaemonState, paths: list[str] | None = None) -> dict[str, typing.Any]:
+    """
+    Builds a blog using data kept in memory.
+
+    If paths of changed pages are given, only these pages are read again
+    & only outputs which depend on them are written.
+    """
+
+    started = time.perf_counter()
+    metrics.start()
+
+    try:
+        metadata = metadata_reader.get_metadata(state.arguments)
+
+        if state.templates is None:
+            state.templates = metadata.templates
+        else:
+            metadata.templates = state.templates
+
+        # Parsed content depends on settings (the blog URL, for instance).
+
+        if metadata.settings != state.settings:
+            state.page_cache.clear()
+            state.settings = dict(metadata.settings)
+
+        changed = None
+
+        if paths is not None:
+            changed = {
+                _get_page_folder_path(path, metadata, state.pages) for path in paths
+            }
+
+            for folder_path in changed:
+                state.page_cache.pop(folder_path, None)
+
+        pages = pages_reader.get_pages(
+            metadata, state.arguments.include_drafts, state.page_cache
+        )
+
+        builder.write_blog(state.arguments, metadata, pages, changed)
+        state.pages = pages
+
+    except SystemExit as error:
+        return {"ok": False, "error": str(error)}
+
+    state.last_build = {
+        "number": state.last_build.get("number", 0) + 1,
+        "finished": time.time(),
+        "duration": round(time.perf_counter() - started, 3),
+        "partial": changed is not None,
+        "pages": len(pages.texts) + len(pages.notes) + len(pages.projects),
+    }
+
+    return {"ok": True, **state.last_build}
+
+
+def _get_status(state: DaemonState) -> dict[str, typing.Any]:
+    """
+    Returns information about the daemon & the last build.
+    """
+
+    return {
+        "ok": True,
+        "uptime": round(time.time() - state.started, 3),
+        "cached_pages": len(state.page_cache),
+        "last_build": state.last_build,
+    }
+
+
+def _get_page_folder_path(
+    path: str,
+    metadata: metadata_reader.BlogMetadata,
+    pages: pages_reader.BlogPages | None,
+) -> str:
+    """
+    Returns a page folder path (as pages reader makes it) by a path of a page
+    folder or a file inside it (subfolders included).
+
+    Pages of the previous build are looked up by paths of the folder & its parents;
+    a folder which is not a page yet (a new page) is returned as it is.
+    """
+
+    pages_path = metadata.paths["pages"]
+
+    if os.path.isfile(path):
+        path = os.path.dirname(path)
+
+    relative_path = os.path.relpath(os.path.abspath(path), os.path.abspath(pages_path))
+    page_path = "" if relative_path == "." else relative_path.replace(os.sep, "/")
+
+    if pages is not None:
+        parent_path = page_path
+
+        while True:
+            page = pages.index.get_page(parent_path)
+
+            if page is not None:
+                return page.folder_path
+
+            parent_path = posixpath.dirname(parent_path)
+
+            # The root page is only looked up for its own folder,
+            # since its subfolders are other pages.
+
+            if not parent_path:
+                break
+
+    return (
+        pages_path if relative_path == "." else os.path.join(pages_path, relative_path)
+    )
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+
+"""
+Implementation of a cache of rendered note fragments (the "note" macro),
+which note pages, note lists & the search index share.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+
+from markupsafe import Markup
+
+from bloget import metrics, utils
+from bloget.readers import metadata_reader, page_reader, pages_reader
+
+FRAGMENTS_VERSION = 1
+
+
+@dataclass
+class FragmentCache:
+    """
+    Container for rendered fragments: hashes of their inputs & HTML by keys
+    (a note path, whether the title is shown & whether images are lazy).
+    """
+
+    template_hash: str = ""
+    fragments: dict[tuple[str, bool, bool], tuple[str, str]] = field(
+        default_factory=dict
+    )
+    loaded: bool = False
+
+
+_cache = FragmentCache()
+
+
+def start(metadata: metadata_reader.BlogMetadata) -> None:
+    """
+    Starts a build: fragments of previous builds of the process (or persisted
+    ones) are reused while their notes & the template stay the same.
+    """
+
+    _cache.template_hash = _get_template_hash(metadata)
+
+    if not _cache.loaded and metadata.settings.get("persistent_fragments"):
+        _cache.fragments.update(_read_cache(_get_cache_file_path(metadata)))
+
+    _cache.loaded = True
+
+
+def finish(
+    pages: pages_reader.BlogPages, metadata: metadata_reader.BlogMetadata
+) -> None:
+    """
+    Drops fragments of notes which are gone, then persists the rest
+    (if it is enabled).
+    """
+
+    note_paths = {note.path for note in pages.notes}
+
+    for key in [key for key in _cache.fragments if key[0] not in note_paths]:
+        del _cache.fragments[key]
+
+    if metadata.settings.get("persistent_fragments"):
+        fragments = [[*key, *value] for key, value in _cache.fragments.items()]
+        cache = {"version": FRAGMENTS_VERSION, "fragments": fragments}
+
+        utils.make_file(
+            _get_cache_file_path(metadata), json.dumps(cache, ensure_ascii=False)
+        )
+
+
+def get_note_fragment(
+    note: page_reader.BlogPage,
+    metadata: metadata_reader.BlogMetadata,
+    show_title: bool = False,
+    lazy: bool = False,
+) -> Markup:
+    """
+    Returns a note rendered by the "note" macro of macros.jinja.
+    """
+
+    key = (note.path, show_title, lazy)
+    content_hash = _get_content_hash(note, metadata)
+
+    cached = _cache.fragments.get(key)
+
+    if cached is not None and cached[0] == content_hash:
+        metrics.add_cache_lookups("note-fragments", 1, 0)
+
+        return Markup(cached[1])
+
+    metrics.add_cache_lookups("note-fragments", 0, 1)
+
+    template = metadata.templates.get_template("macros.jinja")
+
+    result = template.module.note(
+        note, metadata.tags, metadata.settings, metadata.language, show_title, lazy
+    )
+
+    _cache.fragments[key] = (content_hash, str(result))
+
+    return Markup(result)
+
+
+def _get_content_hash(
+    note: page_reader.BlogPage, metadata: metadata_reader.BlogMetadata
+) -> str:
+    """
+    Returns a hash of everything a fragment is made of.
+    """
+
+    data = json.dumps(
+        [
+            _cache.template_hash,
+            note.path,
+            note.title,
+            note.created,
+            [[tag, metadata.tags.get(tag)] for tag in note.tags or []],
+            metadata.settings.get("url"),
+            metadata.language.get("months"),
+            note.text,
+        ],
+        ensure_ascii=False,
+        default=str,
+    )
+
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def _get_template_hash(metadata: metadata_reader.BlogMetadata) -> str:
+    """
+    Returns a hash of macros.jinja source.
+    """
+
+    source = metadata.templates.loader.get_source(metadata.templates, "macros.jinja")
+
+    return hashlib.sha256(source[0].encode()).hexdigest()
+
+
+def _read_cache(file_path: str) -> dict[tuple[str, bool, bool], tuple[str, str]]:
+    """
+    Returns persisted fragments.
+    """
+
+    result = utils.read_json_file(file_path)
+
+    if result.get("version") != FRAGMENTS_VERSION:
+        return {}
+
+    return {
+        (path, show_title, lazy): (content_hash, html)
+        for path, show_title, lazy, content_hash, html in result.get("fragments", [])
+    }
+
+
+def _get_cache_file_path(metadata: metadata_reader.BlogMetadata) -> str:
+    """
+    Returns a path to the cache file of the output folder (several outputs
+    can share a cache folder).
+    """
+
+    folder_path = os.path.join(metadata.paths["cache"], "note-fragments")
+    utils.make_folder(folder_path)
+
+    output_key = utils.get_path_key(metadata.paths["output"])
+
+    return os.path.join(folder_path, f"{output_key}.json")
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+
+"""
+Implementation of image helpers: reading image sizes & making responsive derivatives.
+"""
+
+import functools
+import logging
+import os
+import re
+import struct
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from bloget import constants, utils
+
+# EXIF orientations which rotate an image by 90 or 270 degrees.
+_TRANSPOSING_ORIENTATIONS = (5, 6, 7, 8)
+
+# JPEG markers of frames (SOF0-SOF15 except DHT, JPG & DAC) which contain dimensions.
+_JPEG_FRAME_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+_NOT_LAZY_IMAGE_PATTERN = re.compile(r"<img(?![^>]*\sloading=)")
+
+
+@dataclass
+class ImageDerivative:
+    """
+    Container for a resized & re-encoded variant of an image attachment.
+    """
+
+    width: int
+    image_format: str
+    file_name: str
+    cache_file_name: str
+
+
+def is_image(file_name: str) -> bool:
+    """
+    Checks whether a file is an image derivatives can be made of.
+    """
+
+    return os.path.splitext(file_name)[1].lower() in constants.IMAGE_FILE_EXTENSIONS
+
+
+@functools.lru_cache(maxsize=None)
+def get_formats() -> tuple[str, ...]:
+    """
+    Returns formats of derivatives which the installed Pillow is able to write.
+    """
+
+    try:
+        # pylint: disable-next=import-outside-toplevel
+        from PIL import features
+    except ImportError:
+        utils.raise_error("Responsive images require Pillow to be installed")
+
+    result = []
+
+    for image_format in constants.IMAGE_DERIVATIVE_FORMATS:
+        try:
+            is_supported = features.check(image_format)
+        except ValueError:
+            is_supported = False
+
+        if is_supported:
+            result.append(image_format)
+        else:
+            logging.warning("Pillow is unable to write %s images", image_format)
+
+    return tuple(result)
+
+
+def get_derivatives(file_path: str) -> list[ImageDerivative]:
+    """
+    Returns derivatives to make for an image.
+
+    Images are never upscaled: a derivative is only made for a width which is
+    less than the width of the original image (or equal to it).
+    """
+
+    file_hash = utils.get_file_hash(file_path)
+
+    return _get_derivatives(os.path.basename(file_path), file_hash, file_path)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_derivatives(
+    file_name: str, file_hash: str, file_path: str
+) -> list[ImageDerivative]:
+    """
+    Returns derivatives to make for an image (the memoized part).
+    """
+
+    size = get_image_size(file_path)
+
+    if size is None:
+        logging.warning('Unable to read size of an image "%s"', file_path)
+        return []
+
+    original_width = size[0]
+    widths = [w for w in constants.IMAGE_DERIVATIVE_WIDTHS if w < original_width]
+
+    if original_width <= max(constants.IMAGE_DERIVATIVE_WIDTHS):
+        widths.append(original_width)
+
+    stem = os.path.splitext(file_name)[0]
+
+    return [
+        ImageDerivative(
+            width=width,
+            image_format=image_format,
+            file_name=f"{stem}.{width}w.{image_format}",
+            cache_file_name=f"{file_hash}.{width}w.{image_format}",
+        )
+        for image_format in get_formats()
+        for width in widths
+    ]
+
+
+def lazy_images(content: str) -> str:
+    """
+    Makes images without a loading attribute lazy-loading.
+
+    Intended for content which is known to be below the fold (for instance,
+    every note on a note list except the first one).
+    """
+
+    return _NOT_LAZY_IMAGE_PATTERN.sub('<img loading="lazy"', content)
+
+
+def get_image_size(file_path: str) -> tuple[int, int] | None:
+    """
+    Returns width & height of a JPEG, PNG, GIF or WebP image (as it is displayed).
+
+    Only the header of a file is read; pixels are never decoded.
+    Returns None for an unknown format.
+    """
+
+    return _get_image_size(utils.get_file_hash(file_path), file_path)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_image_size(file_hash: str, file_path: str) -> tuple[int, int] | None:
+    """
+    Returns width & height of an image (the memoized part).
+    """
+
+    logging.debug('Reading size of an image "%s" (%s)...', file_path, file_hash)
+
+    try:
+        with open(file_path, "rb") as file:
+            head = file.read(32)
+
+            if head.startswith(b"\x89PNG\r\n\x1a\n"):
+                return struct.unpack(">II", head[16:24])
+
+            if head[:6] in (b"GIF87a", b"GIF89a"):
+                return struct.unpack("<HH", head[6:10])
+
+            if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+                return _get_webp_size(head)
+
+            if head[:2] == b"\xff\xd8":
+                file.seek(2)
+                return _get_jpeg_size(file)
+
+    except (IOError, struct.error):
+        logging.debug('Unable to read size of an image "%s"', file_path)
+
+    return None
+
+
+def _get_webp_size(head: bytes) -> tuple[int, int] | None:
+    """
+    Returns size of a WebP image by first 30 bytes of its file.
+    """
+
+    chunk = head[12:16]
+
+    if chunk == b"VP8 ":
+        width, height = struct.unpack("<HH", head[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+
+    if chunk == b"VP8L":
+        bits = int.from_bytes(head[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+
+    if chunk == b"VP8X":
+        width = int.from_bytes(head[24:27], "little") + 1
+        height = int.from_bytes(head[27:30], "little") + 1
+        return width, height
+
+    return None
+
+
+def _get_jpeg_size(file: BinaryIO) -> tuple[int, int] | None:
+    """
+    Returns size of a JPEG image by walking its segments up to a frame header.
+    """
+
+    orientation = 1
+
+    while True:
+        marker = file.read(2)
+
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+
+        if marker[1] in (0x01, 0xFF) or 0xD0 <= marker[1] <= 0xD7:
+            continue
+
+        (length,) = struct.unpack(">H", file.read(2))
+
+        if marker[1] in _JPEG_FRAME_MARKERS:
+            height, width = struct.unpack(">xHH", file.read(5))
+
+            if orientation in _TRANSPOSING_ORIENTATIONS:
+                return height, width
+
+            return width, height
+
+        segment = file.read(length - 2)
+
+        if marker[1] == 0xE1 and segment.startswith(b"Exif\x00\x00"):
+            orientation = _get_exif_orientation(segment[6:])
+
+
+def _get_exif_orientation(tiff: bytes) -> int:
+    """
+    Returns an orientation tag value of EXIF data (1 if there is no such tag).
+    """
+
+    byte_order = {b"II": "<", b"MM": ">"}.get(tiff[:2])
+
+    if byte_order is None:
+        return 1
+
+    (offset,) = struct.unpack(f"{byte_order}I", tiff[4:8])
+    (count,) = struct.unpack(f"{byte_order}H", tiff[offset : offset + 2])
+
+    for index in range(count):
+        entry = offset + 2 + index * 12
+        tag, _, _, value = struct.unpack(f"{byte_order}HHIH", tiff[entry : entry + 10])
+
+        if tag == 0x0112:
+            return value
+
+    return 1
+
+
+def make_derivative(
+    source_path: str, target_path: str, width: int, image_format: str
+) -> None:
+    """
+    Resizes & re-encodes an image.
+
+    Intended to be run in a worker process.
+    """
+
+    # pylint: disable-next=import-outside-toplevel
+    from PIL import Image, ImageOps
+
+    temporary_path = f"{target_path}.{os.getpid()}.tmp"
+
+    with Image.open(source_path) as image:
+        image = ImageOps.exif_transpose(image)
+
+        if image.mode not in ("RGB", "RGBA"):
+            has_alpha = "A" in image.getbands() or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+
+        height = max(1, round(image.height * width / image.width))
+
+        if width != image.width:
+            image = image.resize((width, height), Image.Resampling.LANCZOS)
+
+        image.save(temporary_path, format=image_format.upper(), quality=80)
+
+    os.replace(temporary_path, target_path)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+
+"""
+Implementation of a benchmark of Markdown engines over blog's pages:
+rendering speed & conformance of HTML to the one of the default engine.
+"""
+
+import argparse
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass, field
+
+from bs4 import BeautifulSoup
+
+from bloget import constants, markdown_engines
+from bloget.readers import metadata_reader, page_reader, pages_reader
+from bloget.readers.utils import content_parsing_utils
+
+_SPACE_PATTERN = re.compile(r"\s+")
+_SPACE_BETWEEN_TAGS_PATTERN = re.compile(r">\s+<")
+
+
+@dataclass
+class EngineResult:
+    """
+    Container for benchmark results of a Markdown engine.
+    """
+
+    engine: str
+    render_time: float = 0.0
+    parse_time: float = 0.0
+    pages: dict[str, str] = field(default_factory=dict)
+
+
+def run_benchmark(arguments: argparse.Namespace) -> None:
+    """
+    Renders all pages with each engine, then prints rendering times & pages
+    which HTML differs from the one of the reference engine (the first one).
+
+    HTML is compared after embeds & links are processed, so differences
+    in these are reported too.
+    """
+
+    logging.info("Markdown engines benchmarking")
+
+    metadata = metadata_reader.get_metadata(arguments)
+    sources = _get_sources(metadata)
+
+    engines = arguments.engines or [
+        engine
+        for engine in constants.MARKDOWN_ENGINES
+        if markdown_engines.is_available(engine)
+    ]
+
+    results = []
+
+    for engine in engines:
+        logging.info('Benchmarking "%s" engine', engine)
+
+        metadata.settings["markdown_engine"] = engine
+        results.append(_get_engine_result(engine, sources, metadata, arguments.repeat))
+
+    print(_get_report(results, len(sources)))
+
+
+def _get_sources(metadata: metadata_reader.BlogMetadata) -> dict[str, str]:
+    """
+    Returns Markdown texts of all pages by their paths.
+    """
+
+    result = {}
+
+    pages_path = metadata.paths["pages"]
+
+    for folder_path, _ in pages_reader.get_page_folders(pages_path):
+        page_path = os.path.relpath(folder_path, pages_path).replace(os.sep, "/")
+        page_source = page_reader.get_page_source(folder_path)[1]
+
+        result["" if page_path == "." else page_path] = page_source
+
+    return result
+
+
+def _get_engine_result(
+    engine: str,
+    sources: dict[str, str],
+    metadata: metadata_reader.BlogMetadata,
+    repeat: int,
+) -> EngineResult:
+    """
+    Measures the best time of rendering all pages (of several runs),
+    along with time of a full parse.
+    """
+
+    result = EngineResult(engine)
+
+    render_times = []
+
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+
+        for content in sources.values():
+            content_parsing_utils.render_markdown(content, metadata)
+
+        render_times.append(time.perf_counter() - started)
+
+    result.render_time = min(render_times)
+
+    started = time.perf_counter()
+
+    for page_path, content in sources.items():
+        result.pages[page_path] = content_parsing_utils.parse(
+            content, page_path, metadata
+        )
+
+    result.parse_time = time.perf_counter() - started
+
+    return result
+
+
+def _get_report(results: list[EngineResult], page_count: int) -> str:
+    """
+    Returns a table of results (the first engine is the reference one).
+    """
+
+    if not results:
+        return "No Markdown engines to benchmark"
+
+    reference = results[0]
+
+    lines = [
+        f"{page_count} pages; HTML is compared with the one of {reference.engine}",
+        "",
+        f"{'Engine':<18}{'Render, s':>12}{'Parse, s':>12}{'Speed-up':>10}"
+        f"{'Differs':>10}",
+    ]
+
+    differences = {}
+
+    for result in results:
+        differences[result.engine] = sorted(
+            page_path
+            for page_path, page_html in result.pages.items()
+            if _normalize_html(page_html) != _normalize_html(reference.pages[page_path])
+        )
+
+        speedup = (
+            reference.render_time / result.render_time if result.render_time else 0
+        )
+
+        lines.append(
+            f"{result.engine:<18}{result.render_time:>12.4f}{result.parse_time:>12.4f}"
+            f"{speedup:>9.2f}x{len(differences[result.engine]):>10}"
+        )
+
+    for engine, page_paths in differences.items():
+        if page_paths:
+            lines.append("")
+            lines.append(f"Pages which differ with {engine}:")
+            lines += [f"  {page_path or '/'}" for page_path in page_paths]
+
+    return "\n".join(lines)
+
+
+def _normalize_html(content: str) -> str:
+    """
+    Returns HTML without differences which don't matter for a browser
+    (attribute quoting, self-closing tags & whitespace between tags).
+    """
+
+    content = BeautifulSoup(content, features="html.parser").decode()
+    content = _SPACE_BETWEEN_TAGS_PATTERN.sub("><", content)
+
+    return _SPACE_PATTERN.sub(" ", content).strip()
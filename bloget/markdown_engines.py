@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+"""
+Implementation of Markdown engines which pages can be rendered with.
+
+Python-Markdown is the default one; other engines are optional dependencies.
+"""
+
+import functools
+from collections.abc import Callable
+
+from markdown import markdown
+
+from bloget import constants, utils
+
+DEFAULT_MARKDOWN_ENGINE = "python-markdown"
+
+# Packages which engines require (to tell a user what to install).
+
+MARKDOWN_ENGINE_PACKAGES = {
+    "python-markdown": "Markdown",
+    "markdown-it": "markdown-it-py",
+    "mistune": "mistune",
+    "cmark": "cmarkgfm",
+}
+
+
+def render(content: str, engine: str | None = None) -> str:
+    """
+    Renders Markdown to HTML with an engine (the default one, if it is not given).
+    """
+
+    return get_renderer(engine or DEFAULT_MARKDOWN_ENGINE)(content)
+
+
+@functools.lru_cache(maxsize=None)
+def get_renderer(engine: str) -> Callable[[str], str]:
+    """
+    Returns a function which renders Markdown to HTML with an engine.
+    """
+
+    if engine not in constants.MARKDOWN_ENGINES:
+        utils.raise_error(
+            f"Unknown Markdown engine: {engine} "
+            f"(available: {', '.join(constants.MARKDOWN_ENGINES)})"
+        )
+
+    try:
+        result = _RENDERER_FACTORIES[engine]()
+    except ImportError:
+        utils.raise_error(
+            f'Markdown engine "{engine}" requires '
+            f"{MARKDOWN_ENGINE_PACKAGES[engine]} to be installed"
+        )
+
+    return result
+
+
+def is_available(engine: str) -> bool:
+    """
+    Checks whether a package which an engine requires is installed.
+    """
+
+    try:
+        _RENDERER_FACTORIES[engine]()
+    except ImportError:
+        return False
+
+    return True
+
+
+def _get_python_markdown_renderer() -> Callable[[str], str]:
+    return markdown
+
+
+def _get_markdown_it_renderer() -> Callable[[str], str]:
+    # pylint: disable-next=import-outside-toplevel
+    from markdown_it import MarkdownIt
+
+    return MarkdownIt("commonmark").render
+
+
+def _get_mistune_renderer() -> Callable[[str], str]:
+    # pylint: disable-next=import-outside-toplevel
+    import mistune
+
+    return mistune.create_markdown(escape=False)
+
+
+def _get_cmark_renderer() -> Callable[[str], str]:
+    # pylint: disable-next=import-outside-toplevel
+    import cmarkgfm
+
+    # Raw HTML (embeds, for instance) is kept, as other engines do.
+
+    options = cmarkgfm.Options.CMARK_OPT_UNSAFE
+
+    return functools.partial(cmarkgfm.markdown_to_html, options=options)
+
+
+_RENDERER_FACTORIES: dict[str, Callable[[], Callable[[str], str]]] = {
+    "python-markdown": _get_python_markdown_renderer,
+    "markdown-it": _get_markdown_it_renderer,
+    "mistune": _get_mistune_renderer,
+    "cmark": _get_cmark_renderer,
+}
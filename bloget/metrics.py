@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+
+"""
+Implementation of build statistics & their export as an OpenMetrics textfile
+(the format of the node exporter textfile collector).
+"""
+
+import contextlib
+import os
+import sys
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+METRICS_PREFIX = "bloget_build"
+
+
+@dataclass
+class BuildMetrics:
+    """
+    Container for statistics of a build.
+    """
+
+    started: float = field(default_factory=time.perf_counter)
+    stages: dict[str, float] = field(default_factory=dict)
+    pages: dict[str, int] = field(default_factory=dict)
+    caches: dict[str, list[int]] = field(default_factory=dict)
+    bytes: dict[str, int] = field(
+        default_factory=lambda: {"written": 0, "copied": 0, "skipped": 0}
+    )
+
+
+_metrics = BuildMetrics()
+
+
+def start() -> None:
+    """
+    Starts collecting statistics of a new build.
+    """
+
+    vars(_metrics).update(vars(BuildMetrics()))
+
+
+@contextlib.contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Measures duration of a build stage.
+    """
+
+    started = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - started
+        _metrics.stages[name] = _metrics.stages.get(name, 0.0) + duration
+
+
+def add_pages(page_type: str, count: int) -> None:
+    """
+    Counts pages of a type processed.
+    """
+
+    _metrics.pages[page_type] = _metrics.pages.get(page_type, 0) + count
+
+
+def add_cache_lookups(cache: str, hits: int, misses: int) -> None:
+    """
+    Counts hits & misses of a cache.
+    """
+
+    lookups = _metrics.caches.setdefault(cache, [0, 0])
+
+    lookups[0] += hits
+    lookups[1] += misses
+
+
+def add_bytes(operation: str, count: int) -> None:
+    """
+    Counts bytes written, copied or skipped (not copied, since they are in place).
+    """
+
+    _metrics.bytes[operation] = _metrics.bytes.get(operation, 0) + count
+
+
+def write_metrics(file_path: str) -> None:
+    """
+    Writes statistics of a build as an OpenMetrics textfile.
+
+    The file is replaced at once, so a collector never reads a partial file.
+    """
+
+    temporary_path = f"{file_path}.{os.getpid()}.tmp"
+
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        file.write(get_metrics_text())
+
+    os.replace(temporary_path, file_path)
+
+
+def get_metrics_text() -> str:
+    """
+    Returns statistics of a build in the OpenMetrics text format.
+    """
+
+    lines: list[str] = []
+
+    _add_metric(
+        lines,
+        "duration_seconds",
+        "Duration of the build.",
+        [({}, time.perf_counter() - _metrics.started)],
+    )
+
+    _add_metric(
+        lines,
+        "stage_duration_seconds",
+        "Duration of a build stage.",
+        [({"stage": name}, value) for name, value in _metrics.stages.items()],
+    )
+
+    _add_metric(
+        lines,
+        "pages",
+        "Pages processed by type.",
+        [({"type": name}, value) for name, value in _metrics.pages.items()],
+    )
+
+    _add_metric(
+        lines,
+        "cache_lookups",
+        "Cache lookups by result.",
+        [
+            ({"cache": name, "result": result}, value)
+            for name, (hits, misses) in _metrics.caches.items()
+            for result, value in (("hit", hits), ("miss", misses))
+        ],
+    )
+
+    _add_metric(
+        lines,
+        "cache_hit_ratio",
+        "Share of cache lookups which were hits.",
+        [
+            ({"cache": name}, hits / (hits + misses))
+            for name, (hits, misses) in _metrics.caches.items()
+            if hits + misses
+        ],
+    )
+
+    _add_metric(
+        lines,
+        "bytes",
+        "Bytes of files written, copied & skipped (left in place).",
+        [({"operation": name}, value) for name, value in _metrics.bytes.items()],
+    )
+
+    _add_metric(
+        lines,
+        "peak_memory_bytes",
+        "Peak resident memory of the build process & its worker processes.",
+        _get_peak_memory(),
+    )
+
+    _add_metric(
+        lines,
+        "last_finished_timestamp_seconds",
+        "Time the build has finished at.",
+        [({}, time.time())],
+    )
+
+    lines.append("# EOF")
+
+    return "\n".join(lines) + "\n"
+
+
+def _add_metric(
+    lines: list[str],
+    name: str,
+    description: str,
+    samples: list[tuple[dict[str, str], float]],
+) -> None:
+    """
+    Adds a gauge metric family with its samples.
+    """
+
+    name = f"{METRICS_PREFIX}_{name}"
+
+    lines.append(f"# HELP {name} {description}")
+    lines.append(f"# TYPE {name} gauge")
+
+    for labels, value in samples:
+        label_text = ",".join(
+            f'{key}="{_escape_label_value(label_value)}"'
+            for key, label_value in labels.items()
+        )
+
+        if label_text:
+            label_text = f"{{{label_text}}}"
+
+        lines.append(f"{name}{label_text} {_format_value(value)}")
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    return str(value) if isinstance(value, int) else str(round(value, 6))
+
+
+def _get_peak_memory() -> list[tuple[dict[str, str], float]]:
+    """
+    Returns peak resident memory of the process & its children
+    (where the platform reports it).
+    """
+
+    try:
+        # pylint: disable-next=import-outside-toplevel
+        import resource
+    except ImportError:
+        return []
+
+    # Linux reports kilobytes, macOS reports bytes.
+
+    factor = 1 if sys.platform == "darwin" else 1024
+
+    return [
+        ({"process": name}, resource.getrusage(who).ru_maxrss * factor)
+        for name, who in (
+            ("self", resource.RUSAGE_SELF),
+            ("children", resource.RUSAGE_CHILDREN),
+        )
+    ]
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+"""
+Implementation of a migration of pages from the two-file layout
+(index.yaml & index.md) to index.md files with front matter.
+"""
+
+import argparse
+import logging
+import os
+
+from bloget import constants, utils
+from bloget.readers import page_reader, pages_reader
+
+
+def migrate_pages(arguments: argparse.Namespace) -> None:
+    """
+    Moves information of pages from index.yaml files to front matter
+    of their index.md files, then removes the index.yaml files.
+    """
+
+    logging.info("PAGES MIGRATION...")
+
+    pages_path = os.path.abspath(arguments.pages)
+
+    migrated_count = 0
+
+    for folder_path, _ in pages_reader.get_page_folders(pages_path):
+        if _migrate_page(folder_path, arguments.dry_run):
+            migrated_count += 1
+
+    if arguments.dry_run:
+        logging.info("%d pages would be migrated", migrated_count)
+    else:
+        logging.info("%d pages migrated", migrated_count)
+
+    logging.info("PAGES MIGRATION DONE")
+
+
+def _migrate_page(folder_path: str, dry_run: bool) -> bool:
+    """
+    Migrates a page; returns whether the page is (or would be) migrated.
+
+    Text of the index.yaml file is kept as it is (along with its comments).
+    """
+
+    info_file_path = os.path.join(folder_path, constants.PAGE_INFO_FILE_NAME)
+    text_file_path = os.path.join(folder_path, constants.PAGE_TEXT_FILE_NAME)
+
+    if not os.path.isfile(info_file_path):
+        return False
+
+    page_info = _read_text_file(info_file_path)
+    page_source = ""
+
+    if os.path.isfile(text_file_path):
+        page_source = _read_text_file(text_file_path)
+
+    if page_reader.split_front_matter(page_source)[0] is not None:
+        logging.warning(
+            'Page "%s" is skipped: its %s has front matter already',
+            folder_path,
+            constants.PAGE_TEXT_FILE_NAME,
+        )
+        return False
+
+    logging.info('Page "%s" is migrated', folder_path)
+
+    if dry_run:
+        return True
+
+    if page_info and not page_info.endswith("\n"):
+        page_info += "\n"
+
+    content = f"---\n{page_info}---\n{page_source}"
+
+    utils.replace_file(text_file_path, content.encode(constants.ENCODING))
+    os.remove(info_file_path)
+
+    return True
+
+
+def _read_text_file(file_path: str) -> str:
+    try:
+        with open(file_path, encoding=constants.ENCODING) as file:
+            return file.read()
+
+    except IOError:
+        utils.raise_error(f"Unable to read a file: {file_path}")
+
+    return ""
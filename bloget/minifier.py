@@ -0,0 +1,522 @@
+#!/usr/bin/env python3
+
+"""
+Implementation of an optional minification stage for built HTML, CSS & JS files.
+"""
+
+import codecs
+import hashlib
+import logging
+import os
+import re
+from collections.abc import Iterator
+
+from bloget import constants, metrics, utils
+from bloget.readers import metadata_reader
+
+MINIFIER_VERSION = "2"
+
+# Minified files of the least recently used cache entries are removed
+# once the cache folder outgrows this size (in bytes).
+MINIFIER_CACHE_SIZE = 64 * 1024 * 1024
+
+MINIFIED_FILE_TYPES = {".html": "html", ".css": "css", ".js": "js"}
+
+_PROTECTED_HTML_PATTERN = re.compile(
+    r"(<(pre|code|textarea|script|style)\b[^>]*>.*?</\2\s*>)",
+    flags=re.DOTALL | re.IGNORECASE,
+)
+_HTML_COMMENT_PATTERN = re.compile(r"<!--(?!\[).*?-->", flags=re.DOTALL)
+_HTML_SPACE_PATTERN = re.compile(r"\s+")
+_OPENING_TAG_PATTERN = re.compile(r"<(\w+)\b([^>]*)>")
+_SCRIPT_TYPE_PATTERN = re.compile(r"\btype\s*=\s*[\"']?([^\"'\s>]+)", re.IGNORECASE)
+
+_JS_TYPES = {"text/javascript", "application/javascript", "module"}
+
+# Characters after which a slash starts a regular expression literal, not a division.
+_JS_REGEX_PRECEDING = set("(,=:[!&|?{};+-*%<>~^")
+
+# Keywords after which a slash starts a regular expression literal.
+_JS_REGEX_KEYWORDS = {
+    "await",
+    "case",
+    "delete",
+    "do",
+    "else",
+    "in",
+    "instanceof",
+    "new",
+    "of",
+    "return",
+    "throw",
+    "typeof",
+    "void",
+    "yield",
+}
+_JS_LAST_WORD_PATTERN = re.compile(r"(?<![\w$.])[\w$]+$")
+
+# Characters around which whitespace can be dropped without changing the meaning.
+_JS_TIGHT = set("{}()[];,:=")
+_CSS_TIGHT_BEFORE = set("{};,>)")
+_CSS_TIGHT_AFTER = set("{};,>(:")
+
+
+def minify_output(
+    metadata: metadata_reader.BlogMetadata, manifest: dict[str, str]
+) -> None:
+    """
+    Minifies HTML, CSS & JS files in the output folder.
+
+    Results are cached by the content hash of a file, so a file which has not
+    changed since the previous build is not minified again. Fingerprinted files
+    are skipped: they are minified before fingerprinting, so that their names
+    match their content.
+    """
+
+    logging.info("Minifying output files")
+
+    output_path = metadata.paths["output"]
+    cache_path = get_cache_path(metadata)
+    skipped_paths = set(manifest.values())
+
+    statistics = {file_type: [0, 0, 0, 0] for file_type in ("html", "css", "js")}
+
+    for file_path, file_type in _get_minifiable_files(output_path, skipped_paths):
+        result = _minify_file(file_path, file_type, cache_path)
+
+        if result is not None:
+            for index, value in enumerate(result):
+                statistics[file_type][index] += value
+
+    _evict_cache_entries(cache_path, MINIFIER_CACHE_SIZE)
+
+    for file_type, (count, size, minified_size, cached) in statistics.items():
+        metrics.add_cache_lookups("minifier", cached, count - cached)
+
+        logging.info(
+            "Minified %s: %d files (%d from cache), %d bytes saved (%d -> %d)",
+            file_type,
+            count,
+            cached,
+            size - minified_size,
+            size,
+            minified_size,
+        )
+
+
+def minify_html(content: str) -> str:
+    """
+    Collapses whitespace & removes comments in HTML.
+
+    Content of pre, code & textarea tags is left untouched;
+    inline scripts & styles are minified as JS & CSS.
+    """
+
+    parts = _PROTECTED_HTML_PATTERN.split(content)
+    result = []
+
+    # split() returns text, then a protected block & its tag name, and so on.
+
+    for index in range(0, len(parts), 3):
+        text = _HTML_COMMENT_PATTERN.sub("", parts[index])
+        result.append(_HTML_SPACE_PATTERN.sub(" ", text))
+
+        if index + 2 < len(parts):
+            result.append(_minify_protected_html(parts[index + 1], parts[index + 2]))
+
+    return "".join(result).strip()
+
+
+def minify_css(content: str) -> str:
+    """
+    Removes comments & needless whitespace in CSS.
+    """
+
+    result: list[str] = []
+    index = 0
+    length = len(content)
+
+    while index < length:
+        char = content[index]
+
+        if char in "\"'":
+            end = _get_string_end(content, index)
+            result.append(content[index:end])
+            index = end
+
+        elif content.startswith("/*", index):
+            end = content.find("*/", index + 2)
+            index = length if end == -1 else end + 2
+
+            _append_css_space(result, content, index)
+
+        elif char.isspace():
+            while index < length and content[index].isspace():
+                index += 1
+
+            _append_css_space(result, content, index)
+
+        else:
+            if char == "}" and result and result[-1] == ";":
+                result.pop()
+
+            if result and result[-1] == " " and char in _CSS_TIGHT_BEFORE:
+                result.pop()
+
+            result.append(char)
+            index += 1
+
+    return "".join(result).strip()
+
+
+def minify_js(content: str) -> str:
+    """
+    Removes comments, indentation & blank lines in JS.
+
+    Line breaks are kept, so automatic semicolon insertion works as before.
+    """
+
+    result: list[str] = []
+    index = 0
+    length = len(content)
+
+    while index < length:
+        char = content[index]
+        previous = _get_last_significant_char(result)
+
+        if char in "\"'`":
+            end = _get_string_end(content, index)
+            result.append(content[index:end])
+            index = end
+
+        elif content.startswith("//", index):
+            end = content.find("\n", index)
+            index = length if end == -1 else end
+
+        elif content.startswith("/*", index):
+            start = index
+            end = content.find("*/", index + 2)
+            index = length if end == -1 else end + 2
+
+            # A comment separates tokens just like whitespace does.
+
+            _append_js_space(result, "\n" in content[start:index], content, index)
+
+        elif char == "/" and _is_js_regex_start(result, previous):
+            end = _get_regex_end(content, index)
+            result.append(content[index:end])
+            index = end
+
+        elif char.isspace():
+            start = index
+
+            while index < length and content[index].isspace():
+                index += 1
+
+            _append_js_space(result, "\n" in content[start:index], content, index)
+
+        else:
+            result.append(char)
+            index += 1
+
+    return "".join(result).strip()
+
+
+def _get_minifiable_files(
+    output_path: str, skipped_paths: set[str]
+) -> Iterator[tuple[str, str]]:
+    """
+    Yields paths & types of output files which can be minified.
+    """
+
+    for path in utils.get_files(output_path):
+        if path.split("/", 1)[0] in constants.PROTECTED_FILES or path in skipped_paths:
+            continue
+
+        file_type = MINIFIED_FILE_TYPES.get(os.path.splitext(path)[1])
+
+        if file_type is not None:
+            yield os.path.join(output_path, *path.split("/")), file_type
+
+
+def minify_data(
+    data: bytes, file_type: str, cache_path: str
+) -> tuple[bytes, bool] | None:
+    """
+    Returns minified content of a file (its content as is, if minification
+    doesn't make it smaller) & whether it was read from the cache.
+
+    Returns None if the file can't be minified.
+    """
+
+    key = hashlib.sha256(f"{MINIFIER_VERSION}:{file_type}:".encode() + data)
+    cache_file_path = os.path.join(cache_path, key.hexdigest())
+
+    if os.path.isfile(cache_file_path):
+        with open(cache_file_path, "rb") as file:
+            minified_data = file.read()
+
+        # The modification time of an entry is the time it was used last.
+
+        os.utime(cache_file_path)
+
+        return minified_data, True
+
+    try:
+        content = data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return None
+
+    minified_data = _MINIFIERS[file_type](content).encode("utf-8")
+
+    if data.startswith(codecs.BOM_UTF8):
+        minified_data = codecs.BOM_UTF8 + minified_data
+
+    if len(minified_data) >= len(data):
+        minified_data = data
+
+    utils.make_folder(cache_path)
+    utils.replace_file(cache_file_path, minified_data)
+
+    return minified_data, False
+
+
+def get_cache_path(metadata: metadata_reader.BlogMetadata) -> str:
+    """
+    Returns the path of the cache folder of minified files.
+    """
+
+    return os.path.join(metadata.paths["cache"], "minifier")
+
+
+def _minify_file(
+    file_path: str, file_type: str, cache_path: str
+) -> tuple[int, int, int, int] | None:
+    """
+    Minifies a file in place.
+
+    Returns file count, original size, minified size & cache hit count.
+    """
+
+    data = utils.read_file(file_path)
+    result = minify_data(data, file_type, cache_path)
+
+    if result is None:
+        logging.debug('Unable to minify "%s": not an UTF-8 file', file_path)
+        return None
+
+    minified_data, cached = result
+
+    if minified_data != data:
+        utils.replace_file(file_path, minified_data)
+
+    return 1, len(data), len(minified_data), int(cached)
+
+
+def _evict_cache_entries(cache_path: str, cache_size: int) -> None:
+    """
+    Removes least recently used cache entries which don't fit in the cache size.
+    """
+
+    if not os.path.isdir(cache_path):
+        return
+
+    entries = []
+
+    for entry in os.scandir(cache_path):
+        if entry.is_file():
+            stat = entry.stat()
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+    entries.sort(reverse=True)
+    total_size = 0
+
+    for _, size, file_path in entries:
+        total_size += size
+
+        if total_size > cache_size:
+            logging.debug('Removing a minifier cache entry "%s"', file_path)
+            os.remove(file_path)
+
+
+def _minify_protected_html(block: str, tag_name: str) -> str:
+    """
+    Minifies inline scripts & styles; returns other protected blocks as is.
+    """
+
+    tag_name = tag_name.lower()
+
+    if tag_name not in ("script", "style"):
+        return block
+
+    opening_tag = _OPENING_TAG_PATTERN.match(block)
+    assert opening_tag is not None
+
+    attributes = opening_tag.group(2)
+    body_start = opening_tag.end()
+    body_end = block.lower().rindex("</")
+
+    if tag_name == "style":
+        minified = minify_css(block[body_start:body_end])
+    else:
+        script_type = _SCRIPT_TYPE_PATTERN.search(attributes)
+
+        if script_type is not None and script_type.group(1).lower() not in _JS_TYPES:
+            return block
+
+        minified = minify_js(block[body_start:body_end])
+
+    return f"{block[:body_start]}{minified}{block[body_end:]}"
+
+
+def _append_css_space(result: list[str], content: str, index: int) -> None:
+    """
+    Appends a single space instead of a whitespace run or a comment, if it is needed.
+    """
+
+    previous = result[-1][-1] if result else ""
+    following = content[index] if index < len(content) else ""
+
+    if previous in ("", " ") or previous in _CSS_TIGHT_AFTER:
+        return
+
+    if following not in _CSS_TIGHT_BEFORE:
+        result.append(" ")
+
+
+def _append_js_space(
+    result: list[str], is_line_break: bool, content: str, index: int
+) -> None:
+    """
+    Appends a single space or line break instead of a whitespace run, if it is needed.
+    """
+
+    previous = result[-1][-1] if result else ""
+    following = content[index] if index < len(content) else ""
+
+    if previous in ("", " ", "\n"):
+        if previous == " " and is_line_break:
+            result[-1] = result[-1][:-1] + "\n"
+        return
+
+    if is_line_break:
+        if previous not in "{;," and following != "}":
+            result.append("\n")
+
+    elif previous not in _JS_TIGHT and following not in _JS_TIGHT:
+        result.append(" ")
+
+
+def _is_js_regex_start(result: list[str], previous: str) -> bool:
+    """
+    Checks if a slash starts a regular expression literal (not a division),
+    by the character or the keyword before it.
+    """
+
+    if previous == "" or previous in _JS_REGEX_PRECEDING:
+        return True
+
+    if not (previous.isalnum() or previous in "_$"):
+        return False
+
+    last_word = _JS_LAST_WORD_PATTERN.search("".join(result[-16:]).rstrip())
+
+    return last_word is not None and last_word.group() in _JS_REGEX_KEYWORDS
+
+
+def _get_last_significant_char(result: list[str]) -> str:
+    """
+    Returns the last non-whitespace character appended to the result.
+    """
+
+    for item in reversed(result):
+        stripped = item.rstrip()
+
+        if stripped:
+            return stripped[-1]
+
+    return ""
+
+
+def _get_string_end(content: str, start: int) -> int:
+    """
+    Returns the index after a string (or a JS template literal) which begins at start.
+    """
+
+    quote = content[start]
+    index = start + 1
+    length = len(content)
+
+    while index < length:
+        char = content[index]
+
+        if char == "\\":
+            index += 2
+        elif char == quote:
+            return index + 1
+        elif quote == "`" and content.startswith("${", index):
+            index = _get_placeholder_end(content, index + 2)
+        else:
+            index += 1
+
+    return length
+
+
+def _get_placeholder_end(content: str, start: int) -> int:
+    """
+    Returns the index after a JS template literal placeholder.
+    """
+
+    depth = 1
+    index = start
+    length = len(content)
+
+    while index < length and depth:
+        char = content[index]
+
+        if char in "\"'`":
+            index = _get_string_end(content, index)
+            continue
+
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+
+        index += 1
+
+    return index
+
+
+def _get_regex_end(content: str, start: int) -> int:
+    """
+    Returns the index after a JS regular expression literal (without flags).
+    """
+
+    index = start + 1
+    length = len(content)
+    in_class = False
+
+    while index < length:
+        char = content[index]
+
+        if char == "\\":
+            index += 2
+            continue
+
+        if char == "\n":
+            break
+
+        if char == "[":
+            in_class = True
+        elif char == "]":
+            in_class = False
+        elif char == "/" and not in_class:
+            return index + 1
+
+        index += 1
+
+    return index
+
+
+_MINIFIERS = {"html": minify_html, "css": minify_css, "js": minify_js}
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+
+"""
+Implementation of output backends: storages which built files are written to.
+
+Writers write files by paths in the output folder; if a backend is opened for
+the folder, utils route these paths to it instead of the file system.
+"""
+
+import atexit
+import io
+import os
+import shutil
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import ClassVar
+
+# Archive modules are imported when an archive is written: the CLI reads
+# OUTPUT_BACKENDS at start-up.
+
+# pylint: disable=import-outside-toplevel
+
+OUTPUT_BACKENDS = ("filesystem", "memory", "archive")
+
+ARCHIVE_FORMATS = {
+    ".zip": "zip",
+    ".tar": "w",
+    ".tar.gz": "w:gz",
+    ".tgz": "w:gz",
+    ".tar.xz": "w:xz",
+}
+
+
+@dataclass
+class MemoryBackend:
+    """
+    Keeps built files in memory: contents of rendered files & paths of copied ones
+    (copied files are never read until they are requested).
+    """
+
+    name: ClassVar[str] = "memory"
+
+    root: str
+    files: dict[str, bytes | str] = field(default_factory=dict)
+
+    def write(self, path: str, data: bytes | Iterable[bytes]) -> None:
+        """
+        Writes a file from its content or from chunks of it.
+        """
+
+        self.files[path] = data if isinstance(data, bytes) else b"".join(data)
+
+    def copy(self, path: str, source_path: str) -> None:
+        """
+        Adds a file or a folder (recursively) from the file system.
+        """
+
+        if not os.path.isdir(source_path):
+            self.files[path] = source_path
+            return
+
+        for directory, _, files in os.walk(source_path):
+            relative_path = os.path.relpath(directory, source_path)
+            prefix = "" if relative_path == "." else relative_path.replace(os.sep, "/")
+
+            for file_name in files:
+                file_path = "/".join(filter(None, (path, prefix, file_name)))
+                self.files[file_path] = os.path.join(directory, file_name)
+
+    def remove(self, path: str) -> None:
+        """
+        Removes a file (if there is one).
+        """
+
+        self.files.pop(path, None)
+
+    def read(self, path: str) -> bytes:
+        """
+        Returns content of a file.
+        """
+
+        data = self.files[path]
+
+        if isinstance(data, bytes):
+            return data
+
+        with open(data, "rb") as file:
+            return file.read()
+
+    def clear(self) -> None:
+        """
+        Removes all files.
+        """
+
+        self.files.clear()
+
+    def close(self) -> None:
+        """
+        Finishes a build.
+        """
+
+
+@dataclass
+class ArchiveBackend(MemoryBackend):
+    """
+    Writes built files to a spool folder as they come (so no file is kept
+    in memory), then streams them into a zip or tar archive (the root is a path
+    to the archive) in a single sequential write.
+
+    Files are spooled rather than added to the archive right away, since later
+    stages (minification, critical CSS, cache headers) read & rewrite them,
+    and entries of an archive can't be replaced.
+    """
+
+    name: ClassVar[str] = "archive"
+
+    spool_path: str = ""
+
+    def write(self, path: str, data: bytes | Iterable[bytes]) -> None:
+        file_path = os.path.join(self._get_spool_path(), *path.split("/"))
+        temporary_path = f"{file_path}.{os.getpid()}.tmp"
+
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        try:
+            with open(temporary_path, "wb") as file:
+                if isinstance(data, bytes):
+                    file.write(data)
+                else:
+                    for chunk in data:
+                        file.write(chunk)
+
+            os.replace(temporary_path, file_path)
+
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+
+        self.files[path] = file_path
+
+    def remove(self, path: str) -> None:
+        file_path = self.files.pop(path, None)
+
+        if isinstance(file_path, str) and self._is_spooled(file_path):
+            os.remove(file_path)
+
+    def clear(self) -> None:
+        self.files.clear()
+
+        if self.spool_path:
+            shutil.rmtree(self.spool_path, ignore_errors=True)
+            self.spool_path = ""
+
+    def close(self) -> None:
+        archive_format = get_archive_format(self.root)
+
+        if archive_format is None:
+            raise ValueError(f"Unknown archive format: {self.root}")
+
+        temporary_path = f"{self.root}.{os.getpid()}.tmp"
+        os.makedirs(os.path.dirname(self.root), exist_ok=True)
+
+        if archive_format == "zip":
+            self._write_zip(temporary_path)
+        else:
+            self._write_tar(temporary_path, archive_format)
+
+        os.replace(temporary_path, self.root)
+
+    def _get_spool_path(self) -> str:
+        """
+        Returns the spool folder, making it on the first write.
+        """
+
+        if not self.spool_path:
+            import tempfile
+
+            self.spool_path = tempfile.mkdtemp(prefix="bloget-archive-")
+            atexit.register(shutil.rmtree, self.spool_path, ignore_errors=True)
+
+        return self.spool_path
+
+    def _is_spooled(self, file_path: str) -> bool:
+        return bool(self.spool_path) and file_path.startswith(self.spool_path + os.sep)
+
+    def _write_zip(self, file_path: str) -> None:
+        import zipfile
+
+        with zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED) as archive:
+            for path, data in sorted(self.files.items()):
+                if isinstance(data, bytes):
+                    archive.writestr(path, data)
+                else:
+                    archive.write(data, path)
+
+    def _write_tar(self, file_path: str, mode: str) -> None:
+        import tarfile
+
+        with tarfile.open(file_path, mode) as archive:
+            for path, data in sorted(self.files.items()):
+                if isinstance(data, bytes):
+                    info = tarfile.TarInfo(path)
+                    info.size = len(data)
+                    info.mtime = int(time.time())
+
+                    archive.addfile(info, io.BytesIO(data))
+                else:
+                    archive.add(data, path, recursive=False)
+
+
+_backends: dict[str, MemoryBackend] = {}
+
+
+def open_backend(name: str, root: str) -> None:
+    """
+    Opens a backend for an output folder (the file system needs no backend).
+
+    A backend is kept open between builds of a process, so partial builds
+    update files of previous ones.
+    """
+
+    root = os.path.abspath(root)
+
+    if name == "filesystem":
+        _backends.pop(root, None)
+        return
+
+    backend = _backends.get(root)
+
+    if backend is None or backend.name != name:
+        backend_class = ArchiveBackend if name == "archive" else MemoryBackend
+        _backends[root] = backend_class(root)
+
+
+def close_backend(root: str) -> None:
+    """
+    Finishes a build in a backend of an output folder (if there is one).
+    """
+
+    backend = _backends.get(os.path.abspath(root))
+
+    if backend is not None:
+        backend.close()
+
+
+def get_backend(path: str) -> tuple[MemoryBackend, str] | None:
+    """
+    Returns a backend which a path belongs to, along with a relative path
+    (with slashes) of the file in the backend.
+    """
+
+    if not _backends:
+        return None
+
+    path = os.path.abspath(path)
+
+    for root, backend in _backends.items():
+        if path == root:
+            return backend, ""
+
+        if path.startswith(root + os.sep):
+            return backend, path[len(root) + 1 :].replace(os.sep, "/")
+
+    return None
+
+
+def get_archive_format(file_path: str) -> str | None:
+    """
+    Returns a zip or tar mode of an archive by its file name.
+    """
+
+    for extension, archive_format in ARCHIVE_FORMATS.items():
+        if file_path.lower().endswith(extension):
+            return archive_format
+
+    return None
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+
+"""
+Implementation of a dry-run build plan: what a build would change in the output folder.
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from bloget import constants, utils
+from bloget.readers import metadata_reader, page_reader, pages_reader
+
+BUILD_STATE_VERSION = 1
+
+# Arguments which change every output file of a build.
+
+BUILD_STATE_ARGUMENTS = (
+    "include_drafts",
+    "minify",
+    "fingerprint_assets",
+    "critical_css",
+)
+
+
+@dataclass
+class BuildPlan:
+    """
+    Container for changes which a build would make (paths relative to the output folder).
+    """
+
+    full: bool = False
+    rendered: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    outputs: list[str] = field(default_factory=list)
+    copied: list[str] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)
+    unchanged: int = 0
+
+
+def print_plan(arguments: argparse.Namespace) -> None:
+    """
+    Prints a plan of a build (as text or JSON) without rendering or writing anything.
+    """
+
+    logging.info("Build planning")
+
+    metadata = metadata_reader.get_metadata(arguments)
+    plan = get_plan(arguments, metadata)
+
+    if arguments.plan == "json":
+        print(json.dumps(asdict(plan), ensure_ascii=False, indent=2))
+    else:
+        print(_get_plan_text(plan))
+
+
+def get_plan(
+    arguments: argparse.Namespace, metadata: metadata_reader.BlogMetadata
+) -> BuildPlan:
+    """
+    Compares the state of the previous published build with the current one.
+
+    A build which doesn't publish clears the output folder & writes everything,
+    so a full build is planned for it; so it is if there is no previous state,
+    or templates, metadata or build arguments have changed since then.
+    """
+
+    previous = _read_state(metadata) if arguments.publish else {}
+    current = get_state(arguments, metadata, previous)
+
+    full = (
+        not arguments.publish
+        or previous.get("version") != BUILD_STATE_VERSION
+        or previous.get("inputs") != current["inputs"]
+    )
+
+    if full:
+        previous = {"pages": {}, "public": {}}
+
+    old_pages = _get_rendered_pages(previous, arguments)
+    new_pages = _get_rendered_pages(current, arguments)
+
+    result = BuildPlan(full=full)
+    page_types = set()
+
+    changed = {
+        path
+        for path, page in new_pages.items()
+        if path not in old_pages or old_pages[path]["signature"] != page["signature"]
+    }
+
+    changed |= _get_notes_with_changed_neighbours(old_pages, new_pages, changed)
+
+    for path, page in sorted(new_pages.items()):
+        old_page = old_pages.get(path)
+
+        if path in changed:
+            result.rendered.append(path)
+            page_types.add(page["type"])
+        else:
+            result.unchanged += 1
+
+        _add_file_changes(
+            result, path, _get_attachments(old_page), _get_attachments(page)
+        )
+
+    for path, old_page in sorted(old_pages.items()):
+        if path not in new_pages:
+            result.removed.append(path)
+            page_types.add(old_page["type"])
+
+            _add_file_changes(result, path, _get_attachments(old_page), {})
+
+    _add_file_changes(result, "", previous["public"], current["public"])
+
+    result.outputs = _get_outputs(page_types, new_pages, full)
+
+    return result
+
+
+def write_state(
+    arguments: argparse.Namespace,
+    metadata: metadata_reader.BlogMetadata,
+    changed: set[str] | None = None,
+) -> None:
+    """
+    Writes the state of a published build to the cache folder,
+    so the next one can be planned.
+    """
+
+    previous = _read_state(metadata)
+    current = get_state(arguments, metadata, previous, changed)
+
+    file_path = _get_state_file_path(metadata)
+    utils.make_folder(os.path.dirname(file_path))
+
+    utils.make_file(file_path, json.dumps(current))
+
+
+def get_state(
+    arguments: argparse.Namespace,
+    metadata: metadata_reader.BlogMetadata,
+    previous: dict[str, Any],
+    changed: set[str] | None = None,
+) -> dict[str, Any]:
+    """
+    Returns a state of blog's inputs: signatures of page folders & public files,
+    along with a hash of everything else a build depends on.
+
+    Info files are only read for pages which have changed since the previous state.
+    If folder paths of changed pages are given, other pages are taken from
+    the previous state as they are.
+    """
+
+    previous_pages = previous.get("pages", {})
+    pages = {}
+
+    pages_path = metadata.paths["pages"]
+
+    for folder_path, page_type in pages_reader.get_page_folders(pages_path):
+        path = os.path.relpath(folder_path, pages_path).replace(os.sep, "/")
+        path = "" if path == "." else path
+
+        page = previous_pages.get(path)
+
+        if changed is None or folder_path in changed:
+            signature = [
+                list(item) for item in pages_reader.get_folder_signature(folder_path)
+            ]
+
+            if page is None or page["signature"] != signature:
+                page = _get_page_state(folder_path, page_type, signature)
+
+        if page is not None:
+            pages[path] = page
+
+    if changed is None:
+        public = _get_tree_signature(metadata.paths["public"])
+    else:
+        public = previous.get("public", {})
+
+    return {
+        "version": BUILD_STATE_VERSION,
+        "inputs": _get_inputs_hash(arguments, metadata),
+        "pages": pages,
+        "public": public,
+    }
+
+
+def _get_page_state(
+    folder_path: str, page_type: str, signature: list[list]
+) -> dict[str, Any]:
+    """
+    Returns a state of a page: its type, signature & fields which affect outputs.
+    """
+
+    page_info = page_reader.get_page_info(folder_path)
+
+    created = page_info.get("created")
+
+    if not isinstance(created, datetime.datetime):
+        created = datetime.datetime(1, 1, 1)
+
+    return {
+        "type": page_type,
+        "signature": signature,
+        "draft": "draft" in (page_info.get("options") or []),
+        "created": created.isoformat(),
+    }
+
+
+def _get_rendered_pages(
+    state: dict[str, Any], arguments: argparse.Namespace
+) -> dict[str, dict[str, Any]]:
+    """
+    Returns pages of a state which are rendered (drafts are skipped, if not included).
+    """
+
+    return {
+        path: page
+        for path, page in state["pages"].items()
+        if arguments.include_drafts or not page["draft"]
+    }
+
+
+def _get_notes_with_changed_neighbours(
+    old_pages: dict[str, dict[str, Any]],
+    new_pages: dict[str, dict[str, Any]],
+    changed: set[str],
+) -> set[str]:
+    """
+    Returns notes which previous or next notes are other or have changed
+    (a note links to them).
+    """
+
+    old_neighbours = _get_note_neighbours(old_pages)
+    new_neighbours = _get_note_neighbours(new_pages)
+
+    return {
+        path
+        for path, neighbours in new_neighbours.items()
+        if old_neighbours.get(path) != neighbours or changed.intersection(neighbours)
+    }
+
+
+def _get_note_neighbours(
+    pages: dict[str, dict[str, Any]],
+) -> dict[str, tuple[str | None, str | None]]:
+    """
+    Returns previous & next notes of each note (in the order of note writer).
+    """
+
+    notes = sorted(
+        (path for path, page in pages.items() if page["type"] == "note"),
+        key=lambda path: pages[path]["created"],
+        reverse=True,
+    )
+
+    return {
+        path: (
+            notes[index - 1] if index > 0 else None,
+            notes[index + 1] if index < len(notes) - 1 else None,
+        )
+        for index, path in enumerate(notes)
+    }
+
+
+def _get_attachments(page: dict[str, Any] | None) -> dict[str, list[int]]:
+    """
+    Returns sizes & modification times of page attachments by their names.
+    """
+
+    if page is None:
+        return {}
+
+    predefined_file_names = (
+        constants.PAGE_TEXT_FILE_NAME,
+        constants.PAGE_INFO_FILE_NAME,
+    )
+
+    return {
+        name: [size, mtime]
+        for name, size, mtime in page["signature"]
+        if name not in predefined_file_names
+    }
+
+
+def _add_file_changes(
+    plan: BuildPlan,
+    folder: str,
+    old_files: dict[str, list[int]],
+    new_files: dict[str, list[int]],
+) -> None:
+    """
+    Adds new & modified files to the copied ones, and missing files to the deleted ones.
+    """
+
+    prefix = f"{folder}/" if folder else ""
+
+    for name, signature in sorted(new_files.items()):
+        if old_files.get(name) != signature:
+            plan.copied.append(f"{prefix}{name}")
+
+    for name in sorted(set(old_files) - set(new_files)):
+        plan.deleted.append(f"{prefix}{name}")
+
+
+def _get_outputs(
+    page_types: set[str], pages: dict[str, dict[str, Any]], full: bool
+) -> list[str]:
+    """
+    Returns lists, feeds & other files made of all pages which would be written.
+    """
+
+    result = []
+
+    if "note" in page_types:
+        note_count = sum(1 for page in pages.values() if page["type"] == "note")
+        list_count = max(1, -(-note_count // constants.NOTES_LIST_SIZE))
+
+        result.append(f"{constants.NOTES_FOLDER_NAME}/index.html")
+
+        for list_number in range(2, list_count + 1):
+            result.append(
+                f"{constants.NOTES_FOLDER_NAME}/page-{list_number}/index.html"
+            )
+
+        result += ["notes.json", "rss.xml"]
+
+    if "project" in page_types:
+        result.append(f"{constants.PROJECTS_FOLDER_NAME}/index.html")
+
+    if page_types:
+        result.append("sitemap.xml")
+
+    if full:
+        result += ["404.html", "robots.txt"]
+
+    return result
+
+
+def _get_inputs_hash(
+    arguments: argparse.Namespace, metadata: metadata_reader.BlogMetadata
+) -> str:
+    """
+    Returns a hash of inputs which all pages depend on: settings, metadata files,
+    templates & build arguments.
+    """
+
+    inputs = {
+        "bloget": constants.VERSION,
+        "settings": metadata.settings,
+        "arguments": {
+            name: getattr(arguments, name, None) for name in BUILD_STATE_ARGUMENTS
+        },
+        "metadata": _get_tree_signature(metadata.paths["metadata"]),
+        "templates": _get_tree_signature(metadata.paths["templates"]),
+    }
+
+    inputs_data = json.dumps(inputs, sort_keys=True, default=str).encode()
+
+    return hashlib.sha256(inputs_data).hexdigest()
+
+
+def _get_tree_signature(folder_path: str | None) -> dict[str, list[int]]:
+    """
+    Returns sizes & modification times of files in a folder by their relative paths.
+    """
+
+    result: dict[str, list[int]] = {}
+
+    if not folder_path or not os.path.isdir(folder_path):
+        return result
+
+    for directory, _, files in os.walk(folder_path):
+        for file_name in files:
+            file_path = os.path.join(directory, file_name)
+            path = os.path.relpath(file_path, folder_path).replace(os.sep, "/")
+
+            stat = os.stat(file_path)
+            result[path] = [stat.st_size, stat.st_mtime_ns]
+
+    return result
+
+
+def _read_state(metadata: metadata_reader.BlogMetadata) -> dict[str, Any]:
+    """
+    Returns the state of the previous build (or an empty one).
+    """
+
+    return utils.read_json_file(_get_state_file_path(metadata))
+
+
+def _get_state_file_path(metadata: metadata_reader.BlogMetadata) -> str:
+    """
+    Returns a path to the state file of the output folder (several outputs
+    can share a cache folder).
+    """
+
+    output_path = metadata.paths["publish"] or metadata.paths["output"]
+    folder_path = os.path.join(metadata.paths["cache"], "build-state")
+
+    return os.path.join(folder_path, f"{utils.get_path_key(output_path)}.json")
+
+
+def _get_plan_text(plan: BuildPlan) -> str:
+    """
+    Returns a plan as a human-readable text.
+    """
+
+    lines = [f"Build plan: {'full' if plan.full else 'incremental'} build"]
+
+    for title, paths in (
+        ("Pages to render", plan.rendered),
+        ("Pages to remove", plan.removed),
+        ("Lists, feeds & other outputs to write", plan.outputs),
+        ("Attachments & public files to copy", plan.copied),
+        ("Attachments & public files to delete", plan.deleted),
+    ):
+        lines.append(f"{title}: {len(paths)}")
+        lines += [f"  {path or '/'}" for path in paths]
+
+    lines.append(f"Unchanged pages: {plan.unchanged}")
+
+    return "\n".join(lines)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+
+"""
+Implementation of publishing a built blog into a (git-backed) output folder.
+"""
+
+import logging
+import os
+import subprocess
+from dataclasses import dataclass, field
+
+from bloget import constants, metrics, utils
+from bloget.readers import metadata_reader
+
+
+@dataclass
+class PublishPlan:
+    """
+    Container for changes to apply to the output folder (relative file paths).
+    """
+
+    added: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def paths(self) -> list[str]:
+        """
+        All paths which are touched by the plan.
+        """
+
+        return self.added + self.changed + self.removed
+
+
+def publish(metadata: metadata_reader.BlogMetadata) -> None:
+    """
+    Applies the difference between a built blog and the publish folder to the latter.
+
+    Only added, changed & removed files are touched; then they are staged
+    in a single git call, if the publish folder is a git working tree.
+    """
+
+    logging.info("Publishing")
+
+    source_path = metadata.paths["output"]
+    target_path = metadata.paths["publish"]
+
+    plan = get_plan(source_path, target_path)
+
+    for path in plan.added + plan.changed:
+        source_file_path = os.path.join(source_path, *path.split("/"))
+        target_file_path = os.path.join(target_path, *path.split("/"))
+
+        utils.make_folder(os.path.dirname(target_file_path))
+        utils.copy_file(source_file_path, target_file_path)
+
+    for path in plan.removed:
+        _remove_file(target_path, path)
+
+    logging.info(
+        "Published: %d added, %d changed, %d removed, %d unchanged",
+        len(plan.added),
+        len(plan.changed),
+        len(plan.removed),
+        plan.unchanged,
+    )
+
+    if plan.paths and os.path.exists(os.path.join(target_path, ".git")):
+        _stage_changes(target_path, plan.paths)
+
+
+def get_plan(source_path: str, target_path: str) -> PublishPlan:
+    """
+    Compares two folders by file content hashes.
+    """
+
+    source_files = _get_files(source_path)
+    target_files = _get_files(target_path)
+
+    result = PublishPlan()
+
+    for path, source_file_path in sorted(source_files.items()):
+        target_file_path = target_files.get(path)
+
+        if target_file_path is None:
+            result.added.append(path)
+        elif _files_differ(source_file_path, target_file_path):
+            result.changed.append(path)
+        else:
+            result.unchanged += 1
+            metrics.add_bytes("skipped", os.path.getsize(source_file_path))
+
+    result.removed = sorted(set(target_files) - set(source_files))
+
+    return result
+
+
+def _get_files(folder_path: str) -> dict[str, str]:
+    """
+    Returns paths of files in a folder by their relative paths (with slashes).
+
+    Protected files & folders in the root of the folder are skipped.
+    """
+
+    result = {}
+
+    if not os.path.isdir(folder_path):
+        return result
+
+    for directory, folders, files in os.walk(folder_path):
+        relative_path = os.path.relpath(directory, folder_path).replace(os.sep, "/")
+        prefix = "" if relative_path == "." else f"{relative_path}/"
+
+        if not prefix:
+            folders[:] = [f for f in folders if f not in constants.PROTECTED_FILES]
+            files = [f for f in files if f not in constants.PROTECTED_FILES]
+
+        for file_name in files:
+            result[f"{prefix}{file_name}"] = os.path.join(directory, file_name)
+
+    return result
+
+
+def _files_differ(source_file_path: str, target_file_path: str) -> bool:
+    """
+    Checks whether files differ by size or, if sizes are equal, by content hash.
+    """
+
+    if os.path.getsize(source_file_path) != os.path.getsize(target_file_path):
+        return True
+
+    return utils.get_file_hash(source_file_path) != utils.get_file_hash(
+        target_file_path
+    )
+
+
+def _remove_file(folder_path: str, path: str) -> None:
+    """
+    Removes a file, then removes folders which became empty.
+    """
+
+    file_path = os.path.join(folder_path, *path.split("/"))
+
+    try:
+        os.unlink(file_path)
+
+        directory = os.path.dirname(file_path)
+
+        while directory != folder_path and not os.listdir(directory):
+            os.rmdir(directory)
+            directory = os.path.dirname(directory)
+
+    except IOError:
+        utils.raise_error(f"Unable to remove a file: {file_path}")
+
+
+def _stage_changes(folder_path: str, paths: list[str]) -> None:
+    """
+    Stages changed paths with a single git call.
+    """
+
+    logging.info("Staging %d changed paths", len(paths))
+
+    try:
+        subprocess.run(
+            [
+                "git",
+                "--literal-pathspecs",
+                "add",
+                "--all",
+                "--pathspec-from-file=-",
+                "--pathspec-file-nul",
+            ],
+            cwd=folder_path,
+            input="\0".join(paths),
+            text=True,
+            check=True,
+        )
+
+    except (IOError, subprocess.CalledProcessError):
+        utils.raise_error(f"Unable to stage changes in: {folder_path}")
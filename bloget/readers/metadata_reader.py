@@ -7,13 +7,12 @@ Implementation of a class to read blog's metadata.
 
 import argparse
 import os
-from collections import Counter
 from dataclasses import dataclass
 from typing import Optional
 
 import jinja2
 
-from bloget import utils
+from bloget import images, utils
 
 
 @dataclass
@@ -29,15 +28,10 @@ class BlogMetadata:
     tags: dict[str, str]
     templates: jinja2.Environment
 
-    def sort_stacks_by_usage(self, projects: list) -> None:
+    def sort_stacks_by_usage(self, usage: dict[str, int]) -> None:
         """
-        Sorts self.stacks in descending order by how often a stack appears in projects' metadata.
+        Sorts self.stacks in descending order by how many projects use a stack.
         """
-        usage = Counter()
-
-        for project in projects:
-            project_stacks = project.metadata.stacks or []
-            usage.update(set(project_stacks))
 
         original_index = {
             k: i for i, k in enumerate(self.stacks.keys())
@@ -50,15 +44,10 @@ class BlogMetadata:
 
         self.stacks = dict(sorted_items)
 
-    def sort_tags_by_usage(self, notes: list) -> None:
+    def sort_tags_by_usage(self, usage: dict[str, int]) -> None:
         """
-        Sorts self.tags in descending order by how often a tag appears in notes' metadata.
+        Sorts self.tags in descending order by how many notes have a tag.
         """
-        usage = Counter()
-
-        for note in notes:
-            note_tags = note.metadata.tags or []
-            usage.update(set(note_tags))
 
         original_index = {
             k: i for i, k in enumerate(self.tags.keys())
@@ -97,7 +86,26 @@ def _get_templates(paths: dict[str, str]) -> jinja2.Environment:
     templates_path = paths.get("templates")
     assert isinstance(templates_path, str)
 
-    return jinja2.Environment(loader=jinja2.FileSystemLoader(searchpath=templates_path))
+    # Compiled templates are kept in the cache folder, so they are shared
+    # between builds (and between sites built at once).
+
+    cache_path = paths.get("cache")
+    bytecode_cache = None
+
+    if cache_path:
+        bytecode_cache_path = os.path.join(cache_path, "templates")
+        utils.make_folder(bytecode_cache_path)
+
+        bytecode_cache = jinja2.FileSystemBytecodeCache(bytecode_cache_path)
+
+    templates = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(searchpath=templates_path),
+        bytecode_cache=bytecode_cache,
+    )
+
+    templates.filters["lazy_images"] = images.lazy_images
+
+    return templates
 
 
 def _get_paths(arguments: argparse.Namespace) -> dict[str, Optional[str]]:
@@ -105,12 +113,26 @@ def _get_paths(arguments: argparse.Namespace) -> dict[str, Optional[str]]:
     Returns paths to various directories required to generate.
     """
 
+    output = getattr(arguments, "output", "")
+    cache = getattr(arguments, "cache", "")
+
+    # When publishing, a blog is built into a staging folder first,
+    # then only changes are applied to the output folder. Each output folder
+    # has a staging folder of its own, since several sites can share a cache.
+
+    publish = output if getattr(arguments, "publish", False) else ""
+
+    if publish:
+        output = os.path.join(cache, "staging", utils.get_path_key(publish))
+
     return {
         "metadata": getattr(arguments, "metadata", ""),
         "pages": getattr(arguments, "pages", ""),
         "public": getattr(arguments, "public", ""),
         "templates": getattr(arguments, "templates", ""),
-        "output": getattr(arguments, "output", ""),
+        "output": output,
+        "cache": cache,
+        "publish": publish,
     }
 
 
@@ -131,6 +153,17 @@ def _get_settings(
     if url is not None:
         settings["url"] = url
 
+    if getattr(arguments, "responsive_images", False):
+        settings["responsive_images"] = True
+
+    markdown_engine = getattr(arguments, "markdown_engine", None)
+
+    if markdown_engine is not None:
+        settings["markdown_engine"] = markdown_engine
+
+    if getattr(arguments, "deduplicate_attachments", False):
+        settings["deduplicate_attachments"] = True
+
     return settings
 
 
@@ -5,18 +5,30 @@ Implementation of the blog's page reader.
 """
 
 import datetime
+import functools
 import os
-from dataclasses import dataclass
+import re
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import yaml
 
 from bloget import constants, utils
 from bloget.readers import metadata_reader
 from bloget.readers.utils import content_parsing_utils
 
+# YAML between "---" lines at the very top of a Markdown file.
+
+_FRONT_MATTER_PATTERN = re.compile(
+    r"\A---[ \t]*\r?\n(.*?)^---[ \t]*(?:\r?\n|\Z)", re.DOTALL | re.MULTILINE
+)
+
 
 @dataclass
 class BlogPageMetadata:
     """
-    Container for a page's metadata (data from a index.yaml file).
+    Container for a page's metadata (data from a index.yaml file
+    or front matter of a index.md file).
     """
 
     title: str
@@ -36,11 +48,27 @@ class BlogPage:
     folder_path: str
     folder_name: str
     path: str
-    text: str
 
     metadata: BlogPageMetadata
     attachments: list[str]
 
+    # Reads & renders page's text; it is called on the first access to the text,
+    # so pages which are not written (drafts, for instance) are never rendered.
+
+    text_loader: Callable[[], str] = field(repr=False, compare=False)
+    _text: str | None = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def text(self) -> str:
+        """
+        Page's text rendered to HTML.
+        """
+
+        if self._text is None:
+            self._text = self.text_loader()
+
+        return self._text
+
     @property
     def title(self) -> str:
         """
@@ -88,24 +116,31 @@ class BlogPage:
 def get_page(page_folder_path: str, metadata: metadata_reader.BlogMetadata) -> BlogPage:
     """
     Returns object of a blog's page.
+
+    Only page's information is read here; the text is read & rendered
+    when it is needed.
     """
 
     page_folder_name = _get_page_folder_name(page_folder_path, metadata)
 
     page_path = _get_page_path(page_folder_path, metadata)
-    page_text = _get_page_text(page_folder_path, page_path, metadata)
 
-    page_metadata = _get_page_metadata(page_folder_path)
+    page_info, page_source = _read_page(page_folder_path)
+    page_metadata = _get_page_metadata(page_info)
 
     page_attachments = _get_page_attachments(page_folder_path)
 
+    page_text_loader = functools.partial(
+        _get_page_text, page_folder_path, page_path, page_source, metadata
+    )
+
     return BlogPage(
         page_folder_path,
         page_folder_name,
         page_path,
-        page_text,
         page_metadata,
         page_attachments,
+        page_text_loader,
     )
 
 
@@ -170,13 +205,114 @@ def _get_page_attachments(folder_path: str) -> list[str]:
     return result
 
 
-def _get_page_metadata(folder_path: str) -> BlogPageMetadata:
+def get_page_source(folder_path: str) -> tuple[dict, str]:
+    """
+    Reads page's information & Markdown text.
+    """
+
+    page_info, page_source = _read_page(folder_path)
+
+    if page_source is None:
+        page_source = _read_page_text_file(folder_path)
+
+    return page_info, page_source
+
+
+def get_page_info(folder_path: str) -> dict:
+    """
+    Reads page's information only.
+    """
+
+    return _read_page(folder_path)[0]
+
+
+def has_front_matter(folder_path: str) -> bool:
     """
-    Reads page's information.
+    Checks if the index.md file of a folder starts with front matter.
     """
 
-    file_path = os.path.join(folder_path, constants.PAGE_INFO_FILE_NAME)
-    page_info = utils.read_yaml_file(file_path)
+    return split_front_matter(_read_page_text_file(folder_path))[0] is not None
+
+
+def _read_page(folder_path: str) -> tuple[dict, str | None]:
+    """
+    Reads page's information, along with Markdown text if it has been read.
+
+    The information is read from a index.yaml file if the page has one
+    (the text is not read then); otherwise, it is front matter
+    of the index.md file (so the page is read by a single file open).
+    """
+
+    info_file_path = os.path.join(folder_path, constants.PAGE_INFO_FILE_NAME)
+
+    if os.path.isfile(info_file_path):
+        return utils.read_yaml_file(info_file_path) or {}, None
+
+    page_info, page_source = split_front_matter(_read_page_text_file(folder_path))
+
+    if page_info is None:
+        utils.raise_error(
+            f"Page has neither {constants.PAGE_INFO_FILE_NAME} "
+            f"nor front matter in {constants.PAGE_TEXT_FILE_NAME}: {folder_path}"
+        )
+
+    return page_info, page_source
+
+
+def _read_page_text_file(folder_path: str) -> str:
+    file_path = os.path.join(folder_path, constants.PAGE_TEXT_FILE_NAME)
+
+    with open(file_path, encoding=constants.ENCODING) as file:
+        return file.read()
+
+
+def _get_page_text(
+    folder_path: str,
+    page_path: str,
+    page_source: str | None,
+    metadata: metadata_reader.BlogMetadata,
+) -> str:
+    """
+    Reads (unless it has been read already) & converts page's content.
+    """
+
+    if page_source is None:
+        page_source = _read_page_text_file(folder_path)
+
+    return content_parsing_utils.parse(page_source, page_path, metadata)
+
+
+def split_front_matter(content: str) -> tuple[dict | None, str]:
+    """
+    Splits Markdown text into its front matter & the rest of the text.
+
+    If the text has no front matter (or it is not a YAML mapping),
+    the text is returned as it is.
+    """
+
+    match = _FRONT_MATTER_PATTERN.match(content)
+
+    if match is None:
+        return None, content
+
+    try:
+        page_info = yaml.safe_load(match.group(1))
+    except yaml.YAMLError:
+        return None, content
+
+    if page_info is None:
+        page_info = {}
+
+    if not isinstance(page_info, dict):
+        return None, content
+
+    return page_info, content[match.end() :]
+
+
+def _get_page_metadata(page_info: dict) -> BlogPageMetadata:
+    """
+    Converts page's information.
+    """
 
     page_title = page_info.get("title")
     assert isinstance(page_title, str)
@@ -209,18 +345,3 @@ def _get_page_metadata(folder_path: str) -> BlogPageMetadata:
         stacks=page_stacks,
         tags=page_tags,
     )
-
-
-def _get_page_text(
-    folder_path: str, page_path: str, metadata: metadata_reader.BlogMetadata
-) -> str:
-    """
-    Reads & converts page's content.
-    """
-
-    file_path = os.path.join(folder_path, constants.PAGE_TEXT_FILE_NAME)
-
-    with open(file_path, encoding=constants.ENCODING) as file:
-        result = file.read()
-
-    return content_parsing_utils.parse(result, page_path, metadata)
@@ -5,14 +5,58 @@
 Implementation of a class to read blog's data.
 """
 
-
 import os
-from dataclasses import dataclass
+from collections.abc import Iterator
+from dataclasses import dataclass, field
 
-from bloget import constants
+from bloget import constants, metrics
 from bloget.readers import metadata_reader, page_reader
 
 
+@dataclass
+class BlogIndex:
+    """
+    Views of blog's pages which writers share (so they are built once).
+    """
+
+    # Notes & projects sorted by creation dates, newest first.
+
+    notes: list[page_reader.BlogPage]
+    projects: list[page_reader.BlogPage]
+
+    # Sorted notes by tags & sorted projects by stacks (tags & stacks
+    # of the metadata are sorted by usage they give).
+
+    notes_by_tag: dict[str, list[page_reader.BlogPage]]
+    projects_by_stack: dict[str, list[page_reader.BlogPage]]
+
+    # All pages by their paths.
+
+    pages_by_path: dict[str, page_reader.BlogPage]
+
+    # Previous (older) & next (newer) notes by folder paths of notes.
+
+    neighbours: dict[
+        str, tuple[page_reader.BlogPage | None, page_reader.BlogPage | None]
+    ]
+
+    def get_page(self, path: str) -> page_reader.BlogPage | None:
+        """
+        Returns a page by its path.
+        """
+
+        return self.pages_by_path.get(path)
+
+    def get_neighbours(
+        self, note: page_reader.BlogPage
+    ) -> tuple[page_reader.BlogPage | None, page_reader.BlogPage | None]:
+        """
+        Returns previous (older) & next (newer) notes of a note.
+        """
+
+        return self.neighbours.get(note.folder_path, (None, None))
+
+
 @dataclass
 class BlogPages:
     """
@@ -23,14 +67,32 @@ class BlogPages:
     notes: list[page_reader.BlogPage]
     projects: list[page_reader.BlogPage]
 
+    index: BlogIndex
+
+    # Related notes by folder paths of notes (if the feature is enabled).
+
+    related: dict[str, list[page_reader.BlogPage]] = field(default_factory=dict)
+
+
+# Pages by their folder paths, along with signatures of their folders.
+
+PageCache = dict[str, tuple[tuple, page_reader.BlogPage]]
+
 
 def _drop_drafts(pages: list[page_reader.BlogPage]) -> None:
     pages[:] = [p for p in pages if "draft" not in (p.metadata.options or [])]
 
 
-def get_pages(blog_metadata: metadata_reader.BlogMetadata, include_drafts: bool = False) -> BlogPages:
+def get_pages(
+    blog_metadata: metadata_reader.BlogMetadata,
+    include_drafts: bool = False,
+    page_cache: PageCache | None = None,
+) -> BlogPages:
     """
     Returns a container with blog's pages (texts & notes) to build.
+
+    A long-running process can give a page cache: a page from it is used
+    again until files in the page's folder change.
     """
 
     texts: list[page_reader.BlogPage] = []
@@ -40,32 +102,153 @@ def get_pages(blog_metadata: metadata_reader.BlogMetadata, include_drafts: bool
     pages_path = blog_metadata.paths.get("pages")
     assert isinstance(pages_path, str)
 
-    notes_path = _notes_path(pages_path)
-    projects_path = _projects_path(pages_path)
+    for directory, page_type in get_page_folders(pages_path):
+        page = _get_page(directory, blog_metadata, page_cache)
 
-    for directory, _, files in os.walk(pages_path):
-        if "index.yaml" in files:
-            is_note = directory.startswith(notes_path)
-            is_project = directory.startswith(projects_path)
+        if page_type == "note":
+            notes.append(page)
+        elif page_type == "project":
+            projects.append(page)
+        else:
+            texts.append(page)
 
-            page = page_reader.get_page(directory, blog_metadata)
-
-            if is_note:
-                notes.append(page)
-            elif is_project:
-                projects.append(page)
-            else:
-                texts.append(page)
+    if page_cache is not None:
+        for folder_path in set(page_cache) - {
+            p.folder_path for p in texts + notes + projects
+        }:
+            del page_cache[folder_path]
 
-    blog_metadata.sort_tags_by_usage(notes)
-    blog_metadata.sort_stacks_by_usage(projects)
+    # Pages' texts are not rendered yet, so drafts cost reading
+    # their information only.
 
     if not include_drafts:
         _drop_drafts(texts)
         _drop_drafts(notes)
         _drop_drafts(projects)
 
-    return BlogPages(texts, notes, projects)
+    index = get_index(texts, notes, projects)
+
+    blog_metadata.sort_tags_by_usage(
+        {tag: len(tag_notes) for tag, tag_notes in index.notes_by_tag.items()}
+    )
+    blog_metadata.sort_stacks_by_usage(
+        {
+            stack: len(stack_projects)
+            for stack, stack_projects in index.projects_by_stack.items()
+        }
+    )
+
+    return BlogPages(texts, notes, projects, index)
+
+
+def get_index(
+    texts: list[page_reader.BlogPage],
+    notes: list[page_reader.BlogPage],
+    projects: list[page_reader.BlogPage],
+) -> BlogIndex:
+    """
+    Sorts & groups pages once for all writers.
+    """
+
+    sorted_notes = sorted(notes, key=lambda note: note.created, reverse=True)
+    sorted_projects = sorted(
+        projects, key=lambda project: project.created, reverse=True
+    )
+
+    notes_by_tag: dict[str, list[page_reader.BlogPage]] = {}
+
+    for note in sorted_notes:
+        for tag in dict.fromkeys(note.tags or []):
+            notes_by_tag.setdefault(tag, []).append(note)
+
+    projects_by_stack: dict[str, list[page_reader.BlogPage]] = {}
+
+    for project in sorted_projects:
+        for stack in dict.fromkeys(project.metadata.stacks or []):
+            projects_by_stack.setdefault(stack, []).append(project)
+
+    pages_by_path = {page.path: page for page in texts + notes + projects}
+
+    neighbours = {
+        note.folder_path: (
+            sorted_notes[index + 1] if index < len(sorted_notes) - 1 else None,
+            sorted_notes[index - 1] if index > 0 else None,
+        )
+        for index, note in enumerate(sorted_notes)
+    }
+
+    return BlogIndex(
+        sorted_notes,
+        sorted_projects,
+        notes_by_tag,
+        projects_by_stack,
+        pages_by_path,
+        neighbours,
+    )
+
+
+def get_page_folders(pages_path: str) -> Iterator[tuple[str, str]]:
+    """
+    Returns paths of page folders along with types of pages (text, note or project).
+
+    A page folder has a index.yaml file, or a index.md file with front matter.
+    """
+
+    notes_path = _notes_path(pages_path)
+    projects_path = _projects_path(pages_path)
+
+    for directory, _, files in os.walk(pages_path):
+        if constants.PAGE_INFO_FILE_NAME in files or (
+            constants.PAGE_TEXT_FILE_NAME in files
+            and page_reader.has_front_matter(directory)
+        ):
+            if directory.startswith(notes_path):
+                yield directory, "note"
+            elif directory.startswith(projects_path):
+                yield directory, "project"
+            else:
+                yield directory, "text"
+
+
+def _get_page(
+    folder_path: str,
+    blog_metadata: metadata_reader.BlogMetadata,
+    page_cache: PageCache | None,
+) -> page_reader.BlogPage:
+    """
+    Returns a page from the cache if its folder hasn't changed; reads it otherwise.
+    """
+
+    if page_cache is None:
+        return page_reader.get_page(folder_path, blog_metadata)
+
+    signature = get_folder_signature(folder_path)
+    cached = page_cache.get(folder_path)
+
+    if cached is None or cached[0] != signature:
+        cached = (signature, page_reader.get_page(folder_path, blog_metadata))
+        page_cache[folder_path] = cached
+
+        metrics.add_cache_lookups("pages", 0, 1)
+    else:
+        metrics.add_cache_lookups("pages", 1, 0)
+
+    return cached[1]
+
+
+def get_folder_signature(folder_path: str) -> tuple:
+    """
+    Returns names, sizes & modification times of files in a folder.
+    """
+
+    with os.scandir(folder_path) as entries:
+        return tuple(
+            sorted(
+                (entry.name, entry.stat().st_size, entry.stat().st_mtime_ns)
+                for entry in entries
+                if entry.is_file()
+            )
+        )
 
 
 def _notes_path(pages_path: str) -> str:
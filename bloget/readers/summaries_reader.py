@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+
+"""
+Implementation of a reader of page summaries: information of pages
+without their texts (for reports, which don't need Markdown rendered).
+"""
+
+import datetime
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from bloget import metrics, utils
+from bloget.readers import page_reader, pages_reader
+
+PAGE_SUMMARIES_VERSION = 1
+
+
+@dataclass
+class PageSummary:
+    """
+    Container for a page's information (without its text).
+    """
+
+    path: str
+    page_type: str
+    created: str
+    draft: bool
+    tags: list[str] = field(default_factory=list)
+    stacks: list[str] = field(default_factory=list)
+
+    # Total size of files in the page folder (text & attachments).
+
+    size: int = 0
+
+    @property
+    def year(self) -> int | None:
+        """
+        A year of page's creation (if the page has a date).
+        """
+
+        return int(self.created[:4]) if self.created else None
+
+
+def get_page_summaries(
+    pages_path: str, cache_path: str | None = None
+) -> list[PageSummary]:
+    """
+    Returns summaries of all pages (drafts included).
+
+    Page folders are read in parallel. If a cache folder is given, a summary
+    of a page is read again only if files in the page's folder have changed.
+    """
+
+    pages_path = os.path.abspath(pages_path)
+
+    cache_file_path = _get_cache_file_path(pages_path, cache_path)
+    cache = _read_cache(cache_file_path) if cache_file_path else {}
+
+    pages: dict[str, dict[str, Any]] = {}
+    changed = []
+
+    with ThreadPoolExecutor() as executor:
+        for path, folder_path, page_type, signature in executor.map(
+            lambda item: _get_folder(pages_path, *item),
+            pages_reader.get_page_folders(pages_path),
+        ):
+            cached = cache.get(path)
+
+            if cached is not None and cached["signature"] == signature:
+                pages[path] = cached
+            else:
+                pages[path] = {"signature": signature}
+                changed.append((path, folder_path, page_type, signature))
+
+        for (path, *_), summary in zip(
+            changed, executor.map(lambda item: _get_summary(*item), changed)
+        ):
+            pages[path]["summary"] = asdict(summary)
+
+    metrics.add_cache_lookups("page-summaries", len(pages) - len(changed), len(changed))
+
+    if cache_file_path and (changed or set(cache) != set(pages)):
+        cache_data = {"version": PAGE_SUMMARIES_VERSION, "pages": pages}
+        utils.make_file(cache_file_path, json.dumps(cache_data, ensure_ascii=False))
+
+    return [PageSummary(**page["summary"]) for page in pages.values()]
+
+
+def _get_folder(
+    pages_path: str, folder_path: str, page_type: str
+) -> tuple[str, str, str, list[list]]:
+    """
+    Returns a path of a page, its folder path, type & signature of the folder.
+    """
+
+    path = os.path.relpath(folder_path, pages_path).replace(os.sep, "/")
+    signature = [list(item) for item in pages_reader.get_folder_signature(folder_path)]
+
+    return "" if path == "." else path, folder_path, page_type, signature
+
+
+def _get_summary(
+    path: str, folder_path: str, page_type: str, signature: list[list]
+) -> PageSummary:
+    """
+    Reads a summary of a page from its information file (or front matter).
+    """
+
+    page_info = page_reader.get_page_info(folder_path)
+
+    created = page_info.get("created")
+
+    if not isinstance(created, (datetime.date, datetime.datetime)):
+        created = None
+
+    return PageSummary(
+        path=path,
+        page_type=page_type,
+        created=created.isoformat() if created else "",
+        draft="draft" in (page_info.get("options") or []),
+        tags=[str(tag) for tag in page_info.get("tags") or []],
+        stacks=[str(stack) for stack in page_info.get("stacks") or []],
+        size=sum(size for _, size, _ in signature),
+    )
+
+
+def _read_cache(file_path: str) -> dict[str, dict[str, Any]]:
+    """
+    Returns cached summaries & signatures of pages by their paths.
+    """
+
+    result = utils.read_json_file(file_path)
+
+    if result.get("version") != PAGE_SUMMARIES_VERSION:
+        return {}
+
+    return result.get("pages", {})
+
+
+def _get_cache_file_path(pages_path: str, cache_path: str | None) -> str | None:
+    """
+    Returns a path to the cache file of blog's pages (several blogs
+    can share a cache folder).
+    """
+
+    if not cache_path:
+        return None
+
+    folder_path = os.path.join(cache_path, "page-summaries")
+    utils.make_folder(folder_path)
+
+    pages_key = utils.get_path_key(pages_path)
+
+    return os.path.join(folder_path, f"{pages_key}.json")
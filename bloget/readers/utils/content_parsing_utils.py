@@ -4,10 +4,14 @@
 Content parser for texts & notes.
 """
 
-from bs4 import BeautifulSoup
-from markdown import markdown
+import os
+from urllib.parse import unquote
 
+from bs4 import BeautifulSoup, Tag
+
+from bloget import constants, images, markdown_engines, utils
 from bloget.readers import metadata_reader
+from bloget.readers.utils import embed_parsing_utils
 
 
 def parse(content: str, page_path: str, metadata: metadata_reader.BlogMetadata) -> str:
@@ -15,60 +19,19 @@ def parse(content: str, page_path: str, metadata: metadata_reader.BlogMetadata)
     Parses a page's content from Markdown to HTML.
     """
 
-    content = _replace_links_to_social_networks(content)
-    content = markdown(content)
+    content = render_markdown(content, metadata)
 
     return _update_internal_links(content, page_path, metadata)
 
 
-def _replace_links_to_social_networks(content: str) -> str:
-    """
-    Replaces links to social networks by applets.
-    """
-
-    lines = content.splitlines()
-
-    for index, line in enumerate(lines):
-        _replace_github_gist_link(lines, index, line)
-
-        _replace_youtube_link(lines, index, line, "https://www.youtube.com/watch?v=")
-        _replace_youtube_link(lines, index, line, "https://youtu.be/")
-
-    return "\n".join(lines)
-
-
-def _replace_youtube_link(lines: list[str], index: int, line: str, marker: str) -> None:
-    """
-    Replaces a link to YouTube by its iframe.
-    """
-
-    if line.startswith(marker):
-        video_id = line.strip().replace(marker, "")
-        template = (
-            '<iframe width="560" height="315" src="https://www.youtube.com/embed/{0}" '
-            'frameborder="0" allow="accelerometer; autoplay; encrypted-media; gyroscope; '
-            'picture-in-picture" allowfullscreen></iframe> '
-        )
-
-        lines[index] = template.format(video_id)
-
-
-def _replace_github_gist_link(lines: list[str], index: int, line: str) -> None:
+def render_markdown(content: str, metadata: metadata_reader.BlogMetadata) -> str:
     """
-    Replaces a link to GitHub Gist by its script.
+    Replaces embeds, then renders Markdown to HTML with the engine from settings.
     """
 
-    marker = "https://gist.github.com/"
-
-    if line.startswith(marker):
-        gist = line.strip().replace(marker, "").split("/")
-
-        gist_owner = gist[0]
-        gist_id = gist[1]
+    content = embed_parsing_utils.replace_embeds(content)
 
-        template = '<script src="https://gist.github.com/{0}/{1}.js">{2}</script>'
-
-        lines[index] = template.format(gist_owner, gist_id, "Gist")
+    return markdown_engines.render(content, metadata.settings.get("markdown_engine"))
 
 
 def get_internal_link(
@@ -110,11 +73,151 @@ def _update_internal_links(
 
     soup = BeautifulSoup(content, features="html.parser")
 
-    for tag in soup.find_all("img"):
-        tag["src"] = get_internal_link(tag["src"], page_path, metadata)
+    for index, tag in enumerate(soup.find_all("img")):
+        _add_image_hints(tag, index, page_path, metadata)
+
+        if metadata.settings.get("responsive_images"):
+            _add_image_sources(soup, tag, page_path, metadata)
+
+        src = _get_deduplicated_link(tag["src"], page_path, metadata)
+        tag["src"] = get_internal_link(src, page_path, metadata)
 
     for tag in soup.find_all("a"):
+        href = _get_deduplicated_link(tag["href"], page_path, metadata)
+
         tag["target"] = "_blank"
-        tag["href"] = get_internal_link(tag["href"], page_path, metadata)
+        tag["href"] = get_internal_link(href, page_path, metadata)
 
     return str(soup)
+
+
+def _add_image_hints(
+    tag: Tag, index: int, page_path: str, metadata: metadata_reader.BlogMetadata
+) -> None:
+    """
+    Adds intrinsic dimensions & loading hints to an image.
+
+    Every image but the first one on a page is considered to be below the fold.
+    """
+
+    if index > 0 and not tag.has_attr("loading"):
+        tag["loading"] = "lazy"
+
+    file_path = _get_local_file_path(tag.get("src", ""), page_path, metadata)
+
+    if file_path is None:
+        return
+
+    if not tag.has_attr("decoding"):
+        tag["decoding"] = "async"
+
+    size = images.get_image_size(file_path)
+
+    if size and not (tag.has_attr("width") or tag.has_attr("height")):
+        tag["width"], tag["height"] = str(size[0]), str(size[1])
+
+
+def _add_image_sources(
+    soup: BeautifulSoup,
+    tag: Tag,
+    page_path: str,
+    metadata: metadata_reader.BlogMetadata,
+) -> None:
+    """
+    Wraps an image attachment into a picture with sources of its derivatives.
+    """
+
+    file_path = _get_attachment_path(tag["src"], page_path, metadata)
+
+    if file_path is None or not images.is_image(file_path):
+        return
+
+    derivatives = images.get_derivatives(file_path)
+
+    if not derivatives:
+        return
+
+    tag.wrap(soup.new_tag("picture"))
+
+    for image_format in images.get_formats():
+        srcset = [
+            f"{get_internal_link(d.file_name, page_path, metadata)} {d.width}w"
+            for d in derivatives
+            if d.image_format == image_format
+        ]
+
+        source = soup.new_tag(
+            "source",
+            attrs={
+                "type": f"image/{image_format}",
+                "srcset": ", ".join(srcset),
+                "sizes": constants.IMAGE_DERIVATIVE_SIZES,
+            },
+        )
+
+        tag.insert_before(source)
+
+
+def _get_deduplicated_link(
+    link: str, page_path: str, metadata: metadata_reader.BlogMetadata
+) -> str:
+    """
+    Returns a link to the content-addressed copy of a page attachment,
+    if attachments are deduplicated (or the link as is).
+    """
+
+    if not metadata.settings.get("deduplicate_attachments"):
+        return link
+
+    file_path = _get_attachment_path(link, page_path, metadata)
+
+    if file_path is None:
+        return link
+
+    return f"/{utils.get_content_address(file_path)}"
+
+
+def _get_attachment_path(
+    link: str, page_path: str, metadata: metadata_reader.BlogMetadata
+) -> str | None:
+    """
+    Returns path to a page attachment a link points at (or None if it doesn't).
+    """
+
+    file_name = unquote(link)
+
+    if "/" in file_name or "\\" in file_name or ":" in file_name:
+        return None
+
+    pages_path = metadata.paths["pages"]
+    file_path = os.path.join(pages_path, *page_path.split("/"), file_name)
+
+    return file_path if os.path.isfile(file_path) else None
+
+
+def _get_local_file_path(
+    link: str, page_path: str, metadata: metadata_reader.BlogMetadata
+) -> str | None:
+    """
+    Returns path to a local file a link points at (or None if it doesn't).
+
+    A link can point at a page attachment or, if it starts with a slash,
+    at a file in the public folder or in the pages folder.
+    """
+
+    if not link.startswith("/"):
+        return _get_attachment_path(link, page_path, metadata)
+
+    link_parts = unquote(link).strip("/").split("/")
+
+    if ".." in link_parts:
+        return None
+
+    for root_path in (metadata.paths.get("public"), metadata.paths["pages"]):
+        if root_path:
+            file_path = os.path.join(root_path, *link_parts)
+
+            if os.path.isfile(file_path):
+                return file_path
+
+    return None
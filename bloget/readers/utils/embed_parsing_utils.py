@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+"""
+Embeds parser: replaces lines which are links to videos, gists & posts
+by their players or widgets.
+"""
+
+import re
+from collections.abc import Callable
+
+_YOUTUBE_TEMPLATE = (
+    '<iframe width="560" height="315" src="https://www.youtube.com/embed/{0}" '
+    'frameborder="0" allow="accelerometer; autoplay; encrypted-media; gyroscope; '
+    'picture-in-picture" allowfullscreen></iframe> '
+)
+
+_VIMEO_TEMPLATE = (
+    '<iframe width="560" height="315" src="https://player.vimeo.com/video/{0}" '
+    'frameborder="0" allow="autoplay; fullscreen; picture-in-picture" '
+    "allowfullscreen></iframe>"
+)
+
+_GIST_TEMPLATE = '<script src="https://gist.github.com/{0}/{1}.js">Gist</script>'
+
+_TWEET_TEMPLATE = (
+    '<blockquote class="twitter-tweet"><a href="https://twitter.com/{0}/status/{1}">'
+    "https://twitter.com/{0}/status/{1}</a></blockquote> "
+    '<script async src="https://platform.twitter.com/widgets.js" '
+    'charset="utf-8"></script>'
+)
+
+_VIMEO_ID_PATTERN = re.compile(r"(\d+)/?")
+_TWEET_PATTERN = re.compile(r"(\w+)/status/(\d+)(?:[/?].*)?")
+
+
+def _get_youtube_embed(value: str) -> str | None:
+    """
+    Returns an iframe of a YouTube video by its ID.
+    """
+
+    return _YOUTUBE_TEMPLATE.format(value)
+
+
+def _get_vimeo_embed(value: str) -> str | None:
+    """
+    Returns an iframe of a Vimeo video by its ID.
+    """
+
+    match = _VIMEO_ID_PATTERN.fullmatch(value)
+
+    return _VIMEO_TEMPLATE.format(match.group(1)) if match else None
+
+
+def _get_github_gist_embed(value: str) -> str | None:
+    """
+    Returns a script of a GitHub Gist by its owner & ID.
+    """
+
+    gist = value.split("/")
+
+    return _GIST_TEMPLATE.format(gist[0], gist[1]) if len(gist) > 1 else None
+
+
+def _get_tweet_embed(value: str) -> str | None:
+    """
+    Returns a widget of a post on Twitter (X) by its author & ID.
+    """
+
+    match = _TWEET_PATTERN.fullmatch(value)
+
+    return _TWEET_TEMPLATE.format(match.group(1), match.group(2)) if match else None
+
+
+# Link prefixes & functions which return an embed by the rest of a link
+# (or None, if the link is not the one to embed).
+
+EMBED_PROVIDERS: dict[str, Callable[[str], str | None]] = {
+    "https://www.youtube.com/watch?v=": _get_youtube_embed,
+    "https://youtu.be/": _get_youtube_embed,
+    "https://vimeo.com/": _get_vimeo_embed,
+    "https://gist.github.com/": _get_github_gist_embed,
+    "https://twitter.com/": _get_tweet_embed,
+    "https://x.com/": _get_tweet_embed,
+}
+
+# All prefixes are matched by one alternation (longer ones first), so a line
+# is scanned once however many providers there are.
+
+_EMBED_PATTERN = re.compile(
+    "^("
+    + "|".join(map(re.escape, sorted(EMBED_PROVIDERS, key=len, reverse=True)))
+    + ")(.*)$",
+    re.MULTILINE,
+)
+
+
+def replace_embeds(content: str) -> str:
+    """
+    Replaces lines which start with links to known providers by embeds.
+    """
+
+    return _EMBED_PATTERN.sub(_get_embed, content)
+
+
+def _get_embed(match: re.Match) -> str:
+    prefix, value = match.groups()
+
+    return EMBED_PROVIDERS[prefix](value.strip()) or match.group(0)
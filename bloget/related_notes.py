@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+
+"""
+Implementation of related notes search: TF-IDF vectors of notes' words & tags,
+along with MinHash signatures & locality-sensitive hashing to find candidates.
+"""
+
+import hashlib
+import html
+import json
+import logging
+import os
+import re
+import zlib
+from collections import Counter
+from typing import Any
+
+from bloget import metrics, utils
+from bloget.readers import metadata_reader, page_reader, pages_reader
+
+RELATED_NOTES_VERSION = 1
+
+# A note is hashed by its most distinctive terms only: notes on the same topic
+# share them, while common words would make every note look similar.
+
+MINHASH_TERMS = 32
+MINHASH_PERMUTATIONS = 64
+MINHASH_SEED = 20240601
+LSH_BAND_SIZE = 2
+
+# Buckets which are larger than this are skipped: they are made of terms
+# which are too common to tell anything about notes in them.
+
+LSH_MAX_BUCKET_SIZE = 200
+
+TAG_WEIGHT = 3
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_MINHASH_CHUNK_SIZE = 1024
+
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+_WORD_PATTERN = re.compile(r"[^\W\d_]{3,}")
+
+
+def get_related_notes(
+    pages: pages_reader.BlogPages, metadata: metadata_reader.BlogMetadata
+) -> tuple[dict[str, list[page_reader.BlogPage]], set[str]]:
+    """
+    Returns related notes of each note (by folder paths of notes), along with
+    folder paths of notes which related notes differ from the previous build.
+
+    Terms of a note are cached by its content hash; the whole result is cached
+    until any note changes.
+    """
+
+    logging.info("RELATED NOTES BUILDING...")
+
+    count = int(metadata.settings.get("related_notes") or 0)
+
+    cache_file_path = _get_cache_file_path(metadata)
+    cache = _read_cache(cache_file_path)
+
+    notes = pages.notes
+    keys = [_get_note_key(note) for note in notes]
+
+    terms = {
+        key: cache["terms"].get(key) or _get_note_terms(note)
+        for key, note in zip(keys, notes)
+    }
+
+    terms_hits = sum(1 for key in keys if key in cache["terms"])
+    metrics.add_cache_lookups("note_terms", terms_hits, len(keys) - terms_hits)
+
+    corpus = hashlib.sha256(
+        json.dumps([count, sorted(zip((n.path for n in notes), keys))]).encode()
+    ).hexdigest()
+
+    if cache["corpus"] == corpus:
+        related = cache["related"]
+    else:
+        related = _get_related_paths(notes, [terms[key] for key in keys], count)
+
+    updated = {
+        note.folder_path
+        for note in notes
+        if cache["related"].get(note.path, []) != related.get(note.path, [])
+    }
+
+    cache = {
+        "version": RELATED_NOTES_VERSION,
+        "terms": terms,
+        "corpus": corpus,
+        "related": related,
+    }
+
+    utils.make_file(cache_file_path, json.dumps(cache, ensure_ascii=False))
+
+    notes_by_paths = {note.path: note for note in notes}
+
+    result = {
+        note.folder_path: [notes_by_paths[path] for path in related.get(note.path, [])]
+        for note in notes
+    }
+
+    logging.info("%d notes have related ones", sum(1 for r in result.values() if r))
+    logging.info("RELATED NOTES BUILDING DONE")
+
+    return result, updated
+
+
+def _get_related_paths(
+    notes: list[page_reader.BlogPage], terms: list[dict[str, int]], count: int
+) -> dict[str, list[str]]:
+    """
+    Returns paths of the most similar notes for each note.
+
+    Candidates are notes which share an LSH bucket with a note; then they are
+    ranked by cosine similarity of TF-IDF vectors.
+    """
+
+    if not notes:
+        return {}
+
+    numpy = _import_numpy()
+
+    vectors, top_terms = _get_vectors(terms, numpy)
+    signatures = _get_signatures(top_terms, numpy)
+    candidates = _get_candidates(signatures, numpy)
+
+    result = {}
+
+    for index, note in enumerate(notes):
+        scores = []
+
+        for candidate in candidates[index]:
+            score = _get_similarity(vectors[index], vectors[candidate], numpy)
+
+            if score > 0:
+                scores.append((-score, notes[candidate].path))
+
+        result[note.path] = [path for _, path in sorted(scores)[:count]]
+
+    return result
+
+
+def _get_similarity(vector: tuple, other_vector: tuple, numpy: Any) -> float:
+    """
+    Returns cosine similarity of two normalized sparse vectors.
+    """
+
+    term_ids, weights = vector
+    other_term_ids, other_weights = other_vector
+
+    _, positions, other_positions = numpy.intersect1d(
+        term_ids, other_term_ids, assume_unique=True, return_indices=True
+    )
+
+    return float(numpy.dot(weights[positions], other_weights[other_positions]))
+
+
+def _get_vectors(terms: list[dict[str, int]], numpy: Any) -> tuple[list, list]:
+    """
+    Returns L2-normalized TF-IDF vectors of notes (sorted term ids & weights),
+    along with hashes of the most distinctive terms of each note.
+    """
+
+    vocabulary: dict[str, int] = {}
+
+    term_ids = [
+        numpy.array(
+            [vocabulary.setdefault(t, len(vocabulary)) for t in note_terms], dtype=int
+        )
+        for note_terms in terms
+    ]
+
+    frequencies = numpy.bincount(
+        numpy.concatenate(term_ids + [numpy.zeros(0, dtype=int)]),
+        minlength=len(vocabulary),
+    )
+    idf = numpy.log((1 + len(terms)) / (1 + frequencies)) + 1
+
+    term_hashes = numpy.array(
+        [zlib.crc32(term.encode()) for term in vocabulary], dtype=numpy.uint64
+    )
+
+    vectors = []
+    top_terms = []
+
+    for ids, note_terms in zip(term_ids, terms):
+        counts = numpy.array(list(note_terms.values()), dtype=float)
+
+        weights = (1 + numpy.log(counts)) * idf[ids]
+        weights = weights / (numpy.linalg.norm(weights) or 1)
+
+        order = numpy.argsort(ids)
+        vectors.append((ids[order], weights[order]))
+
+        top = ids[numpy.argsort(-weights, kind="stable")[:MINHASH_TERMS]]
+        top_terms.append(term_hashes[top])
+
+    return vectors, top_terms
+
+
+def _get_signatures(top_terms: list, numpy: Any) -> Any:
+    """
+    Returns MinHash signatures of notes (one row per note).
+    """
+
+    random = numpy.random.default_rng(MINHASH_SEED)
+
+    factors = random.integers(
+        1, _MERSENNE_PRIME, size=MINHASH_PERMUTATIONS, dtype=numpy.uint64
+    )
+    offsets = random.integers(
+        0, _MERSENNE_PRIME, size=MINHASH_PERMUTATIONS, dtype=numpy.uint64
+    )
+
+    # Term hashes of notes are padded to the same length by repeating
+    # the first one, which doesn't change a minimum.
+
+    padded = numpy.zeros((len(top_terms), MINHASH_TERMS), dtype=numpy.uint64)
+
+    for index, hashes in enumerate(top_terms):
+        if len(hashes):
+            padded[index] = numpy.resize(hashes, MINHASH_TERMS)
+
+    hashes = padded % _MERSENNE_PRIME
+    result = numpy.zeros((len(top_terms), MINHASH_PERMUTATIONS), dtype=numpy.uint64)
+
+    for start in range(0, len(top_terms), _MINHASH_CHUNK_SIZE):
+        chunk = hashes[start : start + _MINHASH_CHUNK_SIZE]
+
+        permuted = (
+            factors[None, :, None] * chunk[:, None, :] + offsets[None, :, None]
+        ) % _MERSENNE_PRIME
+
+        result[start : start + _MINHASH_CHUNK_SIZE] = permuted.min(axis=2)
+
+    return result
+
+
+def _get_candidates(signatures: Any, numpy: Any) -> list[set[int]]:
+    """
+    Returns indexes of candidate notes for each note: notes which signatures
+    are equal to the note's one in at least one band.
+    """
+
+    result: list[set[int]] = [set() for _ in range(len(signatures))]
+
+    for start in range(0, MINHASH_PERMUTATIONS, LSH_BAND_SIZE):
+        band = signatures[:, start : start + LSH_BAND_SIZE]
+
+        _, buckets = numpy.unique(band, axis=0, return_inverse=True)
+        buckets = buckets.reshape(-1)
+
+        order = numpy.argsort(buckets, kind="stable")
+        bounds = numpy.flatnonzero(numpy.diff(buckets[order])) + 1
+
+        for bucket in numpy.split(order, bounds):
+            if 1 < len(bucket) <= LSH_MAX_BUCKET_SIZE:
+                members = set(bucket.tolist())
+
+                for index in members:
+                    result[index].update(members)
+
+    for index, candidates in enumerate(result):
+        candidates.discard(index)
+
+    return result
+
+
+def _get_note_terms(note: page_reader.BlogPage) -> dict[str, int]:
+    """
+    Returns counts of words of a note's plain text, along with its tags.
+    """
+
+    text = html.unescape(_TAG_PATTERN.sub(" ", note.text)).lower()
+
+    result = Counter(_WORD_PATTERN.findall(text))
+
+    for tag in note.tags:
+        result[f"#{tag}"] += TAG_WEIGHT
+
+    return dict(result)
+
+
+def _get_note_key(note: page_reader.BlogPage) -> str:
+    """
+    Returns a hash of data which terms of a note are made of.
+    """
+
+    data = "\0".join([note.text] + [str(tag) for tag in note.tags])
+
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def _import_numpy() -> Any:
+    """
+    Returns the NumPy module (an optional dependency).
+    """
+
+    try:
+        # pylint: disable-next=import-outside-toplevel
+        import numpy
+    except ImportError:
+        utils.raise_error("Related notes require NumPy to be installed")
+
+    return numpy
+
+
+def _read_cache(file_path: str) -> dict[str, Any]:
+    """
+    Returns cached terms & related notes of the previous build.
+    """
+
+    result = utils.read_json_file(file_path)
+
+    if result.get("version") != RELATED_NOTES_VERSION:
+        result = {}
+
+    return {
+        "terms": result.get("terms", {}),
+        "corpus": result.get("corpus"),
+        "related": result.get("related", {}),
+    }
+
+
+def _get_cache_file_path(metadata: metadata_reader.BlogMetadata) -> str:
+    """
+    Returns a path to the cache file of blog's pages (several blogs
+    can share a cache folder).
+    """
+
+    folder_path = os.path.join(metadata.paths["cache"], "related-notes")
+    utils.make_folder(folder_path)
+
+    pages_key = utils.get_path_key(metadata.paths["pages"])
+
+    return os.path.join(folder_path, f"{pages_key}.json")
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+"""
+Implementation of atomic builds: a blog is built into a sibling staging folder,
+which then takes place of the output folder at once (the previous build
+is kept next to it for a rollback).
+"""
+
+import argparse
+import ctypes
+import logging
+import os
+import shutil
+
+from bloget import constants, utils
+
+STAGING_SUFFIX = ".staging"
+PREVIOUS_SUFFIX = ".previous"
+
+# Flags of the renameat2() system call of Linux.
+
+_AT_FDCWD = -100
+_RENAME_EXCHANGE = 2
+
+
+def prepare_staging(output_path: str, incremental: bool) -> str:
+    """
+    Makes an empty staging folder for the output folder & returns its path.
+
+    For an incremental build, files of the output folder are carried over
+    (as hard links, where the file system allows it; writers replace such
+    files instead of changing them, so the output folder is never touched).
+    """
+
+    output_path = os.path.abspath(output_path)
+    staging_path = output_path + STAGING_SUFFIX
+
+    logging.info("Preparing staging directory %s", staging_path)
+
+    _remove_folder(staging_path)
+    utils.make_folder(staging_path)
+
+    if incremental and os.path.isdir(output_path):
+        for item in os.listdir(output_path):
+            if item not in constants.PROTECTED_FILES:
+                utils.copy_file(
+                    os.path.join(output_path, item),
+                    os.path.join(staging_path, item),
+                    link=True,
+                )
+
+    return staging_path
+
+
+def swap_staging(output_path: str) -> None:
+    """
+    Puts the staging folder in place of the output folder, which becomes
+    the previous build. Protected files (.git, CNAME) are moved to the new build,
+    unless it has files of its own.
+    """
+
+    output_path = os.path.abspath(output_path)
+    staging_path = output_path + STAGING_SUFFIX
+    previous_path = output_path + PREVIOUS_SUFFIX
+
+    logging.info("Swapping %s into %s", staging_path, output_path)
+
+    _remove_folder(previous_path)
+
+    if not os.path.isdir(output_path):
+        os.rename(staging_path, output_path)
+        return
+
+    _exchange_folders(output_path, staging_path)
+
+    os.rename(staging_path, previous_path)
+
+
+def rollback(arguments: argparse.Namespace) -> None:
+    """
+    Swaps the output folder & the previous build (so a second rollback
+    brings the latest build back).
+    """
+
+    logging.info("Rolling back")
+
+    output_path = os.path.abspath(arguments.output)
+    previous_path = output_path + PREVIOUS_SUFFIX
+
+    if not os.path.isdir(previous_path):
+        utils.raise_error(f"There is no previous build: {previous_path}")
+
+    _exchange_folders(output_path, previous_path)
+
+    logging.info("Output directory is rolled back: %s", output_path)
+
+
+def _exchange_folders(output_path: str, new_path: str) -> None:
+    """
+    Exchanges the output folder with a new one; the new one gets protected files
+    of the output folder.
+
+    On Linux, folders are exchanged by a single renameat2() call, so there is
+    no moment the output folder doesn't exist; elsewhere, by two renames.
+    """
+
+    for item in constants.PROTECTED_FILES:
+        item_path = os.path.join(output_path, item)
+        new_item_path = os.path.join(new_path, item)
+
+        if os.path.lexists(item_path) and not os.path.lexists(new_item_path):
+            os.replace(item_path, new_item_path)
+
+    if _rename_exchange(output_path, new_path):
+        return
+
+    temporary_path = f"{output_path}.{os.getpid()}.tmp"
+
+    os.rename(output_path, temporary_path)
+    os.rename(new_path, output_path)
+    os.rename(temporary_path, new_path)
+
+
+def _rename_exchange(first_path: str, second_path: str) -> bool:
+    """
+    Atomically exchanges two paths; returns False if the platform
+    (or the file system) cannot do it.
+    """
+
+    try:
+        renameat2 = ctypes.CDLL(None, use_errno=True).renameat2
+    except (AttributeError, OSError):
+        return False
+
+    result = renameat2(
+        _AT_FDCWD,
+        os.fsencode(first_path),
+        _AT_FDCWD,
+        os.fsencode(second_path),
+        _RENAME_EXCHANGE,
+    )
+
+    return result == 0
+
+
+def _remove_folder(folder_path: str) -> None:
+    try:
+        if os.path.isdir(folder_path):
+            shutil.rmtree(folder_path)
+
+    except IOError:
+        utils.raise_error(f"Unable to remove a directory: {folder_path}")
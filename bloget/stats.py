@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+
+"""
+Implementation of blog's statistics report.
+"""
+
+import argparse
+import logging
+from collections import Counter
+
+from bloget.readers import summaries_reader
+
+
+def show_stats(arguments: argparse.Namespace) -> None:
+    """
+    Prints counts of pages by types, tags, stacks & years, along with
+    the largest pages (reading information of pages only, not their texts).
+    """
+
+    logging.info("Blog statistics showing")
+
+    summaries = summaries_reader.get_page_summaries(
+        arguments.pages, None if arguments.no_cache else arguments.cache
+    )
+
+    drafts = [summary for summary in summaries if summary.draft]
+
+    if not arguments.include_drafts:
+        summaries = [summary for summary in summaries if not summary.draft]
+
+    print(f"Pages: {len(summaries)} (drafts: {len(drafts)})")
+
+    _print_counts("Types", Counter(summary.page_type for summary in summaries))
+
+    _print_counts(
+        "Tags",
+        Counter(
+            tag
+            for summary in summaries
+            if summary.page_type == "note"
+            for tag in dict.fromkeys(summary.tags)
+        ),
+    )
+
+    _print_counts(
+        "Stacks",
+        Counter(
+            stack
+            for summary in summaries
+            if summary.page_type == "project"
+            for stack in dict.fromkeys(summary.stacks)
+        ),
+    )
+
+    years = Counter(summary.year for summary in summaries if summary.year)
+
+    _print_counts("Years", Counter(dict(sorted(years.items(), reverse=True))), False)
+
+    largest = sorted(summaries, key=lambda summary: summary.size, reverse=True)
+
+    print()
+    print("Largest pages:")
+
+    for summary in largest[: arguments.top]:
+        print(f"  {summary.size / 1024:>10.1f} KB  {summary.path or '/'}")
+
+
+def _print_counts(title: str, counts: Counter, by_count: bool = True) -> None:
+    """
+    Prints counts by keys (the most common first, or in the order of keys).
+    """
+
+    print()
+    print(f"{title}:")
+
+    items = counts.most_common() if by_count else counts.items()
+
+    for key, count in items:
+        print(f"  {count:>6}  {key}")
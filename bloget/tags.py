@@ -8,21 +8,29 @@ Implementation of tags handler.
 import argparse
 import logging
 
-from bloget.readers import metadata_reader, pages_reader
+from bloget.readers import summaries_reader
 
 
 def show_tags_list(arguments: argparse.Namespace) -> None:
     """
-    Initializes blog's data by arguments given, then builds it.
+    Prints tags of notes (reading information of pages only, not their texts).
     """
 
     logging.info("Tags list showing")
 
-    metadata = metadata_reader.get_metadata(arguments)
-
-    pages = pages_reader.get_pages(metadata)
-
-    unique_tags = sorted({tag for p in pages.notes for tag in (p.metadata.tags or [])})
+    summaries = summaries_reader.get_page_summaries(
+        arguments.pages, None if arguments.no_cache else arguments.cache
+    )
+
+    unique_tags = sorted(
+        {
+            tag
+            for summary in summaries
+            if summary.page_type == "note"
+            and (arguments.include_drafts or not summary.draft)
+            for tag in summary.tags
+        }
+    )
 
     for tag in unique_tags:
         print(tag)
@@ -4,14 +4,21 @@
 Implementation of methods intended to be used by various files.
 """
 
+import codecs
+import functools
+import hashlib
+import json
 import logging
 import os
 import shutil
 import sys
+from collections.abc import Iterable, Iterator
+from typing import Any
 
+import jinja2
 import yaml
 
-from bloget import constants
+from bloget import constants, metrics, output
 
 
 def raise_error(message: str) -> None:
@@ -23,37 +30,232 @@ def raise_error(message: str) -> None:
     sys.exit("A critical error has occurred. Exiting...")
 
 
-def copy_file(source_path: str, target_path: str) -> None:
+def copy_file(source_path: str, target_path: str, link: bool = False) -> None:
     """
     Copies file or folder.
+
+    If linking is requested, files are hard-linked instead of being copied
+    (where the file system allows it), so several outputs can share one copy.
     """
 
     logging.debug('Copying "%s" to "%s"...', source_path, target_path)
 
+    backend = output.get_backend(target_path)
+
+    if backend is not None:
+        backend[0].copy(backend[1], source_path)
+        metrics.add_bytes("copied", _get_size(source_path))
+        return
+
+    copy_function = _link_file if link else _copy_file
+
     try:
         if os.path.isdir(source_path):
-            shutil.copytree(source_path, target_path)
+            shutil.copytree(
+                source_path,
+                target_path,
+                copy_function=copy_function,
+                dirs_exist_ok=True,
+            )
         else:
-            shutil.copy2(source_path, target_path)
+            copy_function(source_path, target_path)
 
     except IOError:
         raise_error(f'Unable to copy "{source_path}" to: {target_path}')
 
 
-def make_file(path: str, data: str) -> None:
+def _link_file(source_path: str, target_path: str) -> None:
+    """
+    Hard-links a file (in place of an existing one); copies it if a link
+    cannot be made.
+    """
+
+    try:
+        if os.path.isfile(target_path):
+            if os.path.samefile(source_path, target_path):
+                return
+
+            os.unlink(target_path)
+
+        os.link(source_path, target_path)
+        metrics.add_bytes("copied", os.path.getsize(source_path))
+    except OSError:
+        _copy_file(source_path, target_path)
+
+
+def _copy_file(source_path: str, target_path: str) -> None:
+    """
+    Copies a file along with its metadata.
+    """
+
+    _detach_file(target_path)
+
+    shutil.copy2(source_path, target_path)
+    metrics.add_bytes("copied", os.path.getsize(source_path))
+
+
+def _detach_file(path: str) -> None:
+    """
+    Removes a file which is hard-linked elsewhere (to a previous build,
+    for instance), so writing it doesn't change the other links.
+    """
+
+    try:
+        if os.stat(path).st_nlink > 1:
+            os.unlink(path)
+
+    except FileNotFoundError:
+        pass
+
+
+def replace_file(path: str, data: bytes) -> None:
+    """
+    Writes a file via a temporary one, so readers never see a partial file.
+
+    Since a new file replaces the old one, hard links to the latter are kept intact.
+    """
+
+    backend = output.get_backend(path)
+
+    metrics.add_bytes("written", len(data))
+
+    if backend is not None:
+        backend[0].write(backend[1], data)
+        return
+
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+
+    try:
+        with open(temporary_path, "wb") as file:
+            file.write(data)
+
+        os.replace(temporary_path, path)
+
+    except IOError:
+        raise_error(f"Unable to make a file: {path}")
+
+
+def remove_file(path: str) -> None:
+    """
+    Removes a file (if there is one).
+    """
+
+    logging.debug('Removing a file "%s"...', path)
+
+    backend = output.get_backend(path)
+
+    if backend is not None:
+        backend[0].remove(backend[1])
+        return
+
+    try:
+        os.remove(path)
+
+    except FileNotFoundError:
+        pass
+
+    except IOError:
+        raise_error(f"Unable to remove a file: {path}")
+
+
+def _get_size(path: str) -> int:
+    """
+    Returns a size of a file or a total size of files in a folder.
+    """
+
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+
+    return sum(
+        os.path.getsize(os.path.join(directory, file_name))
+        for directory, _, files in os.walk(path)
+        for file_name in files
+    )
+
+
+def make_file(path: str, data: str | Iterable[str]) -> None:
     """
     Makes a file.
+
+    The data can be either a string or an iterable of string chunks (for
+    instance, a template stream); chunks are written to a disk as they come, so a file
+    never has to be kept in memory as a whole.
+
+    Chunks go to a temporary file which replaces the file at the end, so an error
+    in the middle of rendering never leaves a truncated file (and hard links
+    to the old file are kept intact).
     """
 
     logging.debug('Making a file "%s"...', path)
 
+    backend = output.get_backend(path)
+
+    if backend is not None:
+        backend[0].write(
+            backend[1], _encode_chunks([data] if isinstance(data, str) else data)
+        )
+        return
+
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+
     try:
-        with open(path, "w+", encoding=constants.ENCODING) as file:
-            file.write(data)
+        with open(
+            temporary_path,
+            "w+",
+            encoding=constants.ENCODING,
+            buffering=constants.FILE_BUFFER_SIZE,
+        ) as file:
+            if isinstance(data, str):
+                file.write(data)
+            else:
+                file.writelines(data)
+
+        metrics.add_bytes("written", os.path.getsize(temporary_path))
+
+        os.replace(temporary_path, path)
 
     except IOError:
+        _remove_temporary_file(temporary_path)
         raise_error(f"Unable to make a file: {path}")
 
+    except BaseException:
+        _remove_temporary_file(temporary_path)
+        raise
+
+
+def _encode_chunks(chunks: Iterable[str]) -> Iterator[bytes]:
+    """
+    Encodes string chunks as they come (a BOM is written only once).
+    """
+
+    encoder = codecs.getincrementalencoder(constants.ENCODING)()
+
+    for chunk in chunks:
+        encoded_chunk = encoder.encode(chunk)
+        metrics.add_bytes("written", len(encoded_chunk))
+
+        yield encoded_chunk
+
+
+def _remove_temporary_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def render_template(
+    templates: jinja2.Environment, template_name: str, parameters: dict[str, Any]
+) -> Iterator[str]:
+    """
+    Returns a buffered stream of a rendered template.
+    """
+
+    stream = templates.get_template(template_name).stream(parameters)
+    stream.enable_buffering(constants.TEMPLATE_STREAM_BUFFER_SIZE)
+
+    return stream
+
 
 def make_folder(path: str) -> None:
     """
@@ -62,6 +264,9 @@ def make_folder(path: str) -> None:
 
     logging.debug('Making a folder "%s"...', path)
 
+    if output.get_backend(path) is not None:
+        return
+
     if not os.path.exists(path):
         try:
             os.makedirs(path)
@@ -69,6 +274,130 @@ def make_folder(path: str) -> None:
             raise_error(f"Unable to make a folder: {path}")
 
 
+def read_file(path: str) -> bytes:
+    """
+    Returns content of a file (which can be kept by an output backend).
+    """
+
+    result = b""
+
+    try:
+        backend = output.get_backend(path)
+
+        if backend is not None:
+            result = backend[0].read(backend[1])
+        else:
+            with open(path, "rb") as file:
+                result = file.read()
+
+    except (IOError, KeyError):
+        raise_error(f"Unable to read a file: {path}")
+
+    return result
+
+
+def get_files(folder_path: str) -> list[str]:
+    """
+    Returns relative paths (with slashes) of all files in a folder
+    (which can be kept by an output backend).
+    """
+
+    backend = output.get_backend(folder_path)
+
+    if backend is not None:
+        prefix = f"{backend[1]}/" if backend[1] else ""
+
+        return [
+            path[len(prefix) :] for path in backend[0].files if path.startswith(prefix)
+        ]
+
+    result = []
+
+    for directory, _, files in os.walk(folder_path):
+        relative_path = os.path.relpath(directory, folder_path).replace(os.sep, "/")
+        prefix = "" if relative_path == "." else f"{relative_path}/"
+
+        result.extend(f"{prefix}{file_name}" for file_name in files)
+
+    return result
+
+
+def get_file_hash(path: str) -> str:
+    """
+    Returns SHA-256 hash of a file's content.
+
+    The file is read in chunks; a result is memoized until the file changes.
+    """
+
+    try:
+        stat = os.stat(path)
+    except IOError:
+        raise_error(f"Unable to read a file: {path}")
+
+    return _get_file_hash(path, stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_file_hash(path: str, mtime: int, size: int) -> str:
+    """
+    Returns SHA-256 hash of a file's content (the memoized part).
+    """
+
+    logging.debug('Hashing a file "%s" (%d bytes, mtime %d)...', path, size, mtime)
+
+    result = hashlib.sha256()
+
+    try:
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(constants.FILE_BUFFER_SIZE), b""):
+                result.update(chunk)
+
+    except IOError:
+        raise_error(f"Unable to read a file: {path}")
+
+    return result.hexdigest()
+
+
+def get_path_key(path: str) -> str:
+    """
+    Returns a short key of a path (to name files & folders which belong to it).
+    """
+
+    return hashlib.sha256(os.path.abspath(path).encode()).hexdigest()[:10]
+
+
+def get_content_address(file_path: str) -> str:
+    """
+    Returns a path (relative to the output folder) to keep a file under
+    its content hash, so equal files are kept once.
+
+    For instance: assets/attachments/0123456789abcdef.png
+    """
+
+    file_hash = get_file_hash(file_path)[
+        : constants.DEDUPLICATED_ATTACHMENT_HASH_LENGTH
+    ]
+    extension = os.path.splitext(file_path)[1].lower()
+
+    return f"{constants.DEDUPLICATED_ATTACHMENTS_FOLDER_NAME}/{file_hash}{extension}"
+
+
+def read_json_file(file_path: str) -> dict[str, Any]:
+    """
+    Returns content of a JSON file with an object (a cache file, for instance);
+    an empty dictionary if the file is missing or damaged.
+    """
+
+    try:
+        with open(file_path, encoding=constants.ENCODING) as file:
+            result = json.load(file)
+
+    except (IOError, ValueError):
+        result = {}
+
+    return result if isinstance(result, dict) else {}
+
+
 def read_yaml_file(file_path: str) -> dict[str, str]:
     """
     Returns content of YAML files as a dictionary.
@@ -4,11 +4,13 @@
 Implementation of a simple web server intended to test building results.
 """
 
+import mimetypes
 import os
 from urllib.parse import urlparse
 
 import flask
 
+from bloget import output
 from bloget.readers import metadata_reader
 
 
@@ -28,6 +30,8 @@ def start(metadata: metadata_reader.BlogMetadata) -> None:
 
     app = flask.Flask(site_title)
 
+    backend = output.get_backend(output_folder)
+
     @app.route("/")
     @app.route("/<path:resource_path>")
     def resource(resource_path: str | None = None) -> tuple[flask.Response, int]:
@@ -40,6 +44,9 @@ def start(metadata: metadata_reader.BlogMetadata) -> None:
         if resource_path is None:
             resource_path = ""
 
+        if backend is not None:
+            return _get_backend_resource(backend[0], resource_path)
+
         resource_path = os.path.join(output_folder, resource_path)
 
         http_code = 200
@@ -56,8 +63,37 @@ def start(metadata: metadata_reader.BlogMetadata) -> None:
 
         return flask.send_file(resource_path), http_code
 
-    os.chdir(output_folder)
+    if backend is None:
+        os.chdir(output_folder)
 
     parse_result = urlparse(url)
 
     app.run(host=parse_result.hostname, port=parse_result.port)
+
+
+def _get_backend_resource(
+    backend: output.MemoryBackend, resource_path: str
+) -> tuple[flask.Response, int]:
+    """
+    Sends a file kept by an output backend back if it does exist.
+    """
+
+    resource_path = resource_path.strip("/")
+    http_code = 200
+
+    if resource_path not in backend.files:
+        resource_path = f"{resource_path}/index.html".lstrip("/")
+
+    if resource_path not in backend.files:
+        resource_path = "404.html"
+        http_code = 404
+
+    if resource_path not in backend.files:
+        flask.abort(404)
+
+    mimetype, _ = mimetypes.guess_type(resource_path)
+
+    return (
+        flask.Response(backend.read(resource_path), mimetype=mimetype),
+        http_code,
+    )
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+
+"""
+Implementation of HTTP caching configuration building functionality:
+a _headers file (Netlify-style) & an nginx snippet made of built files.
+"""
+
+import logging
+import os
+import re
+from collections.abc import Iterator
+
+from bloget import constants, utils
+from bloget.readers import metadata_reader
+
+# Content-addressed files never change, other assets change rarely, while pages
+# (along with their attachments), feeds & the search index have to be revalidated
+# on every visit.
+
+CACHE_CONTROL_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_CONTROL_ASSET = "public, max-age=31536000"
+CACHE_CONTROL_REVALIDATE = "public, max-age=0, must-revalidate"
+CACHE_CONTROL_DEFAULT = "public, max-age=3600"
+
+ASSETS_FOLDER_NAME = "assets"
+ASSET_FILE_EXTENSIONS = (
+    ".woff2",
+    ".woff",
+    ".ttf",
+    ".otf",
+    ".eot",
+    ".svg",
+    ".ico",
+    ".gif",
+    ".avif",
+) + constants.IMAGE_FILE_EXTENSIONS
+
+HEADERS_FILE_NAME = "_headers"
+HEADERS_ENCODING = "utf-8"
+
+# Hosts apply a limited number of rules (Cloudflare Pages: 100).
+HEADERS_RULE_LIMIT = 100
+
+_FINGERPRINTED_NAME_PATTERN = (
+    rf"\.[0-9a-f]{{{constants.FINGERPRINT_LENGTH}}}"
+    rf"(?:{'|'.join(map(re.escape, constants.FINGERPRINTED_FILE_EXTENSIONS))})"
+)
+_DEDUPLICATED_NAME_PATTERN = (
+    rf"{re.escape(constants.DEDUPLICATED_ATTACHMENTS_FOLDER_NAME)}/"
+    rf"[0-9a-f]{{{constants.DEDUPLICATED_ATTACHMENT_HASH_LENGTH}}}\.\w+"
+)
+
+
+def write_headers(
+    metadata: metadata_reader.BlogMetadata,
+    manifest: dict[str, str],
+    headers: bool,
+    nginx_config_path: str | None,
+) -> None:
+    """
+    Builds caching configuration from files in the output folder:
+    the _headers file (in the output folder) and/or an nginx snippet.
+
+    Must be called when all files are written, since rules are made of them.
+    """
+
+    logging.info("CACHE HEADERS BUILDING...")
+
+    output_path = metadata.paths["output"]
+
+    fingerprinted = set(manifest.values())
+
+    paths = sorted(
+        path for path in utils.get_files(output_path) if path != HEADERS_FILE_NAME
+    )
+
+    policies = {path: get_cache_control(path, fingerprinted) for path in paths}
+
+    # Both files are written without a byte order mark, which hosts
+    # would take for a part of the first rule.
+
+    if headers:
+        file_path = os.path.join(output_path, HEADERS_FILE_NAME)
+        file_text = "".join(_get_headers_file_text(policies))
+
+        utils.replace_file(file_path, file_text.encode(HEADERS_ENCODING))
+
+    if nginx_config_path:
+        file_text = "".join(_get_nginx_config_text(policies))
+
+        utils.make_folder(os.path.dirname(os.path.abspath(nginx_config_path)))
+        utils.replace_file(nginx_config_path, file_text.encode(HEADERS_ENCODING))
+
+    logging.info("CACHE HEADERS BUILDING DONE")
+
+
+def get_cache_control(path: str, fingerprinted: set[str]) -> str:
+    """
+    Returns a Cache-Control policy of an output file by its relative path.
+    """
+
+    extension = os.path.splitext(path)[1].lower()
+
+    if path in fingerprinted or re.fullmatch(_DEDUPLICATED_NAME_PATTERN, path):
+        return CACHE_CONTROL_IMMUTABLE
+
+    if path.startswith(f"{ASSETS_FOLDER_NAME}/"):
+        if extension in ASSET_FILE_EXTENSIONS:
+            return CACHE_CONTROL_ASSET
+
+        return CACHE_CONTROL_DEFAULT
+
+    return CACHE_CONTROL_REVALIDATE
+
+
+def _get_headers_file_text(policies: dict[str, str]) -> Iterator[str]:
+    """
+    Yields rules of the _headers file.
+
+    Hosts apply every rule which matches a URL, so rules never overlap:
+    a folder whose files share a policy gets a single wildcard rule,
+    other files get rules of their own. ETags are left to hosts,
+    which make them for every file.
+    """
+
+    used = set(policies.values())
+
+    if len(used) == 1:
+        rules = [("/*", used.pop())]
+    else:
+        rules = list(_get_rules(policies, ""))
+
+    if len(rules) > HEADERS_RULE_LIMIT:
+        logging.warning(
+            "The _headers file has %d rules, while some hosts apply only %d",
+            len(rules),
+            HEADERS_RULE_LIMIT,
+        )
+
+    for url, policy in rules:
+        yield f"{url}\n"
+        yield f"  Cache-Control: {policy}\n"
+
+
+def _get_rules(policies: dict[str, str], folder: str) -> Iterator[tuple[str, str]]:
+    """
+    Yields URLs & policies of files of a folder (with policies which differ)
+    & its subfolders.
+    """
+
+    prefix = f"{folder}/" if folder else ""
+    subfolders: dict[str, dict[str, str]] = {}
+
+    for path, policy in policies.items():
+        name, separator, _ = path[len(prefix) :].partition("/")
+
+        if separator:
+            subfolders.setdefault(f"{prefix}{name}", {})[path] = policy
+        else:
+            for url in _get_urls(path):
+                yield url, policy
+
+    for subfolder, subfolder_policies in sorted(subfolders.items()):
+        used = set(subfolder_policies.values())
+
+        if len(used) == 1:
+            yield f"/{subfolder}/*", used.pop()
+        else:
+            yield from _get_rules(subfolder_policies, subfolder)
+
+
+def _get_urls(path: str) -> list[str]:
+    """
+    Returns URLs a file is served by (a folder URL for index files).
+    """
+
+    if path == "index.html":
+        return ["/", "/index.html"]
+
+    if path.endswith("/index.html"):
+        return [f"/{path[: -len('index.html')]}", f"/{path}"]
+
+    return [f"/{path}"]
+
+
+def _get_nginx_config_text(policies: dict[str, str]) -> Iterator[str]:
+    """
+    Yields an nginx snippet (to include into a server block) with locations
+    for policies which built files need.
+
+    nginx makes strong ETags of its own (from sizes & modification times),
+    so they are only turned on here.
+    """
+
+    used = set(policies.values())
+
+    yield "# Cache policies of a blog built by Bloget.\n"
+    yield "# Include this file into the server block which serves the output folder.\n"
+    yield "\n"
+    yield "etag on;\n"
+
+    if CACHE_CONTROL_IMMUTABLE in used:
+        yield from _get_nginx_location(
+            "~",
+            rf"(?:{_FINGERPRINTED_NAME_PATTERN}|^/{_DEDUPLICATED_NAME_PATTERN})$",
+            CACHE_CONTROL_IMMUTABLE,
+        )
+
+    if CACHE_CONTROL_ASSET in used:
+        extensions = "|".join(extension[1:] for extension in ASSET_FILE_EXTENSIONS)
+
+        yield from _get_nginx_location(
+            "~*", rf"^/{ASSETS_FOLDER_NAME}/.+\.(?:{extensions})$", CACHE_CONTROL_ASSET
+        )
+
+    if CACHE_CONTROL_DEFAULT in used:
+        yield "\n"
+        yield f"location /{ASSETS_FOLDER_NAME}/ {{\n"
+        yield f'    add_header Cache-Control "{CACHE_CONTROL_DEFAULT}" always;\n'
+        yield "}\n"
+
+    yield "\n"
+    yield "location / {\n"
+    yield f'    add_header Cache-Control "{CACHE_CONTROL_REVALIDATE}" always;\n'
+    yield "}\n"
+
+
+def _get_nginx_location(modifier: str, pattern: str, policy: str) -> Iterator[str]:
+    """
+    Yields a location with a regular expression (quoted, since it may have braces).
+    """
+
+    yield "\n"
+    yield f'location {modifier} "{pattern}" {{\n'
+    yield f'    add_header Cache-Control "{policy}" always;\n'
+    yield "}\n"
@@ -0,0 +1,103 @@
+"""
+Implementation of responsive image derivatives building functionality.
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from bloget import images, metrics, utils
+from bloget.readers import metadata_reader, pages_reader
+
+
+def write_image_derivatives(
+    pages: pages_reader.BlogPages,
+    metadata: metadata_reader.BlogMetadata,
+    changed: set[str] | None = None,
+) -> None:
+    """
+    Makes resized & re-encoded variants of image attachments
+    (only of changed pages, if folder paths of them are given).
+
+    Derivatives are kept in a cache folder under the content hash of an original
+    image, so each image is processed only once.
+    """
+
+    logging.info("IMAGE DERIVATIVES BUILDING...")
+
+    cache_path = os.path.join(metadata.paths["cache"], "images")
+    utils.make_folder(cache_path)
+
+    jobs: dict[str, tuple[str, images.ImageDerivative]] = {}
+    copies: list[tuple[str, str]] = []
+
+    # Derivatives which are in the cache before any job is scheduled (copies
+    # of a derivative which a job of this build makes are not hits).
+
+    cached_count = 0
+
+    for page in pages.texts + pages.notes + pages.projects:
+        if changed is not None and page.folder_path not in changed:
+            continue
+
+        output_folder_path = os.path.join(metadata.paths["output"], page.path)
+
+        for attachment in filter(images.is_image, page.attachments):
+            source_file_path = os.path.join(page.folder_path, attachment)
+
+            for derivative in images.get_derivatives(source_file_path):
+                cache_file_path = os.path.join(cache_path, derivative.cache_file_name)
+                target_file_path = os.path.join(
+                    output_folder_path, derivative.file_name
+                )
+
+                if os.path.isfile(cache_file_path):
+                    cached_count += 1
+                else:
+                    jobs[cache_file_path] = (source_file_path, derivative)
+
+                copies.append((cache_file_path, target_file_path))
+
+    logging.info(
+        "%d image derivatives to make, %d taken from cache",
+        len(jobs),
+        cached_count,
+    )
+
+    metrics.add_cache_lookups("image_derivatives", cached_count, len(jobs))
+
+    _make_derivatives(jobs)
+
+    for cache_file_path, target_file_path in copies:
+        utils.copy_file(cache_file_path, target_file_path)
+
+    logging.info("IMAGE DERIVATIVES BUILDING DONE")
+
+
+def _make_derivatives(jobs: dict[str, tuple[str, images.ImageDerivative]]) -> None:
+    """
+    Makes derivatives in a pool of worker processes.
+    """
+
+    if not jobs:
+        return
+
+    with ProcessPoolExecutor() as executor:
+        futures = {
+            executor.submit(
+                images.make_derivative,
+                source_file_path,
+                cache_file_path,
+                derivative.width,
+                derivative.image_format,
+            ): source_file_path
+            for cache_file_path, (source_file_path, derivative) in jobs.items()
+        }
+
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except (IOError, ValueError) as error:
+                utils.raise_error(
+                    f'Unable to make a derivative of "{futures[future]}": {error}'
+                )
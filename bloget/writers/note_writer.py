@@ -7,28 +7,39 @@ Implementation of note pages building functionality.
 import logging
 import os
 import typing
+from collections.abc import Iterator
 
-from bloget import constants, utils
+from bloget import constants, fragments, utils
 from bloget.readers import metadata_reader, page_reader, pages_reader
 from bloget.writers.utils import page_writing_utils
 
 
 def write_notes(
-    pages: pages_reader.BlogPages, metadata: metadata_reader.BlogMetadata
+    pages: pages_reader.BlogPages,
+    metadata: metadata_reader.BlogMetadata,
+    changed: set[str] | None = None,
 ) -> None:
     """
     Builds given note pages.
+
+    If folder paths of changed pages are given, only changed notes & their
+    neighbours (which link to them) are built.
     """
 
     logging.info("NOTES BUILDING...")
 
-    notes = page_writing_utils.get_notes(pages.notes)
+    for note in pages.index.notes:
+        previous_note, next_note = pages.index.get_neighbours(note)
+
+        if changed is not None and not any(
+            n is not None and n.folder_path in changed
+            for n in (note, previous_note, next_note)
+        ):
+            continue
 
-    for index, note in enumerate(notes):
-        next_note = None if index == 0 else notes[index - 1]
-        previous_note = None if index == len(notes) - 1 else notes[index + 1]
+        related_notes = pages.related.get(note.folder_path, [])
 
-        _write_note(note, previous_note, next_note, metadata)
+        _write_note(note, previous_note, next_note, related_notes, metadata)
 
     logging.info("NOTES BUILDING DONE")
 
@@ -37,6 +48,7 @@ def _write_note(
     note: page_reader.BlogPage,
     previous_note: page_reader.BlogPage | None,
     next_note: page_reader.BlogPage | None,
+    related_notes: list[page_reader.BlogPage],
     metadata: metadata_reader.BlogMetadata,
 ) -> None:
     """
@@ -47,36 +59,38 @@ def _write_note(
 
     folder_path = _get_output_folder_path(note, metadata)
 
-    file_text = _get_file_text(note, previous_note, next_note, metadata)
+    file_text = _get_file_text(note, previous_note, next_note, related_notes, metadata)
     file_path = os.path.join(folder_path, "index.html")
 
     utils.make_folder(folder_path)
     utils.make_file(file_path, file_text)
 
-    page_writing_utils.copy_page_attachments(note, folder_path)
+    page_writing_utils.copy_page_attachments(note, folder_path, metadata)
 
 
 def _get_file_text(
     note: page_reader.BlogPage,
     previous_note: page_reader.BlogPage | None,
     next_note: page_reader.BlogPage | None,
+    related_notes: list[page_reader.BlogPage],
     metadata: metadata_reader.BlogMetadata,
-) -> str:
+) -> Iterator[str]:
     """
     Returns template parameters for the note.jinja file.
     """
 
     template_parameters = _get_template_parameters(
-        note, previous_note, next_note, metadata
+        note, previous_note, next_note, related_notes, metadata
     )
 
-    return metadata.templates.get_template("note.jinja").render(template_parameters)
+    return utils.render_template(metadata.templates, "note.jinja", template_parameters)
 
 
 def _get_template_parameters(
     note: page_reader.BlogPage,
     previous_note: page_reader.BlogPage | None,
     next_note: page_reader.BlogPage | None,
+    related_notes: list[page_reader.BlogPage],
     metadata: metadata_reader.BlogMetadata,
 ) -> dict[str, typing.Any]:
     result = page_writing_utils.get_html_template_parameters(
@@ -107,7 +121,12 @@ def _get_template_parameters(
         result["next_note_path"] = ""
         result["next_note_title"] = ""
 
+    result["related_notes"] = [
+        {"path": _get_note_page_path(n), "title": n.title} for n in related_notes
+    ]
+
     result["note"] = note
+    result["note_fragment"] = fragments.get_note_fragment(note, metadata)
     result["tags"] = metadata.tags
 
     return result
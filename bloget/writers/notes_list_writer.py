@@ -7,8 +7,9 @@ Implementation of note pages building functionality.
 import logging
 import os
 import typing
+from collections.abc import Iterator
 
-from bloget import constants, utils
+from bloget import constants, fragments, utils
 from bloget.readers import metadata_reader, page_reader, pages_reader
 from bloget.writers.utils import page_writing_utils
 
@@ -22,12 +23,12 @@ def write_note_lists(
 
     logging.info("NOTE LISTS BUILIDNG...")
 
-    notes = page_writing_utils.get_notes(pages.notes)
+    notes = pages.index.notes
     notes_left = len(notes)
 
     list_number = 1
     list_notes = []
-    list_size = 20
+    list_size = constants.NOTES_LIST_SIZE
 
     page_count = (len(notes) + list_size - 1) // list_size
 
@@ -103,7 +104,7 @@ def _get_notes_list_file_text(
     list_is_last: bool,
     page_count: int,
     metadata: metadata_reader.BlogMetadata,
-) -> str:
+) -> Iterator[str]:
     """
     Returns template parameters for the note.jinja file.
     """
@@ -112,8 +113,8 @@ def _get_notes_list_file_text(
         list_notes, list_number, list_is_last, page_count, metadata
     )
 
-    return metadata.templates.get_template("notes_list.jinja").render(
-        template_parameters
+    return utils.render_template(
+        metadata.templates, "notes_list.jinja", template_parameters
     )
 
 
@@ -163,6 +164,10 @@ def _get_note_list_template_parameters(
     result["page_notes"] = len(list_notes)
     result["page_count"] = page_count
     result["notes"] = list_notes
+    result["note_fragments"] = [
+        fragments.get_note_fragment(note, metadata, True, index > 0)
+        for index, note in enumerate(list_notes)
+    ]
     result["tags"] = metadata.tags
     result["notes_folder"] = constants.NOTES_FOLDER_NAME
 
@@ -9,13 +9,12 @@ from __future__ import annotations
 import json
 import logging
 import os
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 
 from bs4 import BeautifulSoup
 
-from bloget import utils
+from bloget import fragments, utils
 from bloget.readers import metadata_reader, page_reader, pages_reader
-from bloget.writers.utils import page_writing_utils
 
 
 def _html_to_search_text(html: str) -> str:
@@ -42,20 +41,40 @@ def _html_to_search_text(html: str) -> str:
     return text.lower()
 
 
-def _build_notes_payload(
-    items: Iterable[tuple[page_reader.BlogPage, str]],
-) -> list[dict[str, object]]:
+def _build_note_payload(note: page_reader.BlogPage, html: str) -> dict[str, object]:
     """
-    Makes a searchable payload for each note HTML.
+    Makes a searchable payload for a note HTML.
     """
-    return [
-        {
-            "html": html,
-            "text": _html_to_search_text(html),
-            "tags": note.metadata.tags,  # list[str]
-        }
-        for note, html in items
-    ]
+    return {
+        "html": html,
+        "text": _html_to_search_text(html),
+        "tags": note.metadata.tags,  # list[str]
+    }
+
+
+def _iter_notes_payload_json(
+    notes: Iterable[page_reader.BlogPage], metadata: metadata_reader.BlogMetadata
+) -> Iterator[str]:
+    """
+    Yields the JSON array of note payloads chunk by chunk.
+
+    Notes are rendered and encoded one at a time, so the whole index never
+    exists as a single string.
+    """
+
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    yield "["
+
+    for index, note in enumerate(notes):
+        if index:
+            yield ","
+
+        payload = _build_note_payload(note, _get_html(note, metadata))
+
+        yield from encoder.iterencode(payload)
+
+    yield "]"
 
 
 def write_notes_search_index(
@@ -66,12 +85,9 @@ def write_notes_search_index(
     """
     logging.info("NOTES SEARCH INDEX BUILDING...")
 
-    notes = page_writing_utils.get_notes(pages.notes)
-
-    rendered = [(note, _get_html(note, metadata)) for note in notes]
-    payload = _build_notes_payload(rendered)
+    notes = pages.index.notes
 
-    file_text = json.dumps(payload, ensure_ascii=False, indent=2)
+    file_text = _iter_notes_payload_json(notes, metadata)
     file_path = os.path.join(metadata.paths["output"], "notes.json")
     utils.make_file(file_path, file_text)
 
@@ -82,11 +98,7 @@ def _get_html(
     page: page_reader.BlogPage, metadata: metadata_reader.BlogMetadata
 ) -> str:
     """
-    Returns rendered note.
+    Returns rendered note (the same fragment which note lists show).
     """
 
-    template = metadata.templates.get_template("macros.jinja")
-
-    return template.module.note(
-        page, metadata.tags, metadata.settings, metadata.language, True
-    )
+    return fragments.get_note_fragment(page, metadata, True, True)
@@ -4,6 +4,7 @@ Implementation of page 404 building functionality.
 
 import logging
 import os
+from collections.abc import Iterator
 
 from bloget import utils
 from bloget.readers import metadata_reader
@@ -25,7 +26,7 @@ def write_page_404(metadata: metadata_reader.BlogMetadata) -> None:
     logging.info("PAGE 404 BUILDING DONE")
 
 
-def _get_file_text(metadata: metadata_reader.BlogMetadata) -> str:
+def _get_file_text(metadata: metadata_reader.BlogMetadata) -> Iterator[str]:
     """
     Returns content of the page 404 file.
     """
@@ -38,4 +39,4 @@ def _get_file_text(metadata: metadata_reader.BlogMetadata) -> str:
         page_is_editable=False,
     )
 
-    return metadata.templates.get_template("404.jinja").render(template_parameters)
+    return utils.render_template(metadata.templates, "404.jinja", template_parameters)
@@ -3,22 +3,27 @@ Implementation of project pages building functionality.
 """
 
 import logging
+from collections.abc import Iterator
 
+from bloget import utils
 from bloget.readers import metadata_reader, page_reader, pages_reader
 from bloget.writers.utils import page_writing_utils
 
 
 def write_projects(
-    pages: pages_reader.BlogPages, metadata: metadata_reader.BlogMetadata
+    pages: pages_reader.BlogPages,
+    metadata: metadata_reader.BlogMetadata,
+    changed: set[str] | None = None,
 ) -> None:
     """
-    Builds given project pages.
+    Builds given project pages (only changed ones, if folder paths of them are given).
     """
 
     logging.info("PROJECTS BUILDING...")
 
     for project in pages.projects:
-        _write_project(project, metadata)
+        if changed is None or project.folder_path in changed:
+            _write_project(project, metadata)
 
     logging.info("PROJECTS BUILDING DONE")
 
@@ -39,7 +44,7 @@ def _write_project(
 
 def _get_project_file_content(
     page: page_reader.BlogPage, metadata: metadata_reader.BlogMetadata
-) -> str:
+) -> Iterator[str]:
     """
     Returns template for the text.jinja file.
     """
@@ -49,4 +54,6 @@ def _get_project_file_content(
     )
     template_parameters["page_stacks"] = page.metadata.stacks
 
-    return metadata.templates.get_template("project.jinja").render(template_parameters)
+    return utils.render_template(
+        metadata.templates, "project.jinja", template_parameters
+    )
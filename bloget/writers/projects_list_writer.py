@@ -7,6 +7,7 @@ Implementation of projects list page building functionality.
 import logging
 import os
 import typing
+from collections.abc import Iterator
 
 from bloget import constants, utils
 from bloget.readers import metadata_reader, page_reader, pages_reader
@@ -14,7 +15,9 @@ from bloget.writers.utils import page_writing_utils
 
 
 def write_projects_list(
-    pages: pages_reader.BlogPages, metadata: metadata_reader.BlogMetadata
+    pages: pages_reader.BlogPages,
+    metadata: metadata_reader.BlogMetadata,
+    changed: set[str] | None = None,
 ) -> None:
     """
     Builds projects list page.
@@ -26,7 +29,7 @@ def write_projects_list(
 
     folder_path = os.path.join(metadata.paths["output"], constants.PROJECTS_FOLDER_NAME)
 
-    projects = sorted(pages.projects, key=lambda project: project.created, reverse=True)
+    projects = pages.index.projects
 
     file_path = os.path.join(folder_path, "index.html")
     file_text = _file_text(projects, metadata)
@@ -35,25 +38,28 @@ def write_projects_list(
     utils.make_file(file_path, file_text)
 
     for project in projects:
+        if changed is not None and project.folder_path not in changed:
+            continue
+
         project_folder_path = os.path.join(folder_path, project.folder_name)
         utils.make_folder(project_folder_path)
 
-        page_writing_utils.copy_page_attachments(project, project_folder_path)
+        page_writing_utils.copy_page_attachments(project, project_folder_path, metadata)
 
     logging.info("PROJECT LIST BUILDING DONE")
 
 
 def _file_text(
     projects: list[page_reader.BlogPage], metadata: metadata_reader.BlogMetadata
-) -> str:
+) -> Iterator[str]:
     """
     Returns HTML of the page.
     """
 
     template_parameters = _get_template_parameters(projects, metadata)
 
-    return metadata.templates.get_template("projects_list.jinja").render(
-        template_parameters
+    return utils.render_template(
+        metadata.templates, "projects_list.jinja", template_parameters
     )
 
 
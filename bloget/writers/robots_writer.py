@@ -4,6 +4,7 @@ Implementation of robots.txt building functionality.
 
 import logging
 import os
+from collections.abc import Iterator
 
 from bloget import utils
 from bloget.readers import metadata_reader
@@ -24,11 +25,13 @@ def write_robots(metadata: metadata_reader.BlogMetadata) -> None:
     logging.info("ROBOTS.TXT BUILDING DONE")
 
 
-def _get_file_text(metadata: metadata_reader.BlogMetadata) -> str:
+def _get_file_text(metadata: metadata_reader.BlogMetadata) -> Iterator[str]:
     """
     Returns content of the robots.txt file.
     """
 
     template_parameters = {"settings": metadata.settings}
 
-    return metadata.templates.get_template("robots.jinja").render(template_parameters)
+    return utils.render_template(
+        metadata.templates, "robots.jinja", template_parameters
+    )
@@ -5,6 +5,7 @@ Implementation of RSS feed building functionality.
 import html
 import logging
 import os
+from collections.abc import Iterator
 
 from bloget import utils
 from bloget.readers import metadata_reader, pages_reader
@@ -30,7 +31,7 @@ def write_rss_feed(
 
 def _get_file_text(
     pages: pages_reader.BlogPages, metadata: metadata_reader.BlogMetadata
-) -> str:
+) -> Iterator[str]:
     """
     Returns content of the rss file.
     """
@@ -41,7 +42,9 @@ def _get_file_text(
         "items": _get_rss_items(pages, metadata),
     }
 
-    return metadata.templates.get_template("rss_feed.jinja").render(template_parameters)
+    return utils.render_template(
+        metadata.templates, "rss_feed.jinja", template_parameters
+    )
 
 
 def _get_rss_items(
@@ -49,9 +52,7 @@ def _get_rss_items(
 ) -> list[dict[str, str]]:
     items: list[dict[str, str]] = []
 
-    notes = sorted(pages.notes, key=lambda x: x.created, reverse=True)
-
-    for note in notes:
+    for note in pages.index.notes:
         in_feed = True if note.options is None else "no-rss" not in note.options
 
         if in_feed:
@@ -5,6 +5,7 @@ Implementation of sitemap.xml building functionality.
 import logging
 import os
 import typing
+from collections.abc import Iterator
 
 from bloget import utils
 from bloget.readers import metadata_reader, page_reader, pages_reader
@@ -29,14 +30,16 @@ def write_sitemap(
 
 def _get_file_text(
     pages: pages_reader.BlogPages, metadata: metadata_reader.BlogMetadata
-) -> str:
+) -> Iterator[str]:
     """
     Returns content of the sitemap file.
     """
 
     template_parameters = _get_template_parameters(pages, metadata)
 
-    return metadata.templates.get_template("sitemap.jinja").render(template_parameters)
+    return utils.render_template(
+        metadata.templates, "sitemap.jinja", template_parameters
+    )
 
 
 def _get_template_parameters(
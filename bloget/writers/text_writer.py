@@ -3,22 +3,27 @@ Implementation of text pages building functionality.
 """
 
 import logging
+from collections.abc import Iterator
 
+from bloget import utils
 from bloget.readers import metadata_reader, page_reader, pages_reader
 from bloget.writers.utils import page_writing_utils
 
 
 def write_texts(
-    pages: pages_reader.BlogPages, metadata: metadata_reader.BlogMetadata
+    pages: pages_reader.BlogPages,
+    metadata: metadata_reader.BlogMetadata,
+    changed: set[str] | None = None,
 ) -> None:
     """
-    Builds given text pages.
+    Builds given text pages (only changed ones, if folder paths of them are given).
     """
 
     logging.info("TEXTS BUILDING...")
 
     for text in pages.texts:
-        _write_text(text, metadata)
+        if changed is None or text.folder_path in changed:
+            _write_text(text, metadata)
 
     logging.info("TEXTS BUILDING DONE")
 
@@ -39,7 +44,7 @@ def _write_text(
 
 def _get_text_file_content(
     page: page_reader.BlogPage, metadata: metadata_reader.BlogMetadata
-) -> str:
+) -> Iterator[str]:
     """
     Returns template parameters for the text.jinja file.
     """
@@ -49,4 +54,4 @@ def _get_text_file_content(
     )
     template_parameters["tags"] = page.tags
 
-    return metadata.templates.get_template("text.jinja").render(template_parameters)
+    return utils.render_template(metadata.templates, "text.jinja", template_parameters)
@@ -7,23 +7,35 @@ Common methods which are applicable to both types of pages (texts & notes).
 import logging
 import os
 import typing
+from collections.abc import Iterable
 
-from bloget import utils
+from bloget import constants, metrics, utils
 from bloget.readers import metadata_reader, page_reader
 
 
-def get_notes(notes: list[page_reader.BlogPage]) -> list[page_reader.BlogPage]:
-    """
-    Filters notes list, then sorts it.
+def copy_page_attachments(
+    page: page_reader.BlogPage,
+    output_folder_path: str,
+    metadata: metadata_reader.BlogMetadata,
+) -> None:
     """
+    Copies page's attachments to the page build folder.
 
-    return sorted(notes, key=lambda note: note.created, reverse=True)
+    If attachments are deduplicated, they are copied under their content hashes
+    to a common folder, so a file used by several pages is stored once; the page
+    folder gets hard links to them, since templates (project covers, for instance)
+    & raw HTML refer to attachments there.
+    """
 
+    deduplicate = metadata.settings.get("deduplicate_attachments")
 
-def copy_page_attachments(page: page_reader.BlogPage, output_folder_path: str) -> None:
-    """
-    Copies page's attachments to the page build folder.
-    """
+    if deduplicate:
+        utils.make_folder(
+            os.path.join(
+                metadata.paths["output"],
+                *constants.DEDUPLICATED_ATTACHMENTS_FOLDER_NAME.split("/"),
+            )
+        )
 
     if page.attachments:
         for attachment in page.attachments:
@@ -32,11 +44,30 @@ def copy_page_attachments(page: page_reader.BlogPage, output_folder_path: str) -
             source_file_path = os.path.join(page.folder_path, attachment)
             target_file_path = os.path.join(output_folder_path, attachment)
 
+            if deduplicate:
+                content_address = utils.get_content_address(source_file_path)
+                stored_file_path = os.path.join(
+                    metadata.paths["output"], *content_address.split("/")
+                )
+
+                if os.path.exists(stored_file_path):
+                    metrics.add_bytes("skipped", os.path.getsize(source_file_path))
+                else:
+                    utils.copy_file(source_file_path, stored_file_path)
+
+                # The stored file is only on a disk with the filesystem backend.
+
+                if os.path.isfile(stored_file_path):
+                    source_file_path = stored_file_path
+
+                utils.copy_file(source_file_path, target_file_path, link=True)
+                continue
+
             utils.copy_file(source_file_path, target_file_path)
 
 
 def make_index_file(
-    file_context: str,
+    file_context: str | Iterable[str],
     page: page_reader.BlogPage,
     metadata: metadata_reader.BlogMetadata,
 ) -> None:
@@ -51,7 +82,7 @@ def make_index_file(
 
     utils.make_file(file_path, file_context)
 
-    copy_page_attachments(page, page_folder_path)
+    copy_page_attachments(page, page_folder_path, metadata)
 
 
 def html_template_parameters_for_page(
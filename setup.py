@@ -29,6 +29,11 @@ setuptools.setup(
         "Markdown~=3.4.1",
         "PyYAML~=6.0",
     ],
+    extras_require={
+        "images": ["Pillow>=11.3.0"],
+        "related": ["numpy>=1.26"],
+        "engines": ["markdown-it-py>=3.0", "mistune>=3.0", "cmarkgfm>=2024.1"],
+    },
     entry_points={"console_scripts": ["bloget=bloget.app:main"]},
     author="Vlad Kostyanetsky",
     author_email="vlad@kostyanetsky.me",
@@ -0,0 +1,60 @@
+"""
+Tests of bloget, along with factories of their fixtures.
+"""
+
+import os
+from types import SimpleNamespace
+
+
+def make_metadata(root_path, settings: dict | None = None, **paths) -> SimpleNamespace:
+    """
+    Returns blog metadata with the given settings; its paths are folders
+    (named as paths) in the root folder, along with given paths.
+    """
+
+    default_paths = {
+        name: os.path.join(str(root_path), name)
+        for name in ("pages", "public", "output", "cache")
+    }
+
+    return SimpleNamespace(
+        settings=settings or {},
+        paths={**default_paths, **paths},
+    )
+
+
+def make_page(folder_path, files: dict[str, str | bytes] | None = None, **fields):
+    """
+    Writes files of a page folder & returns the page with the given fields;
+    the files (except index files) are its attachments.
+    """
+
+    os.makedirs(folder_path, exist_ok=True)
+
+    for file_name, content in (files or {}).items():
+        write_file(os.path.join(folder_path, file_name), content)
+
+    attachments = [
+        file_name for file_name in files or {} if not file_name.startswith("index.")
+    ]
+
+    return SimpleNamespace(
+        folder_path=str(folder_path),
+        attachments=attachments,
+        **fields,
+    )
+
+
+def write_file(file_path, content: str | bytes) -> None:
+    """
+    Writes a text or binary file, creating its folder.
+    """
+
+    os.makedirs(os.path.dirname(str(file_path)), exist_ok=True)
+
+    if isinstance(content, bytes):
+        with open(file_path, "wb") as file:
+            file.write(content)
+    else:
+        with open(file_path, "w", encoding="utf-8") as file:
+            file.write(content)
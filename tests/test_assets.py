@@ -0,0 +1,74 @@
+"""
+Tests of fingerprinting public assets.
+"""
+
+import hashlib
+import json
+import os
+from types import SimpleNamespace
+
+from bloget import assets, constants
+from tests import make_metadata, write_file
+
+SCRIPT = """
+// Toggles the menu.
+function toggle(menu) {
+    menu.hidden = !menu.hidden;
+}
+"""
+
+
+def test_fingerprints_of_minified_assets(tmp_path):
+    """
+    Fingerprints of minified files are hashes of their minified content.
+    """
+
+    write_file(tmp_path / "public" / "assets" / "js" / "menu.js", SCRIPT)
+    os.makedirs(tmp_path / "output")
+
+    metadata = make_metadata(tmp_path)
+    manifest = assets.get_manifest(metadata, minify=True)
+
+    assets.write_fingerprinted_assets(metadata, manifest, minify=True)
+
+    fingerprinted_path = manifest["assets/js/menu.js"]
+    data = (tmp_path / "output" / fingerprinted_path).read_bytes()
+    file_hash = hashlib.sha256(data).hexdigest()[:10]
+
+    assert fingerprinted_path == f"assets/js/menu.{file_hash}.js"
+    assert len(data) < len(SCRIPT)
+
+
+def test_fingerprinted_assets(tmp_path):
+    """
+    CSS & JS files get fingerprinted copies & manifest entries; templates
+    resolve their paths through the manifest.
+    """
+
+    write_file(tmp_path / "public" / "assets" / "css" / "site.css", "body{}")
+    write_file(tmp_path / "public" / "assets" / "images" / "logo.png", b"logo")
+    os.makedirs(tmp_path / "output")
+
+    metadata = make_metadata(tmp_path)
+    metadata.templates = SimpleNamespace(globals={})
+
+    manifest = assets.get_manifest(metadata)
+    file_hash = hashlib.sha256(b"body{}").hexdigest()[:10]
+
+    assert manifest == {"assets/css/site.css": f"assets/css/site.{file_hash}.css"}
+
+    assets.set_asset_path_function(metadata, manifest)
+    asset_path = metadata.templates.globals["asset_path"]
+
+    assert asset_path("/assets/css/site.css") == f"assets/css/site.{file_hash}.css"
+    assert asset_path("/assets/images/logo.png") == "assets/images/logo.png"
+
+    assets.write_fingerprinted_assets(metadata, manifest)
+
+    output_path = tmp_path / "output"
+    manifest_text = (output_path / constants.ASSET_MANIFEST_FILE_NAME).read_text(
+        encoding=constants.ENCODING
+    )
+
+    assert (output_path / manifest["assets/css/site.css"]).read_bytes() == b"body{}"
+    assert json.loads(manifest_text) == manifest
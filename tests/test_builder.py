@@ -0,0 +1,88 @@
+"""
+Tests of building several sites at once.
+"""
+
+import argparse
+import os
+
+import pytest
+
+from bloget import builder
+from tests import write_file
+
+SITES = """
+- pages: ru
+  url: https://example.ru
+  output: out/ru
+- pages: en
+  metadata: en-metadata
+  url: https://example.com
+  output: out/en
+"""
+
+
+def _get_arguments(sites_path):
+    return argparse.Namespace(
+        sites=str(sites_path),
+        pages=None,
+        metadata=None,
+        output=None,
+        url=None,
+        templates="templates",
+        webserver=True,
+        link_public=False,
+        metrics=str(sites_path.parent / "metrics" / "bloget.prom"),
+    )
+
+
+def test_get_site_arguments(tmp_path):
+    """
+    Paths of a site are relative to the --sites file, its metadata is in its pages
+    by default, and each site writes metrics of its own.
+    """
+
+    sites_path = tmp_path / "sites.yaml"
+    write_file(sites_path, SITES)
+
+    arguments = _get_arguments(sites_path)
+
+    # pylint: disable=protected-access
+
+    ru, en = (
+        builder._get_site_arguments(arguments, site)
+        for site in builder._get_sites(arguments)
+    )
+
+    assert ru.pages == os.path.join(tmp_path, "ru")
+    assert ru.metadata == os.path.join(tmp_path, "ru", ".metadata")
+    assert ru.output == os.path.join(tmp_path, "out", "ru")
+    assert ru.url == "https://example.ru"
+    assert en.metadata == os.path.join(tmp_path, "en-metadata")
+
+    assert ru.templates == en.templates == "templates"
+    assert ru.link_public and not ru.webserver and ru.sites is None
+
+    assert ru.metrics != en.metrics
+    assert os.path.dirname(ru.metrics) == os.path.dirname(arguments.metrics)
+
+
+@pytest.mark.parametrize(
+    "sites",
+    [
+        "[]",
+        "- pages: ru\n",
+        "- pages: ru\n  output: out/ru\n  theme: dark\n",
+    ],
+)
+def test_get_sites_errors(tmp_path, sites):
+    """
+    A sites file must list sites with output folders & known keys only.
+    """
+
+    sites_path = tmp_path / "sites.yaml"
+    write_file(sites_path, sites)
+
+    with pytest.raises(SystemExit):
+        builder._get_sites(  # pylint: disable=protected-access
+            _get_arguments(sites_path)
+        )
@@ -0,0 +1,69 @@
+"""
+Tests of resolving & checking links of the link checker.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from bloget import checker
+from bloget.readers import pages_reader
+from tests import make_metadata, write_file
+
+URL = "https://example.org"
+
+
+@pytest.mark.parametrize(
+    "link, expected",
+    [
+        ("/notes/n05/../n01", "notes/n01"),
+        (f"{URL}/notes/n05/../n01/", "notes/n01"),
+        ("../n01", "notes/n01"),
+        ("cover.png", "notes/n05/cover.png"),
+        (URL, ""),
+        ("/", ""),
+        ("../../../secret", "../secret"),
+        ("#top", None),
+        ("mailto:me@example.org", None),
+        ("https://example.com/notes", None),
+        ("//cdn.example.org/site.css", None),
+    ],
+)
+def test_get_output_path(link, expected):
+    """
+    Links are resolved against the page folder & normalized.
+    """
+
+    # pylint: disable-next=protected-access
+    assert checker._get_output_path(link, URL, "notes/n05") == expected
+
+
+def test_check_links(tmp_path):
+    """
+    Links to pages are found in the index of pages, other links among output files;
+    a link to a missing file is broken.
+    """
+
+    write_file(tmp_path / "output" / "notes" / "n01" / "cover.png", b"cover")
+
+    note = SimpleNamespace(
+        path="notes/n01",
+        folder_path=str(tmp_path / "pages" / "notes" / "n01"),
+        text='<a href="/notes/n02/">Next</a> <img src="cover.png">',
+    )
+    text = SimpleNamespace(
+        path="notes/n02",
+        folder_path=str(tmp_path / "pages" / "notes" / "n02"),
+        text=f'<a href="{URL}/notes/n01">Previous</a> <img src="missing.png">',
+    )
+    index = pages_reader.get_index([note, text], [], [])
+    pages = pages_reader.BlogPages([note, text], [], [], index)
+
+    metadata = make_metadata(tmp_path, {"url": URL})
+
+    with pytest.raises(SystemExit):
+        checker.check_links(pages, metadata)
+
+    text.text = text.text.replace("missing.png", "/notes/n01/cover.png")
+
+    checker.check_links(pages, metadata)
@@ -0,0 +1,87 @@
+"""
+Tests of pruning the site stylesheet & inlining critical CSS.
+"""
+
+import os
+from types import SimpleNamespace
+
+from bloget import critical_css
+from tests import make_metadata, write_file
+
+STYLESHEET = (
+    ".page{color:red}.card{margin:0}.safe{padding:0}.unused{display:none}"
+    "@media (min-width:1px){.unused{color:blue}}"
+)
+
+PAGE = """<!doctype html>
+<html>
+  <head>
+    <link rel="stylesheet" href="/assets/css/site.0123456789.css">
+  </head>
+  <body>
+    <div class="page"></div>
+    <script>
+      cards.innerHTML = `<article class="card ${wide ? "wide" : ""}"></article>`;
+    </script>
+  </body>
+</html>
+"""
+
+
+def _make_site(tmp_path):
+    write_file(tmp_path / "public" / "assets" / "css" / "site.css", STYLESHEET)
+    write_file(
+        tmp_path / "output" / "assets" / "css" / "site.0123456789.css", STYLESHEET
+    )
+    write_file(tmp_path / "output" / "index.html", PAGE)
+
+    pages = SimpleNamespace(notes=[], projects=[], texts=[])
+    metadata = make_metadata(tmp_path, {"critical_css_safelist": ["safe"]})
+    manifest = {critical_css.STYLESHEET_PATH: "assets/css/site.0123456789.css"}
+
+    return pages, metadata, manifest
+
+
+def test_inline_critical_css(tmp_path):
+    """
+    Classes of elements, of scripts & of the safelist are kept; the pruned
+    stylesheet replaces the complete fingerprinted one.
+    """
+
+    pages, metadata, manifest = _make_site(tmp_path)
+
+    critical_css.inline_critical_css(pages, metadata, manifest)
+
+    stylesheet_path = manifest[critical_css.STYLESHEET_PATH]
+    css_folder_path = tmp_path / "output" / "assets" / "css"
+
+    assert stylesheet_path != "assets/css/site.0123456789.css"
+    assert os.listdir(css_folder_path) == [os.path.basename(stylesheet_path)]
+
+    stylesheet = (tmp_path / "output" / stylesheet_path).read_text()
+
+    assert ".page{" in stylesheet
+    assert ".card{" in stylesheet
+    assert ".safe{" in stylesheet
+    assert ".unused" not in stylesheet
+
+    page = (tmp_path / "output" / "index.html").read_text(encoding="utf-8-sig")
+
+    assert '<style data-critical-css="text">' in page
+    assert f'<link rel="preload" as="style" href="/{stylesheet_path}"' in page
+
+
+def test_inline_critical_css_again(tmp_path):
+    """
+    A second run (an incremental build) gives the same pages.
+    """
+
+    pages, metadata, manifest = _make_site(tmp_path)
+
+    critical_css.inline_critical_css(pages, metadata, manifest)
+    first = (tmp_path / "output" / "index.html").read_bytes()
+
+    critical_css.inline_critical_css(pages, metadata, manifest)
+    second = (tmp_path / "output" / "index.html").read_bytes()
+
+    assert first == second
@@ -0,0 +1,100 @@
+"""
+Tests of the build daemon & its client.
+"""
+
+import os
+import socket
+import socketserver
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from bloget import client, daemon
+from bloget.readers import pages_reader
+from tests import make_metadata, write_file
+
+
+def test_get_page_folder_path(tmp_path):
+    """
+    Paths of files in page folders (subfolders included) are resolved to the pages;
+    a new page folder is returned as it is.
+    """
+
+    metadata = make_metadata(tmp_path)
+    pages_path = metadata.paths["pages"]
+
+    root = SimpleNamespace(path="", folder_path=pages_path)
+    note = SimpleNamespace(
+        path="notes/n01", folder_path=os.path.join(pages_path, "notes", "n01")
+    )
+    index = pages_reader.get_index([root, note], [], [])
+    pages = pages_reader.BlogPages([root, note], [], [], index)
+
+    image_path = os.path.join(note.folder_path, "images", "cover.png")
+    write_file(image_path, b"cover")
+
+    new_folder_path = os.path.join(pages_path, "notes", "n02")
+
+    # pylint: disable=protected-access
+
+    assert daemon._get_page_folder_path(image_path, metadata, pages) == (
+        note.folder_path
+    )
+    assert daemon._get_page_folder_path(pages_path, metadata, pages) == pages_path
+    assert daemon._get_page_folder_path(new_folder_path, metadata, pages) == (
+        new_folder_path
+    )
+
+
+def _handle_requests(server, count):
+    for _ in range(count):
+        server.handle_request()
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="no Unix sockets")
+def test_daemon_requests(tmp_path):
+    """
+    The client & the daemon exchange JSON lines over a Unix socket;
+    a stop request ends the serving loop.
+    """
+
+    state = daemon.DaemonState(SimpleNamespace())
+    socket_path = str(tmp_path / "daemon.sock")
+
+    # pylint: disable=protected-access
+
+    handler = daemon._get_request_handler(state)
+
+    with socketserver.UnixStreamServer(socket_path, handler) as server:
+        thread = threading.Thread(target=_handle_requests, args=(server, 3))
+        thread.start()
+
+        status = client._get_response(socket_path, {"command": "status"})
+        unknown = client._get_response(socket_path, {"command": "publish"})
+        stopped = client._get_response(socket_path, {"command": "stop"})
+
+        thread.join()
+
+    assert status["ok"] and status["cached_pages"] == 0
+    assert unknown == {"ok": False, "error": "Unknown command: publish"}
+    assert stopped == {"ok": True}
+    assert not state.running
+
+
+def test_get_socket_path(tmp_path, monkeypatch):
+    """
+    The default socket is named by the working directory.
+    """
+
+    arguments = SimpleNamespace(socket=None, cache=str(tmp_path / "cache"))
+
+    monkeypatch.chdir(tmp_path)
+    first = client.get_socket_path(arguments)
+
+    os.makedirs(tmp_path / "blog")
+    monkeypatch.chdir(tmp_path / "blog")
+    second = client.get_socket_path(arguments)
+
+    assert first != second
+    assert os.path.dirname(first) == arguments.cache
@@ -0,0 +1,110 @@
+"""
+Tests of replacing links to videos, gists & posts by embeds.
+"""
+
+import pytest
+
+from bloget.readers.utils import embed_parsing_utils
+
+YOUTUBE_EMBED = 'src="https://www.youtube.com/embed/dQw4w9WgXcQ"'
+VIMEO_EMBED = 'src="https://player.vimeo.com/video/76979871"'
+
+
+@pytest.mark.parametrize(
+    "link",
+    [
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "https://youtu.be/dQw4w9WgXcQ",
+    ],
+)
+def test_youtube(link):
+    """
+    Both YouTube link prefixes give a player.
+    """
+
+    result = embed_parsing_utils.replace_embeds(f"Text\n{link}\nText")
+
+    assert YOUTUBE_EMBED in result
+    assert link not in result
+
+
+@pytest.mark.parametrize(
+    "link", ["https://vimeo.com/76979871", "https://vimeo.com/76979871/"]
+)
+def test_vimeo(link):
+    """
+    A Vimeo link gives a player with or without a trailing slash.
+    """
+
+    assert VIMEO_EMBED in embed_parsing_utils.replace_embeds(link)
+
+
+def test_vimeo_without_id():
+    """
+    A Vimeo link without a numeric ID is left as it is.
+    """
+
+    link = "https://vimeo.com/channels"
+
+    assert embed_parsing_utils.replace_embeds(link) == link
+
+
+def test_gist():
+    """
+    A Gist link with an owner & an ID gives a script.
+    """
+
+    result = embed_parsing_utils.replace_embeds("https://gist.github.com/octo/42ab")
+
+    assert result == '<script src="https://gist.github.com/octo/42ab.js">Gist</script>'
+
+
+def test_gist_without_id():
+    """
+    A link to a Gist owner (without an ID) is left as it is.
+    """
+
+    link = "https://gist.github.com/octo"
+
+    assert embed_parsing_utils.replace_embeds(link) == link
+
+
+@pytest.mark.parametrize("host", ["twitter.com", "x.com"])
+def test_tweet(host):
+    """
+    A Twitter (X) status link with a query string gives a widget.
+    """
+
+    result = embed_parsing_utils.replace_embeds(
+        f"https://{host}/jack/status/20?s=20&t=abc"
+    )
+
+    assert 'href="https://twitter.com/jack/status/20"' in result
+    assert "twitter-tweet" in result
+    assert "?s=20" not in result
+
+
+def test_tweet_without_status():
+    """
+    A link to a profile is left as it is.
+    """
+
+    link = "https://x.com/jack"
+
+    assert embed_parsing_utils.replace_embeds(link) == link
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "Just a line of text",
+        "See https://www.youtube.com/watch?v=dQw4w9WgXcQ inside a sentence",
+        "https://example.com/watch?v=dQw4w9WgXcQ",
+    ],
+)
+def test_other_lines(line):
+    """
+    Lines which don't start with a provider's link are left unchanged.
+    """
+
+    assert embed_parsing_utils.replace_embeds(line) == line
@@ -0,0 +1,95 @@
+"""
+Tests of the cache of rendered note fragments.
+"""
+
+from types import SimpleNamespace
+
+import jinja2
+
+from bloget import fragments
+from tests import make_metadata
+
+MACROS = (
+    "{% macro note(note, tags, settings, language, show_title, lazy) %}"
+    "{{ count() }}<h1>{{ note.title }}</h1>{{ note.text }}"
+    "{% endmacro %}"
+)
+
+
+def _make_metadata(root_path, macros: str, renders: list, **settings):
+    metadata = make_metadata(root_path, settings)
+    metadata.tags = {}
+    metadata.language = {}
+    metadata.templates = jinja2.Environment(
+        loader=jinja2.DictLoader({"macros.jinja": macros})
+    )
+    metadata.templates.globals["count"] = lambda: renders.append(1) or ""
+
+    return metadata
+
+
+def _make_note(text: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        path="/notes/n1", title="Note", created=None, tags=[], text=text
+    )
+
+
+def test_get_note_fragment(tmp_path, monkeypatch):
+    """
+    A fragment is rendered again only if its note or the template changes.
+    """
+
+    monkeypatch.setattr(fragments, "_cache", fragments.FragmentCache())
+
+    renders: list = []
+    metadata = _make_metadata(tmp_path, MACROS, renders)
+    note = _make_note("<p>A</p>")
+
+    fragments.start(metadata)
+
+    assert fragments.get_note_fragment(note, metadata) == "<h1>Note</h1><p>A</p>"
+    assert fragments.get_note_fragment(note, metadata) == "<h1>Note</h1><p>A</p>"
+    assert len(renders) == 1
+
+    fragments.get_note_fragment(note, metadata, show_title=True)
+    assert len(renders) == 2
+
+    note.text = "<p>B</p>"
+    assert fragments.get_note_fragment(note, metadata) == "<h1>Note</h1><p>B</p>"
+    assert len(renders) == 3
+
+    metadata = _make_metadata(tmp_path, MACROS + " ", renders)
+    fragments.start(metadata)
+
+    fragments.get_note_fragment(note, metadata)
+    assert len(renders) == 4
+
+
+def test_persistent_fragments(tmp_path, monkeypatch):
+    """
+    Persisted fragments of notes still present are reused by the next process.
+    """
+
+    monkeypatch.setattr(fragments, "_cache", fragments.FragmentCache())
+
+    renders: list = []
+    metadata = _make_metadata(tmp_path, MACROS, renders, persistent_fragments=True)
+    note = _make_note("<p>A</p>")
+
+    fragments.start(metadata)
+    fragments.get_note_fragment(note, metadata)
+    fragments.finish(SimpleNamespace(notes=[note]), metadata)
+
+    monkeypatch.setattr(fragments, "_cache", fragments.FragmentCache())
+
+    fragments.start(metadata)
+    assert fragments.get_note_fragment(note, metadata) == "<h1>Note</h1><p>A</p>"
+    assert len(renders) == 1
+
+    fragments.finish(SimpleNamespace(notes=[]), metadata)
+
+    monkeypatch.setattr(fragments, "_cache", fragments.FragmentCache())
+
+    fragments.start(metadata)
+    fragments.get_note_fragment(note, metadata)
+    assert len(renders) == 2
@@ -0,0 +1,67 @@
+"""
+Tests of building cache headers.
+"""
+
+from bloget.writers import headers_writer
+from tests import make_metadata, write_file
+
+FILES = (
+    "index.html",
+    "rss.xml",
+    "notes/index.html",
+    "notes/n01/index.html",
+    "notes/n01/cover.png",
+    "notes/page-2/index.html",
+    "assets/attachments/0123456789abcdef.png",
+    "assets/css/site.css",
+    "assets/css/site.0123456789.css",
+    "assets/fonts/inter.woff2",
+)
+
+
+def test_write_headers(tmp_path):
+    """
+    Folders whose files share a policy get wildcard rules, files of mixed folders
+    get rules of their own; rules don't overlap.
+    """
+
+    for path in FILES:
+        write_file(tmp_path / "output" / path, "")
+
+    metadata = make_metadata(tmp_path)
+    manifest = {"assets/css/site.css": "assets/css/site.0123456789.css"}
+
+    headers_writer.write_headers(metadata, manifest, True, None)
+
+    rules = (tmp_path / "output" / "_headers").read_text(encoding="utf-8")
+
+    assert rules.split("\n")[::2] == [
+        "/",
+        "/index.html",
+        "/rss.xml",
+        "/assets/attachments/*",
+        "/assets/css/site.0123456789.css",
+        "/assets/css/site.css",
+        "/assets/fonts/*",
+        "/notes/*",
+        "",
+    ]
+    assert "ETag" not in rules
+    assert rules.startswith(
+        f"/\n  Cache-Control: {headers_writer.CACHE_CONTROL_REVALIDATE}\n"
+    )
+
+
+def test_write_headers_of_uniform_output(tmp_path):
+    """
+    An output folder whose files share a policy gets a single rule.
+    """
+
+    for path in ("index.html", "notes/n01/index.html", "notes/n01/cover.png"):
+        write_file(tmp_path / "output" / path, "")
+
+    headers_writer.write_headers(make_metadata(tmp_path), {}, True, None)
+
+    assert (tmp_path / "output" / "_headers").read_text(encoding="utf-8") == (
+        f"/*\n  Cache-Control: {headers_writer.CACHE_CONTROL_REVALIDATE}\n"
+    )
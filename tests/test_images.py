@@ -0,0 +1,52 @@
+"""
+Tests of image derivatives.
+"""
+
+import pytest
+from PIL import Image
+
+from bloget import images
+
+
+@pytest.mark.parametrize(
+    "mode, color, expected_mode",
+    [
+        ("LA", (128, 0), "RGBA"),
+        ("L", 128, "RGB"),
+        ("RGBA", (255, 0, 0, 0), "RGBA"),
+    ],
+)
+def test_derivatives_keep_transparency(tmp_path, mode, color, expected_mode):
+    """
+    Images with an alpha channel keep it in their derivatives.
+    """
+
+    source_path = str(tmp_path / "image.png")
+    target_path = str(tmp_path / "image.webp")
+
+    Image.new(mode, (40, 20), color).save(source_path)
+
+    images.make_derivative(source_path, target_path, 20, "webp")
+
+    with Image.open(target_path) as derivative:
+        assert derivative.size == (20, 10)
+        assert derivative.mode == expected_mode
+
+
+def test_derivatives_of_palette_images_with_transparency(tmp_path):
+    """
+    A palette image with a transparent color keeps the transparency.
+    """
+
+    source_path = str(tmp_path / "image.png")
+    target_path = str(tmp_path / "image.webp")
+
+    image = Image.new("P", (40, 20), 0)
+    image.putpalette([0, 0, 0, 255, 255, 255])
+    image.save(source_path, transparency=0)
+
+    images.make_derivative(source_path, target_path, 20, "webp")
+
+    with Image.open(target_path) as derivative:
+        assert derivative.mode == "RGBA"
+        assert derivative.getpixel((0, 0))[3] == 0
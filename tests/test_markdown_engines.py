@@ -0,0 +1,63 @@
+"""
+Tests of Markdown engines & their benchmark.
+"""
+
+import pytest
+
+from bloget import constants, markdown_benchmark, markdown_engines
+
+CONTENT = """# Title
+
+Some *emphasized* text.
+
+<div class="embed"><iframe src="https://example.org"></iframe></div>
+"""
+
+
+@pytest.mark.parametrize("engine", constants.MARKDOWN_ENGINES)
+def test_render(engine):
+    """
+    Every engine renders Markdown & keeps raw HTML (embeds, for instance).
+    """
+
+    if not markdown_engines.is_available(engine):
+        pytest.skip(f"{markdown_engines.MARKDOWN_ENGINE_PACKAGES[engine]} is missing")
+
+    content = markdown_engines.render(CONTENT, engine)
+
+    assert "<h1>Title</h1>" in content
+    assert "<em>emphasized</em>" in content
+    assert '<iframe src="https://example.org"></iframe>' in content
+
+
+def test_render_with_unknown_engine():
+    """
+    An unknown engine stops the build.
+    """
+
+    with pytest.raises(SystemExit):
+        markdown_engines.render(CONTENT, "markdown-rs")
+
+
+def test_benchmark_report():
+    """
+    Pages whose HTML differs from the one of the reference engine are reported;
+    differences which don't matter for a browser are not.
+    """
+
+    reference = markdown_benchmark.EngineResult(
+        "python-markdown",
+        render_time=2.0,
+        pages={"": "<p>Text<br />\n</p>", "notes/n01": "<p>Note</p>"},
+    )
+    other = markdown_benchmark.EngineResult(
+        "mistune",
+        render_time=1.0,
+        pages={"": "<p>Text<br>\n</p>", "notes/n01": "<p>Other note</p>"},
+    )
+
+    # pylint: disable-next=protected-access
+    report = markdown_benchmark._get_report([reference, other], 2)
+
+    assert "2.00x" in report
+    assert report.endswith("Pages which differ with mistune:\n  notes/n01")
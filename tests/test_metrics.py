@@ -0,0 +1,61 @@
+"""
+Tests of exporting build statistics.
+"""
+
+from bloget import metrics
+
+
+def test_write_metrics(tmp_path):
+    """
+    Statistics of a build are written as an OpenMetrics textfile.
+    """
+
+    metrics.start()
+
+    with metrics.stage("notes"):
+        metrics.add_pages("note", 3)
+
+    metrics.add_cache_lookups("minifier", 3, 1)
+    metrics.add_cache_lookups('quoted "cache"', 0, 0)
+    metrics.add_bytes("written", 100)
+    metrics.add_bytes("written", 20)
+
+    file_path = tmp_path / "bloget.prom"
+    metrics.write_metrics(str(file_path))
+
+    lines = file_path.read_text(encoding="utf-8").splitlines()
+
+    assert lines[-1] == "# EOF"
+    assert "# TYPE bloget_build_pages gauge" in lines
+    assert 'bloget_build_pages{type="note"} 3' in lines
+    assert 'bloget_build_cache_lookups{cache="minifier",result="hit"} 3' in lines
+    assert 'bloget_build_cache_lookups{cache="minifier",result="miss"} 1' in lines
+    assert 'bloget_build_cache_hit_ratio{cache="minifier"} 0.75' in lines
+    assert (
+        'bloget_build_cache_lookups{cache="quoted \\"cache\\"",result="hit"} 0' in lines
+    )
+    assert not any(
+        line.startswith('bloget_build_cache_hit_ratio{cache="quoted') for line in lines
+    )
+    assert 'bloget_build_bytes{operation="written"} 120' in lines
+    assert any(
+        line.startswith('bloget_build_stage_duration_seconds{stage="notes"} ')
+        for line in lines
+    )
+    assert [path.name for path in tmp_path.iterdir()] == ["bloget.prom"]
+
+
+def test_start_resets_metrics():
+    """
+    A new build (of the daemon, for instance) starts with no statistics.
+    """
+
+    metrics.start()
+    metrics.add_pages("note", 3)
+
+    metrics.start()
+
+    assert not any(
+        line.startswith("bloget_build_pages{")
+        for line in metrics.get_metrics_text().splitlines()
+    )
@@ -0,0 +1,137 @@
+"""
+Tests of minifying HTML, CSS & JS.
+"""
+
+import os
+
+import pytest
+
+from bloget import minifier
+from tests import make_metadata, write_file
+
+PAGE = """<!doctype html>
+<html>
+  <head>
+    <!-- Styles -->
+    <style>
+      body  { color: red ; }
+    </style>
+  </head>
+  <body>
+    <p>
+      Some   text
+    </p>
+    <pre>  keep
+    this  </pre>
+    <textarea>  and   this  </textarea>
+    <script type="text/template">  <p>  template  </p>  </script>
+    <script>
+      // Shows the menu.
+      menu.hidden = false;
+    </script>
+  </body>
+</html>
+"""
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        ('a = "b  /* c */  d";', 'a="b  /* c */  d";'),
+        ("a = 'b // c';", "a='b // c';"),
+        ("a = `b  ${c  +  '}'}  d`;", "a=`b  ${c  +  '}'}  d`;"),
+        (
+            "function f(s) {\n  return /re'/.test(s);\n}",
+            "function f(s){return /re'/.test(s);}",
+        ),
+        ("x = /a\\/b[/]/g.test(y);", "x=/a\\/b[/]/g.test(y);"),
+        ("x = typeof /'/;", "x=typeof /'/;"),
+        ("x = a / b / c;", "x=a / b / c;"),
+        ("a = b /* c */ + d;", "a=b + d;"),
+        ("a/* c */b", "a b"),
+        ("a = b // c\nd = e", "a=b\nd=e"),
+        ("a = b /* c\n */ d", "a=b\nd"),
+    ],
+)
+def test_minify_js(content, expected):
+    """
+    Strings, template literals & regular expressions are kept;
+    comments are removed like whitespace.
+    """
+
+    assert minifier.minify_js(content) == expected
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        ("a  {  color: red ;  }", "a{color:red}"),
+        ('a::before { content: "  /* b */  "; }', 'a::before{content:"  /* b */  "}'),
+        ("a /* b */ { color: red; }", "a{color:red}"),
+        ("a b /* c */ .d { margin: 0 auto; }", "a b .d{margin:0 auto}"),
+    ],
+)
+def test_minify_css(content, expected):
+    """
+    Strings are kept; comments & needless whitespace are removed.
+    """
+
+    assert minifier.minify_css(content) == expected
+
+
+def test_minify_html():
+    """
+    Pre, textarea & non-JS script blocks are kept; inline styles & scripts
+    are minified; comments are removed.
+    """
+
+    page = minifier.minify_html(PAGE)
+
+    assert "<!--" not in page
+    assert "<p> Some text </p>" in page
+    assert "<pre>  keep\n    this  </pre>" in page
+    assert "<textarea>  and   this  </textarea>" in page
+    assert '<script type="text/template">  <p>  template  </p>  </script>' in page
+    assert "<style>body{color:red}</style>" in page
+    assert "<script>menu.hidden=false;</script>" in page
+
+
+@pytest.mark.parametrize(
+    "minify, content",
+    [
+        (minifier.minify_html, PAGE),
+        (minifier.minify_css, "a /* b */ { color: red ; }\n\n.c > .d { margin : 0 }"),
+        (
+            minifier.minify_js,
+            "a = b /* c */ + d;\nif (x) {\n  y = /z/.test(w); // v\n}",
+        ),
+    ],
+)
+def test_minification_is_idempotent(minify, content):
+    """
+    Minifying a minified content changes nothing.
+    """
+
+    minified = minify(content)
+
+    assert minify(minified) == minified
+
+
+def test_minifier_cache_eviction(tmp_path, monkeypatch):
+    """
+    Least recently used cache entries are removed once the cache outgrows its size.
+    """
+
+    monkeypatch.setattr(minifier, "MINIFIER_CACHE_SIZE", 10)
+
+    metadata = make_metadata(tmp_path)
+    cache_path = minifier.get_cache_path(metadata)
+
+    for number in range(4):
+        write_file(tmp_path / "output" / f"{number}.css", f"a{number} {{ }}" + " " * 60)
+        minifier.minify_output(metadata, {})
+
+        os.remove(tmp_path / "output" / f"{number}.css")
+
+    assert 0 < sum(entry.stat().st_size for entry in os.scandir(cache_path)) <= 10
+    assert len(os.listdir(cache_path)) < 4
@@ -0,0 +1,45 @@
+"""
+Tests of output backends.
+"""
+
+import os
+import zipfile
+
+from bloget import constants, output, utils
+
+
+def _get_chunks():
+    yield "<html>"
+    yield "</html>"
+
+
+def test_archive_backend(tmp_path):
+    """
+    Files are spooled as they are written (rewritten & removed ones included),
+    then the archive is written when the build is finished.
+    """
+
+    archive_path = str(tmp_path / "site.zip")
+    output.open_backend("archive", archive_path)
+
+    try:
+        backend, _ = output.get_backend(archive_path)
+
+        utils.make_file(os.path.join(archive_path, "index.html"), _get_chunks())
+        utils.make_file(os.path.join(archive_path, "notes", "index.html"), "old")
+        utils.make_file(os.path.join(archive_path, "notes", "index.html"), "new")
+        utils.make_file(os.path.join(archive_path, "draft.html"), "draft")
+        utils.remove_file(os.path.join(archive_path, "draft.html"))
+
+        assert all(os.path.isfile(path) for path in backend.files.values())
+
+        output.close_backend(archive_path)
+    finally:
+        output.open_backend("filesystem", archive_path)
+
+    with zipfile.ZipFile(archive_path) as archive:
+        assert sorted(archive.namelist()) == ["index.html", "notes/index.html"]
+        assert archive.read("index.html").decode(constants.ENCODING) == (
+            "<html></html>"
+        )
+        assert archive.read("notes/index.html").decode(constants.ENCODING) == "new"
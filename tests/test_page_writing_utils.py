@@ -0,0 +1,62 @@
+"""
+Tests of copying page attachments.
+"""
+
+import os
+
+from bloget import utils
+from bloget.writers.utils import page_writing_utils
+from tests import make_metadata, make_page
+
+
+def _make_project(root_path):
+    page = make_page(
+        root_path / "pages" / "projects" / "p1",
+        {"cover.png": b"cover", "thumbnail.png": b"thumbnail"},
+    )
+    metadata = make_metadata(root_path, {"deduplicate_attachments": True})
+
+    return page, metadata
+
+
+def test_deduplicated_attachments_stay_in_page_folder(tmp_path):
+    """
+    A project's cover & thumbnail (which templates refer to) are in its folder,
+    as links to the stored copies.
+    """
+
+    page, metadata = _make_project(tmp_path)
+
+    page_output_path = tmp_path / "output" / "projects" / "p1"
+    page_output_path.mkdir(parents=True)
+
+    page_writing_utils.copy_page_attachments(page, str(page_output_path), metadata)
+
+    for attachment, content in (
+        ("cover.png", b"cover"),
+        ("thumbnail.png", b"thumbnail"),
+    ):
+        file_path = page_output_path / attachment
+        content_address = utils.get_content_address(
+            os.path.join(page.folder_path, attachment)
+        )
+        stored_file_path = tmp_path / "output" / content_address
+
+        assert file_path.read_bytes() == content
+        assert os.path.samefile(file_path, stored_file_path)
+
+
+def test_deduplicated_attachments_are_linked_again(tmp_path):
+    """
+    Attachments are linked again by an incremental build.
+    """
+
+    page, metadata = _make_project(tmp_path)
+
+    page_output_path = tmp_path / "output" / "projects" / "p1"
+    page_output_path.mkdir(parents=True)
+
+    page_writing_utils.copy_page_attachments(page, str(page_output_path), metadata)
+    page_writing_utils.copy_page_attachments(page, str(page_output_path), metadata)
+
+    assert (page_output_path / "cover.png").read_bytes() == b"cover"
@@ -0,0 +1,85 @@
+"""
+Tests of finding page folders.
+"""
+
+import os
+
+from bloget.readers import metadata_reader, page_reader, pages_reader
+from tests import write_file
+
+
+def test_get_page_folders(tmp_path):
+    """
+    Folders with a index.yaml file, or with front matter in index.md, are pages;
+    folders with a plain index.md (like a README of images) are not.
+    """
+
+    pages_path = tmp_path / "pages"
+
+    write_file(pages_path / "notes" / "n01" / "index.yaml", "title: Note")
+    write_file(pages_path / "notes" / "n01" / "index.md", "Text")
+    write_file(pages_path / "notes" / "n02" / "index.md", "---\ntitle: Note\n---\n")
+    write_file(pages_path / "projects" / "p1" / "index.md", "---\n---\nText")
+    write_file(pages_path / "about" / "index.md", "---\ntitle: About\n---\nText")
+    write_file(pages_path / "drafts" / "index.md", "# Drafts\n\n---\n")
+    write_file(pages_path / "images" / "index.md", "Images of notes")
+
+    page_folders = sorted(
+        (os.path.relpath(folder_path, pages_path).replace(os.sep, "/"), page_type)
+        for folder_path, page_type in pages_reader.get_page_folders(str(pages_path))
+    )
+
+    assert page_folders == [
+        ("about", "text"),
+        ("notes/n01", "note"),
+        ("notes/n02", "note"),
+        ("projects/p1", "project"),
+    ]
+
+
+def test_get_pages_renders_texts_lazily_and_skips_drafts(tmp_path, monkeypatch):
+    """
+    Reading pages renders no texts; a text is rendered once on first access,
+    and drafts (unless included) are never rendered.
+    """
+
+    rendered = []
+
+    def get_page_text(folder_path, *_):
+        rendered.append(os.path.basename(folder_path))
+        return "<p>Text</p>"
+
+    monkeypatch.setattr(page_reader, "_get_page_text", get_page_text)
+
+    pages_path = tmp_path / "pages"
+    page_info = "title: {}\ndescription: D\ncreated: 2024-01-0{} 00:00:00\n"
+
+    write_file(pages_path / "notes" / "n1" / "index.yaml", page_info.format("A", 1))
+    write_file(
+        pages_path / "notes" / "n2" / "index.yaml",
+        page_info.format("B", 2) + "options: [draft]\ntags: [t]\n",
+    )
+
+    metadata = metadata_reader.BlogMetadata(
+        paths={"pages": str(pages_path)},
+        settings={},
+        language={},
+        stacks={},
+        tags={"t": "T"},
+        templates=None,
+    )
+
+    pages = pages_reader.get_pages(metadata)
+
+    assert [note.metadata.title for note in pages.notes] == ["A"]
+    assert not pages.index.notes_by_tag.get("t")
+    assert not rendered
+
+    assert pages.notes[0].text == "<p>Text</p>"
+    assert pages.notes[0].text == "<p>Text</p>"
+    assert rendered == ["n1"]
+
+    pages = pages_reader.get_pages(metadata, include_drafts=True)
+
+    assert [note.metadata.title for note in pages.notes] == ["B", "A"]
+    assert rendered == ["n1"]
@@ -0,0 +1,82 @@
+"""
+Tests of build plans.
+"""
+
+from types import SimpleNamespace
+
+from bloget import planner
+from tests import make_metadata, write_file
+
+NOTE = """---
+title: Note
+created: 2026-01-0{0} 10:00:00
+---
+{1}
+"""
+
+
+def _make_blog(tmp_path):
+    for number in range(1, 4):
+        write_file(
+            tmp_path / "pages" / "notes" / f"n0{number}" / "index.md",
+            NOTE.format(number, "Text"),
+        )
+
+    write_file(tmp_path / "public" / "robots.txt", "User-agent: *")
+
+    metadata = make_metadata(
+        tmp_path,
+        metadata=str(tmp_path / "pages" / ".metadata"),
+        templates=str(tmp_path / "templates"),
+        publish=str(tmp_path / "published"),
+    )
+
+    return metadata
+
+
+def _get_arguments(publish):
+    return SimpleNamespace(
+        publish=publish,
+        include_drafts=False,
+        minify=False,
+        fingerprint_assets=False,
+        critical_css=False,
+    )
+
+
+def test_plan_without_publishing(tmp_path):
+    """
+    A build which doesn't publish writes everything, so its plan is a full one
+    (even after a published build).
+    """
+
+    metadata = _make_blog(tmp_path)
+    planner.write_state(_get_arguments(True), metadata)
+
+    plan = planner.get_plan(_get_arguments(False), metadata)
+
+    assert plan.full
+    assert plan.rendered == ["notes/n01", "notes/n02", "notes/n03"]
+    assert plan.copied == ["robots.txt"]
+
+
+def test_plan_of_published_build(tmp_path):
+    """
+    A published build is planned from the state of the previous one:
+    a changed note is rendered along with its neighbours.
+    """
+
+    metadata = _make_blog(tmp_path)
+    planner.write_state(_get_arguments(True), metadata)
+
+    write_file(
+        tmp_path / "pages" / "notes" / "n01" / "index.md",
+        NOTE.format(1, "Longer text"),
+    )
+
+    plan = planner.get_plan(_get_arguments(True), metadata)
+
+    assert not plan.full
+    assert plan.rendered == ["notes/n01", "notes/n02"]
+    assert plan.unchanged == 1
+    assert not plan.copied
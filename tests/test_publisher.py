@@ -0,0 +1,84 @@
+"""
+Tests of publishing a built blog into a git-backed folder.
+"""
+
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from bloget import publisher
+from tests import make_metadata, write_file
+
+
+def _make_folders(tmp_path):
+    output_path = tmp_path / "output"
+    publish_path = tmp_path / "published"
+
+    write_file(output_path / "index.html", "new")
+    write_file(output_path / "notes" / "n01" / "index.html", "same")
+    write_file(output_path / "notes" / "n02" / "index.html", "added")
+
+    write_file(publish_path / "index.html", "old")
+    write_file(publish_path / "notes" / "n01" / "index.html", "same")
+    write_file(publish_path / "projects" / "p1" / "index.html", "removed")
+    write_file(publish_path / "CNAME", "example.org")
+
+    return make_metadata(tmp_path, publish=str(publish_path))
+
+
+def test_get_plan(tmp_path):
+    """
+    Files are compared by content; protected files are never removed.
+    """
+
+    metadata = _make_folders(tmp_path)
+    plan = publisher.get_plan(metadata.paths["output"], metadata.paths["publish"])
+
+    assert plan.added == ["notes/n02/index.html"]
+    assert plan.changed == ["index.html"]
+    assert plan.removed == ["projects/p1/index.html"]
+    assert plan.unchanged == 1
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+def test_publish(tmp_path):
+    """
+    Changes are applied to the publish folder & staged in git (the protected
+    CNAME file is left as it is); folders which became empty are removed.
+    """
+
+    metadata = _make_folders(tmp_path)
+    publish_path = metadata.paths["publish"]
+
+    for command in (
+        ["init", "-q"],
+        ["add", "--all"],
+        ["-c", "user.name=Bloget", "-c", "user.email=bloget@localhost"]
+        + ["commit", "-q", "-m", "Previous build"],
+    ):
+        subprocess.run(["git", *command], cwd=publish_path, check=True)
+
+    publisher.publish(metadata)
+
+    status = subprocess.run(
+        ["git", "status", "--porcelain"],
+        cwd=publish_path,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.splitlines()
+
+    assert sorted(status) == [
+        "A  notes/n02/index.html",
+        "D  projects/p1/index.html",
+        "M  index.html",
+    ]
+    assert not os.path.exists(os.path.join(publish_path, "projects"))
+
+    with open(os.path.join(publish_path, "index.html"), encoding="utf-8") as file:
+        assert file.read() == "new"
+
+    with open(os.path.join(publish_path, "CNAME"), encoding="utf-8") as file:
+        assert file.read() == "example.org"
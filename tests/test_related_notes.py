@@ -0,0 +1,51 @@
+"""
+Tests of finding related notes.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from bloget import related_notes
+from tests import make_metadata
+
+pytest.importorskip("numpy")
+
+GARDEN = "<p>Tomatoes, cucumbers & peppers grow in the greenhouse garden.</p>"
+PYTHON = "<p>Python generators stream rendered templates & files lazily.</p>"
+
+
+def _make_note(tmp_path, name, text, tags):
+    return SimpleNamespace(
+        path=f"notes/{name}",
+        folder_path=str(tmp_path / "pages" / "notes" / name),
+        text=text,
+        tags=tags,
+    )
+
+
+def test_get_related_notes(tmp_path):
+    """
+    Notes which share words & tags are related; an unchanged corpus gives
+    the same result from the cache, with no updated notes.
+    """
+
+    notes = [
+        _make_note(tmp_path, "n01", GARDEN, ["garden"]),
+        _make_note(tmp_path, "n02", GARDEN.replace("peppers", "pumpkins"), ["garden"]),
+        _make_note(tmp_path, "n03", PYTHON, ["python"]),
+    ]
+    pages = SimpleNamespace(notes=notes)
+    metadata = make_metadata(tmp_path, {"related_notes": 2})
+
+    related, updated = related_notes.get_related_notes(pages, metadata)
+
+    assert related[notes[0].folder_path] == [notes[1]]
+    assert related[notes[1].folder_path] == [notes[0]]
+    assert not related[notes[2].folder_path]
+    assert updated == {notes[0].folder_path, notes[1].folder_path}
+
+    related_again, updated = related_notes.get_related_notes(pages, metadata)
+
+    assert related_again == related
+    assert not updated
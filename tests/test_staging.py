@@ -0,0 +1,97 @@
+"""
+Tests of atomic builds through a staging folder.
+"""
+
+import argparse
+import os
+
+import pytest
+
+from bloget import staging
+from tests import write_file
+
+
+def _read_file(file_path) -> str:
+    with open(file_path, encoding="utf-8") as file:
+        return file.read()
+
+
+def test_prepare_staging(tmp_path):
+    """
+    An incremental build carries files of the output folder over
+    (except protected ones); a full build starts from an empty folder.
+    """
+
+    output_path = tmp_path / "out"
+
+    write_file(output_path / "index.html", "old")
+    write_file(output_path / "CNAME", "example.com")
+    write_file(output_path / ".git" / "HEAD", "ref")
+    write_file(f"{output_path}{staging.STAGING_SUFFIX}/stale.html", "stale")
+
+    staging_path = staging.prepare_staging(str(output_path), True)
+
+    assert staging_path == f"{output_path}{staging.STAGING_SUFFIX}"
+    assert sorted(os.listdir(staging_path)) == ["index.html"]
+    assert _read_file(os.path.join(staging_path, "index.html")) == "old"
+
+    staging_path = staging.prepare_staging(str(output_path), False)
+
+    assert not os.listdir(staging_path)
+    assert _read_file(output_path / "index.html") == "old"
+
+
+@pytest.mark.parametrize("exchange", [True, False])
+def test_swap_staging_and_rollback(tmp_path, monkeypatch, exchange):
+    """
+    The staging folder becomes the output folder, which gets protected files
+    & becomes the previous build; a rollback swaps them back & forth.
+    """
+
+    if not exchange:
+        monkeypatch.setattr(staging, "_rename_exchange", lambda *_: False)
+
+    output_path = tmp_path / "out"
+    previous_path = f"{output_path}{staging.PREVIOUS_SUFFIX}"
+
+    write_file(output_path / "index.html", "old")
+    write_file(output_path / "CNAME", "example.com")
+
+    staging_path = staging.prepare_staging(str(output_path), False)
+    write_file(os.path.join(staging_path, "index.html"), "new")
+
+    staging.swap_staging(str(output_path))
+
+    assert not os.path.exists(staging_path)
+    assert _read_file(output_path / "index.html") == "new"
+    assert _read_file(output_path / "CNAME") == "example.com"
+    assert sorted(os.listdir(previous_path)) == ["index.html"]
+
+    arguments = argparse.Namespace(output=str(output_path))
+
+    staging.rollback(arguments)
+    assert _read_file(output_path / "index.html") == "old"
+    assert _read_file(output_path / "CNAME") == "example.com"
+
+    staging.rollback(arguments)
+    assert _read_file(output_path / "index.html") == "new"
+
+    assert sorted(os.listdir(tmp_path)) == ["out", os.path.basename(previous_path)]
+
+
+def test_first_swap_and_rollback_without_previous_build(tmp_path):
+    """
+    The first build is simply renamed; there is nothing to roll back to.
+    """
+
+    output_path = tmp_path / "out"
+
+    staging_path = staging.prepare_staging(str(output_path), True)
+    write_file(os.path.join(staging_path, "index.html"), "new")
+
+    staging.swap_staging(str(output_path))
+
+    assert _read_file(output_path / "index.html") == "new"
+
+    with pytest.raises(SystemExit):
+        staging.rollback(argparse.Namespace(output=str(output_path)))
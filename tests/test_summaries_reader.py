@@ -0,0 +1,99 @@
+"""
+Tests of page summaries & reports made of them.
+"""
+
+from types import SimpleNamespace
+
+from bloget import stats, tags
+from bloget.readers import page_reader, summaries_reader
+from tests import write_file
+
+NOTE = """---
+title: Note
+created: 2025-0{0}-01 10:00:00
+tags: [{1}]
+options: [{2}]
+---
+Text
+"""
+
+
+def _make_pages(tmp_path):
+    pages_path = tmp_path / "pages"
+
+    write_file(
+        pages_path / "notes" / "n01" / "index.md", NOTE.format(1, "python, web", "")
+    )
+    write_file(pages_path / "notes" / "n02" / "index.md", NOTE.format(2, "python", ""))
+    write_file(
+        pages_path / "notes" / "n03" / "index.md", NOTE.format(3, "drafts", "draft")
+    )
+    write_file(
+        pages_path / "projects" / "p1" / "index.yaml", "title: Project\nstacks: [rust]"
+    )
+
+    return str(pages_path)
+
+
+def _get_arguments(tmp_path, include_drafts=False):
+    return SimpleNamespace(
+        pages=str(tmp_path / "pages"),
+        cache=str(tmp_path / "cache"),
+        no_cache=False,
+        include_drafts=include_drafts,
+        top=2,
+    )
+
+
+def test_get_page_summaries(tmp_path, monkeypatch):
+    """
+    Summaries are read from page information only; the cache keeps summaries
+    of pages whose folders haven't changed.
+    """
+
+    pages_path = _make_pages(tmp_path)
+    cache_path = str(tmp_path / "cache")
+
+    summaries = summaries_reader.get_page_summaries(pages_path, cache_path)
+    summaries = {summary.path: summary for summary in summaries}
+
+    assert sorted(summaries) == ["notes/n01", "notes/n02", "notes/n03", "projects/p1"]
+    assert summaries["notes/n01"].tags == ["python", "web"]
+    assert summaries["notes/n01"].year == 2025
+    assert summaries["notes/n03"].draft
+    assert summaries["projects/p1"].stacks == ["rust"]
+
+    def fail(*_):
+        raise AssertionError("Page information is read again")
+
+    monkeypatch.setattr(page_reader, "get_page_info", fail)
+
+    cached = summaries_reader.get_page_summaries(pages_path, cache_path)
+
+    assert {summary.path: summary for summary in cached} == summaries
+
+
+def test_tags_and_stats(tmp_path, capsys):
+    """
+    Reports skip drafts unless they are included.
+    """
+
+    _make_pages(tmp_path)
+
+    tags.show_tags_list(_get_arguments(tmp_path))
+
+    assert capsys.readouterr().out == "python\nweb\n"
+
+    tags.show_tags_list(_get_arguments(tmp_path, include_drafts=True))
+
+    assert capsys.readouterr().out == "drafts\npython\nweb\n"
+
+    stats.show_stats(_get_arguments(tmp_path))
+    report = capsys.readouterr().out
+
+    assert report.startswith("Pages: 3 (drafts: 1)")
+    assert (
+        "python" in report
+        and "rust" in report
+        and "drafts" not in report.split("\n", 1)[1]
+    )
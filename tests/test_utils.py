@@ -0,0 +1,40 @@
+"""
+Tests of writing output files.
+"""
+
+import pytest
+
+from bloget import constants, utils
+
+
+def _get_chunks():
+    yield "<html>"
+    raise ValueError("Template error")
+
+
+def test_make_file_keeps_old_file_on_error(tmp_path):
+    """
+    An error in the middle of a stream leaves the previous file as it was
+    (and no temporary files).
+    """
+
+    file_path = tmp_path / "index.html"
+    file_path.write_text("old", encoding=constants.ENCODING)
+
+    with pytest.raises(ValueError):
+        utils.make_file(str(file_path), _get_chunks())
+
+    assert file_path.read_text(encoding=constants.ENCODING) == "old"
+    assert [path.name for path in tmp_path.iterdir()] == ["index.html"]
+
+
+def test_make_file_writes_stream(tmp_path):
+    """
+    Chunks of a stream are written as a whole file.
+    """
+
+    file_path = tmp_path / "index.html"
+
+    utils.make_file(str(file_path), iter(["<html>", "</html>"]))
+
+    assert file_path.read_text(encoding=constants.ENCODING) == "<html></html>"